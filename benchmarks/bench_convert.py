@@ -0,0 +1,66 @@
+"""
+Пакетная конвертация в RUB (convert_many / total_in_rub) против цикла по convert_to_rub.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_convert
+"""
+
+import random
+import time
+from typing import Callable, Dict, List
+
+from src.external_api import _numpy, convert_many, convert_to_rub, total_in_rub
+
+COUNT = 200_000
+RATES = {"USD": 90.0, "EUR": 100.0, "CNY": 12.5}
+CURRENCIES = ["RUB", "USD", "EUR", "CNY"]
+
+
+def _transactions() -> List[Dict]:
+    generator = random.Random(0)
+    return [
+        {
+            "operationAmount": {
+                "amount": f"{generator.randint(1, 10_000_000) / 100:.2f}",
+                "currency": {"code": generator.choice(CURRENCIES)},
+            }
+        }
+        for _ in range(COUNT)
+    ]
+
+
+def _loop_total(transactions: List[Dict]) -> float:
+    total = 0.0
+    for transaction in transactions:
+        amount = transaction["operationAmount"]
+        total += convert_to_rub(amount["amount"], amount["currency"]["code"], RATES)
+    return total
+
+
+def _best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    transactions = _transactions()
+    results = [
+        ("цикл по convert_to_rub", _best_of(lambda: _loop_total(transactions))),
+        ("convert_many", _best_of(lambda: convert_many(transactions, RATES, use_numpy=False))),
+        ("total_in_rub", _best_of(lambda: total_in_rub(transactions, RATES, use_numpy=False))),
+    ]
+    if _numpy() is not None:
+        results.append(("convert_many, NumPy", _best_of(lambda: convert_many(transactions, RATES, use_numpy=True))))
+
+    baseline = results[0][1]
+    print(f"{COUNT:,} транзакций")
+    for name, seconds in results:
+        print(f"{name:<25} {seconds * 1000:8.1f} мс  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Пропускная способность get_mask_account при разных настройках логирования.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_mask_logging
+"""
+
+import logging
+import tempfile
+import time
+
+from src.log_config import LOG_FORMAT, configure_logging, flush_logs
+from src.masks import get_mask_account, logger
+
+CALLS = 50_000
+ACCOUNT = "Счет 73654108430135874305"
+
+
+def _calls_per_second() -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        get_mask_account(ACCOUNT)
+    elapsed = time.perf_counter() - start
+    flush_logs()
+    return CALLS / elapsed
+
+
+def _sync_file_handler(logs_dir: str) -> float:
+    """Прежняя схема: синхронный FileHandler на уровне DEBUG прямо в вызывающем потоке."""
+    queue_handlers = logger.handlers[:]
+    file_handler = logging.FileHandler(f"{logs_dir}/masks_sync.log", mode="w", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.handlers[:] = [file_handler]
+    try:
+        return _calls_per_second()
+    finally:
+        file_handler.close()
+        logger.handlers[:] = queue_handlers
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as logs_dir:
+        configure_logging(level="DEBUG", logs_dir=logs_dir)
+        results = [("синхронный FileHandler, DEBUG", _sync_file_handler(logs_dir))]
+        results.append(("очередь + фоновый поток, DEBUG", _calls_per_second()))
+        configure_logging(level="WARNING")
+        results.append(("очередь, WARNING (debug/info отсекаются)", _calls_per_second()))
+        configure_logging(level=logging.CRITICAL + 1)
+        results.append(("логирование выключено", _calls_per_second()))
+
+    for name, rate in results:
+        print(f"{name:<45} {rate:>12,.0f} вызовов/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Суммирование денежных сумм: float против Money (целые копейки).
+
+Суммы — строки вида "9824.07", как в operations.json. Сравниваются:
+разбор float при каждом суммировании (текущий путь), сумма заранее разобранных float
+и сумма Money, разобранных один раз при загрузке. Для экономии памяти список из COUNT
+сумм составлен из POOL различных значений.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_money [число сумм]
+"""
+
+import gc
+import math
+import random
+import sys
+import time
+from decimal import Decimal
+from typing import Callable, List, Tuple
+
+from src.money import Money
+
+COUNT = 10_000_000
+POOL = 100_000
+PARSE_SAMPLE = 1_000_000
+
+
+def _timed(func: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    generator = random.Random(0)
+    pool = [f"{generator.randint(1, 10_000_000) / 100:.2f}" for _ in range(POOL)]
+    indexes = [generator.randrange(POOL) for _ in range(count)]
+    amounts: List[str] = [pool[index] for index in indexes]
+
+    parsed_pool = [Money.parse(amount, "RUB") for amount in pool]
+    moneys = [parsed_pool[index] for index in indexes]
+    floats = [float(amount) for amount in amounts]
+    # Миллионы долгоживущих объектов не должны попадать в замеры через проходы сборщика мусора
+    gc.collect()
+    gc.freeze()
+
+    sample = amounts[:PARSE_SAMPLE]
+    parse_float, _ = _timed(lambda: [float(amount) for amount in sample])
+    parse_money, _ = _timed(lambda: [Money.parse(amount, "RUB") for amount in sample])
+
+    results = [
+        ("float(), разбор при каждом суммировании", *_timed(lambda: sum(float(amount) for amount in amounts))),
+        ("сумма разобранных float", *_timed(lambda: sum(floats))),
+        ("math.fsum разобранных float", *_timed(lambda: math.fsum(floats))),
+        ("Money.sum (целые копейки)", *_timed(lambda: Money.sum(moneys, "RUB"))),
+    ]
+
+    exact_total = Money(sum(money.minor for money in moneys), "RUB")
+    print(f"{count:,} сумм, точный итог {exact_total}")
+    for name, seconds, total in results:
+        drift = abs(Decimal(str(total)) - exact_total.amount)
+        print(f"{name:<42} {seconds * 1000:9.1f} мс  итог {total}  погрешность {drift:.6f}")
+    print(
+        f"разбор {PARSE_SAMPLE:,} строк: float {parse_float * 1e9 / len(sample):.0f} нс/шт, "
+        f"Money.parse {parse_money * 1e9 / len(sample):.0f} нс/шт (один раз при загрузке)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Время импорта модулей пакета по данным python -X importtime.
+
+Каждый модуль импортируется в отдельном свежем интерпретаторе; печатается
+суммарное время импорта модуля вместе с зависимостями и самые дорогие из них.
+Для src.processing проверяется бюджет IMPORT_BUDGET_US.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_startup
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Бюджет на "import src.processing" (мкс, с зависимостями) — с запасом на медленные машины CI
+IMPORT_BUDGET_US = 25_000
+BUDGET_MODULE = "src.processing"
+
+MODULES = ["src", "src.processing", "src.generators", "src.utils", "src.widget", "src.external_api"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Импортирует модуль в новом процессе с -X importtime.
+
+    :return: Список (модуль, собственное время, время с зависимостями) в микросекундах
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # строка заголовка
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def cumulative_import_time(module: str) -> int:
+    """Время импорта модуля вместе с зависимостями в микросекундах (минимум из трёх запусков)."""
+    best = None
+    for _ in range(3):
+        times: Dict[str, int] = {name: cumulative for name, _, cumulative in import_times(module)}
+        # Модуль, уже загруженный при старте интерпретатора, importtime не показывает
+        value = times.get(module, 0)
+        best = value if best is None else min(best, value)
+    return best or 0
+
+
+def main() -> None:
+    for module in MODULES:
+        times = import_times(module)
+        own = [entry for entry in times if entry[0].split(".")[0] == module.split(".")[0]]
+        print(f"import {module:<20} {cumulative_import_time(module) / 1000:8.1f} мс")
+        for name, self_us, _ in sorted(own, key=lambda entry: entry[1], reverse=True)[:3]:
+            print(f"    {name:<26} {self_us / 1000:8.1f} мс (собственное)")
+
+    spent = cumulative_import_time(BUDGET_MODULE)
+    status = "в пределах бюджета" if spent <= IMPORT_BUDGET_US else "ПРЕВЫШЕН бюджет"
+    print(f"\nimport {BUDGET_MODULE}: {spent / 1000:.1f} мс из {IMPORT_BUDGET_US / 1000:.0f} мс — {status}")
+    if spent > IMPORT_BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
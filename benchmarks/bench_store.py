@@ -0,0 +1,119 @@
+"""
+Хранилище SQLite (TransactionStore) против списка словарей в памяти.
+
+Транзакции генерируются потоково в формате operations.json. Для каждого размера замеряются
+загрузка в базу и запросы: filter_by_state, filter_by_currency, sort_by_date(limit=10),
+диапазон дат за месяц и поиск по счёту. Те же запросы над списком выполняются,
+только если список помещается в память (до LIST_LIMIT записей, около 1,2 ГБ на миллион).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_store [число записей ...]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from src.generators import filter_by_currency
+from src.processing import filter_by_state, sort_by_date
+from src.store import TransactionStore
+
+SIZES = [1_000_000, 10_000_000]
+LIST_LIMIT = 2_000_000
+
+STATES = ["EXECUTED"] * 8 + ["CANCELED", "PENDING"]
+CURRENCIES = [("руб.", "RUB")] * 3 + [("USD", "USD"), ("EUR", "EUR")]
+DESCRIPTIONS = ["Перевод организации", "Перевод со счета на счет", "Перевод с карты на карту", "Открытие вклада"]
+START = datetime(2018, 1, 1)
+ACCOUNT = "Счет 00000000000000001234"
+
+
+def _transactions(count: int) -> Iterator[Dict]:
+    generator = random.Random(0)
+    accounts = [f"Счет {generator.randrange(10**19, 10**20)}" for _ in range(10_000)] + [ACCOUNT]
+    for number in range(count):
+        name, code = generator.choice(CURRENCIES)
+        date = START + timedelta(seconds=generator.randrange(3 * 365 * 86400), microseconds=generator.randrange(10**6))
+        yield {
+            "id": number,
+            "state": generator.choice(STATES),
+            "date": date.isoformat(),
+            "operationAmount": {
+                "amount": f"{generator.randint(1, 10_000_000) / 100:.2f}",
+                "currency": {"name": name, "code": code},
+            },
+            "description": generator.choice(DESCRIPTIONS),
+            "from": generator.choice(accounts),
+            "to": generator.choice(accounts),
+        }
+
+
+def _timed(func: Callable[[], int]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _queries_store(store: TransactionStore) -> List[Tuple[str, Callable[[], int]]]:
+    return [
+        ("filter_by_state CANCELED", lambda: sum(1 for _ in store.filter_by_state("CANCELED"))),
+        ("filter_by_currency EUR", lambda: sum(1 for _ in store.filter_by_currency("EUR"))),
+        ("sort_by_date limit=10", lambda: sum(1 for _ in store.sort_by_date(limit=10))),
+        ("даты за 2019-06", lambda: sum(1 for _ in store.between("2019-06", "2019-06-31"))),
+        ("счёт в from/to", lambda: sum(1 for _ in store.query(account=ACCOUNT))),
+    ]
+
+
+def _queries_list(transactions: List[Dict]) -> List[Tuple[str, Callable[[], int]]]:
+    return [
+        ("filter_by_state CANCELED", lambda: len(filter_by_state(transactions, "CANCELED"))),
+        ("filter_by_currency EUR", lambda: sum(1 for _ in filter_by_currency(transactions, "EUR"))),
+        ("sort_by_date limit=10", lambda: len(sort_by_date(transactions, limit=10))),
+        ("даты за 2019-06", lambda: len([t for t in transactions if "2019-06" <= t["date"] <= "2019-06-31"])),
+        ("счёт в from/to", lambda: len([t for t in transactions if ACCOUNT in (t["from"], t["to"])])),
+    ]
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "operations.db")
+            with TransactionStore(path) as store:
+                seconds, _ = _timed(lambda: store.import_transactions(_transactions(count)))
+                size_mb = sum(os.path.getsize(name) for name in (path, f"{path}-wal") if os.path.exists(name)) / 2**20
+                print(f"\n{count:,} записей: загрузка в SQLite {seconds:.1f} с ({count / seconds:,.0f} записей/с), "
+                      f"файл {size_mb:,.0f} МБ, пик памяти {_peak_rss_mb():,.0f} МБ")
+                store_results = [(name, *_timed(query)) for name, query in _queries_store(store)]
+
+        list_results: Dict[str, Tuple[float, int]] = {}
+        if count <= LIST_LIMIT:
+            start = time.perf_counter()
+            transactions = list(_transactions(count))
+            seconds = time.perf_counter() - start
+            print(f"список словарей построен за {seconds:.1f} с, пик памяти {_peak_rss_mb():,.0f} МБ")
+            list_results = {name: _timed(query) for name, query in _queries_list(transactions)}
+            del transactions
+        else:
+            print("список словарей не строится: не помещается в память")
+
+        print(f"{'запрос':<26} {'SQLite, мс':>12} {'список, мс':>12} {'строк':>10}")
+        for name, seconds, rows in store_results:
+            in_list = list_results.get(name)
+            list_ms = f"{in_list[0] * 1000:12.1f}" if in_list else f"{'—':>12}"
+            if in_list:
+                assert in_list[1] == rows, name
+            print(f"{name:<26} {seconds * 1000:12.1f} {list_ms} {rows:>10,}")
+
+
+if __name__ == "__main__":
+    main()
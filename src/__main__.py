@@ -0,0 +1,115 @@
+import os
+
+from src.decorators import log
+from src.external_api import convert_to_rub
+from src.generators import card_number_generator, filter_by_currency, transaction_descriptions
+from src.log_config import LOGS_DIR
+from src.masks import get_mask_account, get_mask_card_number
+from src.processing import filter_by_state, sort_by_date
+from src.utils import load_transactions
+from src.widget import get_date, mask_account_card
+
+# Примеры использования модулей пакета: python -m src
+# При импорте пакета ничего не выполняется, поэтому примеры собраны здесь
+
+transactions = [
+    {
+        "id": 939719570,
+        "state": "EXECUTED",
+        "date": "2018-06-30T02:08:58.425572",
+        "operationAmount": {"amount": "9824.07", "currency": {"name": "USD", "code": "USD"}},
+        "description": "Перевод организации",
+        "from": "Счет 75106830613657916952",
+        "to": "Счет 11776614605963066702",
+    },
+    {
+        "id": 142264268,
+        "state": "EXECUTED",
+        "date": "2019-04-04T23:20:05.206878",
+        "operationAmount": {"amount": "79114.93", "currency": {"name": "USD", "code": "USD"}},
+        "description": "Перевод со счета на счет",
+        "from": "Счет 19708645243227258542",
+        "to": "Счет 75651667383060284188",
+    },
+    {
+        "id": 873106923,
+        "state": "EXECUTED",
+        "date": "2019-03-23T01:09:46.296404",
+        "operationAmount": {"amount": "43318.34", "currency": {"name": "руб.", "code": "RUB"}},
+        "description": "Перевод со счета на счет",
+        "from": "Счет 44812258784861134719",
+        "to": "Счет 74489636417521191160",
+    },
+    {
+        "id": 895315941,
+        "state": "EXECUTED",
+        "date": "2018-08-19T04:27:37.904916",
+        "operationAmount": {"amount": "56883.54", "currency": {"name": "USD", "code": "USD"}},
+        "description": "Перевод с карты на карту",
+        "from": "Visa Classic 6831982476737658",
+        "to": "Visa Platinum 8990922113665229",
+    },
+    {
+        "id": 594226727,
+        "state": "CANCELED",
+        "date": "2018-09-12T21:27:25.241689",
+        "operationAmount": {"amount": "67314.70", "currency": {"name": "руб.", "code": "RUB"}},
+        "description": "Перевод организации",
+        "from": "Visa Platinum 1246377376343588",
+        "to": "Счет 14211924144426031657",
+    },
+]
+
+
+@log(filename=os.path.join(LOGS_DIR, "log_file.log"))
+def divide(a, b):  # type: ignore[no-untyped-def]
+    return a / b
+
+
+def main() -> None:
+    # Пример использования masks.py
+    try:
+        print(get_mask_card_number("1234567890123456"))  # Успешный случай
+        print(get_mask_account("12345678901234567890"))  # Успешный случай
+    except Exception as e:
+        print(f"Ошибка: {e}")
+
+    # Пример использования widget.py
+    print(mask_account_card("Счет 35383033474447895560"))
+    print(mask_account_card("Visa Platinum 8990922113665229"))
+    print(get_date("2019-07-03T18:35:29.512364"))
+
+    # Пример использования processing.py
+    print(filter_by_state(transactions, state="CANCELED"))
+    print(sort_by_date(transactions, reverse=False)[0]["date"])
+
+    # Пример использования generators.py
+    usd_transactions = filter_by_currency(transactions, "USD")
+    for _ in range(3):
+        print(next(usd_transactions))
+
+    descriptions = transaction_descriptions(transactions)
+    for _ in range(5):
+        print(next(descriptions))
+
+    for card_number in card_number_generator(123456789012345, 123456789012347):
+        print(card_number)
+
+    # Пример использования декоратора log (результат — в logs/log_file.log)
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    divide(10, 2)
+    try:
+        divide(5, 0)
+    except ZeroDivisionError:
+        pass
+
+    # Пример использования external_api.py (без запроса к API)
+    print(convert_to_rub("100", "USD", {"USD": 90.0}))
+
+    # Пример использования utils.py
+    loaded = load_transactions("data/operations.json", use_snapshot=True)
+    print(f"Загружено транзакций: {len(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.decorators import timed
+from src.index import currency_code
+from src.money import SCALE, Money, to_minor
+from src.transaction import Transaction, TransactionLike
+
+# Ключ группы: значения измерений в порядке, заданном в by
+GroupKey = Tuple[Any, ...]
+
+
+def _date_prefix(length: int) -> Callable[[TransactionLike], Optional[str]]:
+    def extract(transaction: TransactionLike) -> Optional[str]:
+        date = transaction.get("date")
+        return date[:length] if date else None
+
+    return extract
+
+
+# Измерения, по которым можно группировать: имя -> функция, достающая значение из транзакции
+DIMENSIONS: Dict[str, Callable[[TransactionLike], Any]] = {
+    "state": lambda transaction: transaction.get("state"),
+    "currency": currency_code,
+    "description": lambda transaction: transaction.get("description"),
+    "year": _date_prefix(4),
+    "month": _date_prefix(7),
+    "day": _date_prefix(10),
+}
+
+METRICS = ("count", "sum_amount", "min_amount", "max_amount", "avg_amount")
+
+
+def _amount_minor(transaction: TransactionLike) -> Optional[int]:
+    """Сумма транзакции в минимальных единицах; None, если суммы нет или она некорректна."""
+    if isinstance(transaction, Transaction):
+        amount = transaction.amount
+    else:
+        amount = (transaction.get("operationAmount") or {}).get("amount")
+    if isinstance(amount, Money):
+        return amount.minor
+    if amount is None:
+        return None
+    try:
+        return to_minor(amount)
+    except ValueError:
+        return None
+
+
+class _Group:
+    """Накопленные значения одной группы. Все суммы — целые, поэтому слияние частей точное."""
+
+    __slots__ = ("count", "amounts", "total", "low", "high")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.amounts = 0
+        self.total = 0
+        self.low: Optional[int] = None
+        self.high: Optional[int] = None
+
+    def merge(self, other: "_Group") -> None:
+        self.count += other.count
+        self.amounts += other.amounts
+        self.total += other.total
+        if other.low is not None and (self.low is None or other.low < self.low):
+            self.low = other.low
+        if other.high is not None and (self.high is None or other.high > self.high):
+            self.high = other.high
+
+    def metric(self, name: str) -> Any:
+        if name == "count":
+            return self.count
+        if name == "sum_amount":
+            return self.total / SCALE
+        if name == "avg_amount":
+            return self.total / self.amounts / SCALE if self.amounts else None
+        value = self.low if name == "min_amount" else self.high
+        return None if value is None else value / SCALE
+
+
+class Aggregator:
+    """
+    Группировка транзакций за один проход с подсчётом метрик по каждой группе.
+
+    Транзакции добавляются по одной (add) или потоком (update), группы создаются
+    по мере появления новых значений измерений. Суммы считаются в целых
+    минимальных единицах (копейках), поэтому агрегаты частей данных — например,
+    порций файла или результатов разных процессов — объединяются через merge
+    без потери точности, и результат не зависит от порядка слияния.
+    Транзакции без суммы или с некорректной суммой учитываются только в count.
+    Метрики сумм требуют измерения currency, чтобы не складывать суммы в разных валютах.
+    """
+
+    def __init__(self, by: Sequence[str] = ("state",), metrics: Sequence[str] = ("count",)) -> None:
+        unknown = [name for name in by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Неизвестные измерения: {', '.join(unknown)}. Доступны: {', '.join(DIMENSIONS)}.")
+        unknown = [name for name in metrics if name not in METRICS]
+        if unknown:
+            raise ValueError(f"Неизвестные метрики: {', '.join(unknown)}. Доступны: {', '.join(METRICS)}.")
+        amount_metrics = [name for name in metrics if name != "count"]
+        if amount_metrics and "currency" not in by:
+            raise ValueError(
+                f"Метрики {', '.join(amount_metrics)} требуют измерения currency: "
+                "суммы в разных валютах не складываются."
+            )
+        self.by = tuple(by)
+        self.metrics = tuple(metrics)
+        self._groups: Dict[GroupKey, _Group] = {}
+        self._extractors = [DIMENSIONS[name] for name in self.by]
+        self._with_amounts = any(name != "count" for name in self.metrics)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Функции измерений (lambda) не сериализуются pickle, поэтому передаётся состояние to_dict:
+        # агрегаты можно возвращать из процессов ProcessPoolExecutor и объединять через merge
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        Aggregator.__init__(self, state["by"], state["metrics"])
+        self._restore_groups(state["groups"])
+
+    def add(self, transaction: TransactionLike) -> None:
+        """Учитывает одну транзакцию."""
+        self.update((transaction,))
+
+    def update(self, transactions: Iterable[TransactionLike]) -> "Aggregator":
+        """Учитывает все транзакции из списка или итератора за один проход."""
+        groups = self._groups
+        extractors = self._extractors
+        with_amounts = self._with_amounts
+        for transaction in transactions:
+            key = tuple([extract(transaction) for extract in extractors])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _Group()
+            group.count += 1
+            if with_amounts:
+                minor = _amount_minor(transaction)
+                if minor is not None:
+                    group.amounts += 1
+                    group.total += minor
+                    if group.low is None or minor < group.low:
+                        group.low = minor
+                    if group.high is None or minor > group.high:
+                        group.high = minor
+        return self
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        """Добавляет к этим агрегатам агрегаты другой части данных с теми же by и metrics."""
+        if other.by != self.by or other.metrics != self.metrics:
+            raise ValueError("Объединять можно только агрегаты с одинаковыми измерениями и метриками.")
+        groups = self._groups
+        for key, other_group in other._groups.items():
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _Group()
+            group.merge(other_group)
+        return self
+
+    def clear(self) -> None:
+        """Удаляет все накопленные группы."""
+        self._groups.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Состояние в виде, пригодном для JSON: измерения, метрики и накопленные значения групп."""
+        return {
+            "by": list(self.by),
+            "metrics": list(self.metrics),
+            "groups": [
+                [list(key), group.count, group.amounts, group.total, group.low, group.high]
+                for key, group in self._groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Aggregator":
+        """Восстанавливает агрегаты из to_dict, например после перезапуска."""
+        aggregator = cls(data["by"], data["metrics"])
+        aggregator._restore_groups(data["groups"])
+        return aggregator
+
+    def _restore_groups(self, groups: List[List[Any]]) -> None:
+        for key, count, amounts, total, low, high in groups:
+            group = self._groups[tuple(key)] = _Group()
+            group.count, group.amounts, group.total, group.low, group.high = count, amounts, total, low, high
+
+    def result(self) -> Dict[GroupKey, Dict[str, Any]]:
+        """
+        Метрики по группам в порядке появления групп.
+
+        :return: Словарь {(значения измерений): {метрика: значение}}; суммы — в единицах валюты,
+            min/max/avg — None, если в группе нет транзакций с суммой
+        """
+        return {
+            key: {name: group.metric(name) for name in self.metrics} for key, group in self._groups.items()
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Те же результаты плоскими словарями: измерения и метрики, например для отчёта или CSV."""
+        return [{**dict(zip(self.by, key)), **values} for key, values in self.result().items()]
+
+
+@timed()
+def aggregate(
+    transactions: Iterable[TransactionLike],
+    by: Sequence[str] = ("state",),
+    metrics: Sequence[str] = ("count",),
+) -> Dict[GroupKey, Dict[str, Any]]:
+    """
+    Функция группирует транзакции по измерениям by и считает метрики каждой группы за один проход.
+    Принимает список, итератор (например, из iter_transactions) и записи Transaction.
+
+    Измерения: state, currency, description, year, month, day (по дате транзакции).
+    Метрики: count, sum_amount, min_amount, max_amount, avg_amount (метрики сумм — только вместе
+    с измерением currency).
+    Для объединения результатов нескольких порций используйте Aggregator и merge.
+
+    Пример: aggregate(transactions, by=["state", "currency"], metrics=["count", "sum_amount"])
+    -> {("EXECUTED", "RUB"): {"count": 30, "sum_amount": 123456.78}, ...}
+    """
+    return Aggregator(by, metrics).update(transactions).result()
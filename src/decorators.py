@@ -1,46 +1,172 @@
-def log(filename=None):  # type: ignore[no-untyped-def]
+import atexit
+import functools
+import itertools
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar, cast
+
+from src.metrics import REGISTRY, MetricsRegistry
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _BufferedLogWriter:
+    """
+    Общий буферизованный писатель для одного файла лога.
+
+    Файл открывается один раз (при первой записи) и остаётся открытым. Строки копятся
+    в памяти и сбрасываются на диск, когда буфер превышает buffer_size, через
+    flush_interval секунд после первой несброшенной строки или при завершении программы.
+    Блокировка гарантирует, что строки из разных потоков не перемешиваются.
+    """
+
+    def __init__(self, path: str, buffer_size: int, flush_interval: Optional[float]) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._lines: List[str] = []
+        self._size = 0
+        self._file: Optional[IO[str]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            self._size += len(line)
+            if self._size >= self.buffer_size:
+                self._flush_locked()
+            elif self._timer is None and self.flush_interval is not None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._lines:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(self._lines))
+        self._file.flush()
+        self._lines.clear()
+        self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_writers: Dict[str, _BufferedLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(filename: str, buffer_size: int, flush_interval: Optional[float]) -> _BufferedLogWriter:
+    """Возвращает общий писатель для файла; параметры буфера задаёт первый декоратор, указавший этот файл."""
+    path = os.path.abspath(filename)
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.setdefault(path, _BufferedLogWriter(path, buffer_size, flush_interval))
+    return writer
+
+
+def flush_log_files() -> None:
+    """Сбрасывает на диск буферы всех файлов, в которые пишет декоратор log."""
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+def _close_log_files() -> None:
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+atexit.register(_close_log_files)
+
+
+def _shorten(text: str, max_repr: Optional[int]) -> str:
+    if max_repr is None or len(text) <= max_repr:
+        return text
+    return text[:max_repr] + "..."
+
+
+def log(  # type: ignore[no-untyped-def]
+    filename=None,
+    sample_every: int = 1,
+    max_repr: Optional[int] = None,
+    buffer_size: int = 64 * 1024,
+    flush_interval: Optional[float] = 1.0,
+):
     """
     Декоратор для логирования вызова функции, её аргументов и результата.
     Если указан `filename`, лог записывается в файл. Иначе — выводится в консоль.
     В случае ошибки логируется сообщение об исключении и входные параметры функции.
+
+    Запись в файл буферизуется (см. _BufferedLogWriter): файл не открывается на каждый вызов,
+    а строки сбрасываются по размеру буфера, по таймеру flush_interval или при выходе;
+    flush_log_files() сбрасывает буферы принудительно.
+    Сообщения об ошибках сбрасываются на диск сразу.
+    sample_every=N логирует только каждый N-й успешный вызов (ошибки логируются всегда),
+    а строки для пропущенных вызовов даже не форматируются.
+    max_repr обрезает представление аргументов и результата до заданной длины.
     """
+    if sample_every < 1:
+        raise ValueError("sample_every должен быть не меньше 1")
 
     def decorator(func):  # type: ignore[no-untyped-def]
+        counter = itertools.count()
+        name = func.__name__
+
+        if filename:
+            writer = _get_writer(filename, buffer_size, flush_interval)
+
+            def emit(message: str, urgent: bool = False) -> None:
+                writer.write(message + "\n")
+                if urgent:
+                    writer.flush()
+
+        else:
+
+            def emit(message: str, urgent: bool = False) -> None:
+                print(message)
+
+        def describe_call(args: Any, kwargs: Any) -> str:
+            return f"args: {_shorten(str(args), max_repr)}, kwargs: {_shorten(str(kwargs), max_repr)}"
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            sampled = sample_every == 1 or next(counter) % sample_every == 0
             try:
                 # Логирование начала вызова
-                msg_start = f"Calling function '{func.__name__}' with args: {args}, kwargs: {kwargs}"
-
-                if filename:
-                    with open(filename, "a") as f:
-                        f.write(msg_start + "\n")
-                else:
-                    print(msg_start)
+                if sampled:
+                    emit(f"Calling function '{name}' with {describe_call(args, kwargs)}")
 
                 # Вызов самой функции
                 result = func(*args, **kwargs)
 
                 # Логирование успешного завершения
-                msg_success = f"Function '{func.__name__}' returned: {result}"
-                if filename:
-                    with open(filename, "a") as f:
-                        f.write(msg_success + "\n")
-                else:
-                    print(msg_success)
+                if sampled:
+                    emit(f"Function '{name}' returned: {_shorten(str(result), max_repr)}")
 
                 return result
 
             except Exception as e:
-                # Логирование ошибки
-                msg_error = (
-                    f"Function '{func.__name__}' raised exception: {type(e).__name__}:"
-                    f" {e} with args: {args}, kwargs: {kwargs}"
+                # Логирование ошибки (независимо от выборки, сразу на диск)
+                emit(
+                    f"Function '{name}' raised exception: {type(e).__name__}: {e} with {describe_call(args, kwargs)}",
+                    urgent=True,
                 )
-                if filename:
-                    with open(filename, "a") as f:
-                        f.write(msg_error + "\n")
-                else:
-                    print(msg_error)
                 raise  # повторно выбрасываем исключение
 
         return wrapper
@@ -48,31 +174,29 @@ def log(filename=None):  # type: ignore[no-untyped-def]
     return decorator
 
 
-# Примеры использования декоратора
-@log(filename="log_file.log")
-# @log(filename=None)
-def get_mask_account(account_number: str) -> str:
-    masked_number = f"**{account_number[-4:]}"
-    return masked_number
-
-
-@log(filename="log_file.log")
-# @log(filename=None)
-def get_mask_card_number(card_number: str) -> str:
-    return f"{card_number[:4]} {card_number[4:6]}" f"** **** {card_number[-4:]}"
-
-
-@log("log_file.log")
-def divide(a, b):  # type: ignore[no-untyped-def]
-    return a / b
+def timed(name: Optional[str] = None, registry: Optional[MetricsRegistry] = None) -> Callable[[F], F]:
+    """
+    Декоратор для сбора статистики вызовов: число вызовов, число ошибок и гистограмма
+    длительностей (perf_counter_ns, фиксированные корзины с шагом x2 от 1 мкс).
+    Статистика копится в registry (по умолчанию metrics.REGISTRY), откуда её можно
+    выгрузить в JSON или текстовый формат Prometheus и посмотреть p50/p99.
+    """
 
+    def decorator(func: F) -> F:
+        stats = (registry or REGISTRY).stats(name or f"{func.__module__}.{func.__qualname__}")
+        clock = time.perf_counter_ns
 
-# Успешный вызов
-# divide(10, 2)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                stats.record(clock() - start, failed=True)
+                raise
+            stats.record(clock() - start)
+            return result
 
-# Вызов с ошибкой
-# divide(5, 0)
+        return cast(F, wrapper)
 
-if __name__ == "__main__":
-    get_mask_account("12345678901234567890")
-    get_mask_card_number("1234567890123456")
+    return decorator
@@ -1,26 +1,291 @@
+import asyncio
+import functools
+import math
 import os
-from typing import Union, cast
+import threading
+import time
+from datetime import date
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-load_dotenv()
+from src.decorators import timed
+from src.index import currency_code
+from src.money import Money, multiply_minor
+from src.rate_history import DEFAULT_PATH, RateHistory, day_number
+from src.ratelimit import SingleFlight, TokenBucket
+from src.transaction import Transaction, TransactionLike
 
-API_KEY = os.getenv("API_KEY")
+DEFAULT_API_URL = "https://api.apilayer.com/currency_data"
+
+# Адрес API и ключ читаются из окружения и .env при первом запросе, а не при импорте модуля;
+# адрес можно переопределить переменной EXCHANGE_API_URL, например для локальной заглушки
+API_URL: Optional[str] = None
+API_KEY: Optional[str] = None
+
+# Таймауты запроса: (соединение, чтение) в секундах
+TIMEOUT = (3.05, 10.0)
+
+# Повторы при сетевых ошибках и ответах 429/5xx: не больше RETRIES раз с паузами 0.3, 0.6, 1.2 с...
+RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Функция HTTP-запроса с сигнатурой requests.get; None — общая сессия _session()
+HttpGet = Callable[..., requests.Response]
+_http_get: Optional[HttpGet] = None
+
+_session_instance: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """Общая сессия: соединения с API переиспользуются (keep-alive), повторы с растущей паузой."""
+    global _session_instance
+    if _session_instance is None:
+        with _session_lock:
+            if _session_instance is None:
+                retry = Retry(
+                    total=RETRIES,
+                    backoff_factor=RETRY_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET",),
+                    raise_on_status=False,
+                )
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session_instance = session
+    return _session_instance
+
+
+# Одновременные запросы одного и того же курса из разных потоков объединяются в один
+_rate_flight = SingleFlight()
+_rate_limiter: Optional[TokenBucket] = None
+
+
+def _get(url: str) -> requests.Response:
+    limiter = _rate_limiter
+    if limiter is not None:
+        limiter.acquire()
+    http_get = _http_get or _session().get
+    return http_get(url, headers={"apikey": _api_key()}, timeout=TIMEOUT)
+
+
+def enable_rate_limit(rate: float, burst: int = 1) -> TokenBucket:
+    """
+    Ограничивает частоту запросов к API: не больше rate запросов в секунду, до burst подряд.
+    Лишние запросы ждут своей очереди. Возвращает ограничитель (для stats());
+    время ожидания также попадает в metrics.REGISTRY под именем src.external_api.rate_limit_wait.
+    """
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate, burst, stats_name=f"{__name__}.rate_limit_wait")
+    return _rate_limiter
+
+
+def disable_rate_limit() -> None:
+    """Снимает ограничение частоты запросов к API."""
+    global _rate_limiter
+    _rate_limiter = None
+
+
+def coalescing_stats() -> Dict[str, int]:
+    """Число запросов курсов, ушедших в API, и вызовов, объединённых с уже выполняющимися."""
+    return _rate_flight.stats()
+
+
+def _api_key() -> str:
+    global API_KEY
+    if API_KEY is None:
+        load_dotenv()
+        API_KEY = os.getenv("API_KEY", "")
+    return API_KEY
+
+
+def _api_url() -> str:
+    global API_URL
+    if API_URL is None:
+        load_dotenv()
+        API_URL = os.getenv("EXCHANGE_API_URL", DEFAULT_API_URL)
+    return API_URL
+
+
+def set_http_get(http_get: Optional[HttpGet]) -> None:
+    """
+    Подменяет функцию HTTP-запроса (сигнатура как у requests.get).
+    None возвращает общую сессию requests с пулом соединений.
+    """
+    global _http_get
+    _http_get = http_get
+
+
+class RateCache:
+    """
+    Кэш курсов валют в памяти с ограниченным временем жизни (TTL).
+
+    Пока значение моложе ttl секунд, оно возвращается без запроса к API. Устаревшее
+    значение тоже возвращается сразу (stale-while-revalidate), а свежий курс
+    запрашивается в фоновом потоке — по одному потоку на валюту. Неудачные ответы
+    (курс 0.0) не кэшируются: при промахе ошибка возвращается вызывающему, а при
+    фоновом обновлении остаётся прежнее значение.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        if ttl <= 0:
+            raise ValueError("TTL кэша должен быть положительным.")
+        self.ttl = ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, float]] = {}
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, currency: str, fetch: Callable[[str], float]) -> float:
+        """Возвращает курс из кэша или вызывает fetch и запоминает удачный результат."""
+        with self._lock:
+            entry = self._entries.get(currency)
+            if entry is not None:
+                rate, fetched_at = entry
+                if self._clock() - fetched_at < self.ttl:
+                    self.hits += 1
+                    return rate
+                self.stale_hits += 1
+                if currency not in self._refreshing:
+                    self._refreshing.add(currency)
+                    threading.Thread(target=self._refresh, args=(currency, fetch), daemon=True).start()
+                return rate
+            self.misses += 1
+
+        rate = fetch(currency)
+        if rate > 0:
+            with self._lock:
+                self._entries[currency] = (rate, self._clock())
+        return rate
+
+    def get_many(
+        self, currencies: Sequence[str], fetch_many: Callable[[Tuple[str, ...]], Dict[str, float]]
+    ) -> Dict[str, float]:
+        """
+        Курсы нескольких валют: свежие берутся из кэша, а отсутствующие и устаревшие
+        запрашиваются одним вызовом fetch_many; удачные результаты запоминаются.
+        """
+        result: Dict[str, float] = {}
+        wanted: List[str] = []
+        with self._lock:
+            now = self._clock()
+            for currency in currencies:
+                entry = self._entries.get(currency)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self.hits += 1
+                    result[currency] = entry[0]
+                else:
+                    self.misses += 1
+                    wanted.append(currency)
+
+        if wanted:
+            fetched = fetch_many(tuple(wanted))
+            with self._lock:
+                now = self._clock()
+                for currency, rate in fetched.items():
+                    if rate > 0:
+                        self._entries[currency] = (rate, now)
+            result.update(fetched)
+        return result
+
+    def _refresh(self, currency: str, fetch: Callable[[str], float]) -> None:
+        try:
+            rate = fetch(currency)
+        except Exception:
+            rate = 0.0
+        with self._lock:
+            self._refreshing.discard(currency)
+            if rate > 0:
+                self._entries[currency] = (rate, self._clock())
+                self.refreshes += 1
+            else:
+                self.refresh_errors += 1
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.stale_hits = self.misses = self.refreshes = self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий (свежих и устаревших), промахов и фоновых обновлений."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+_rate_cache: Optional[RateCache] = None
+
+
+def enable_rate_cache(ttl: float = 300.0) -> RateCache:
+    """Включает кэширование курсов в get_currency_rate и get_rates и возвращает кэш (для статистики и clear())."""
+    global _rate_cache
+    _rate_cache = RateCache(ttl)
+    return _rate_cache
+
+
+def disable_rate_cache() -> None:
+    """Выключает кэширование курсов и освобождает кэш."""
+    global _rate_cache
+    _rate_cache = None
 
 
 def get_currency_rate(base_currency: str) -> float:
     """
     Получает курс указанной валюты к RUB.
+    После enable_rate_cache() курс берётся из кэша, пока не истёк его TTL.
+    Если курс этой валюты уже запрашивается другим потоком, вызов дожидается его ответа.
 
     :param base_currency: Базовая валюта (например, USD или EUR)
     :return: Курс (float) или 0.0 при ошибке
     """
-    url = f"https://api.apilayer.com/currency_data/live?source={base_currency}&currencies=RUB"
-    headers = {"apikey": API_KEY}
+    cache = _rate_cache
+    if cache is not None:
+        return cache.get_or_fetch(base_currency, _fetch_currency_rate)
+    return _fetch_currency_rate(base_currency)
+
 
+def _fetch_currency_rate(base_currency: str) -> float:
+    return _rate_flight.do(("rate", base_currency), lambda: _request_currency_rate(base_currency))
+
+
+def _request_currency_rate(base_currency: str) -> float:
     try:
-        response = requests.get(url, headers=headers)
+        response = _get(f"{_api_url()}/live?source={base_currency}&currencies=RUB")
         response.raise_for_status()
         data = response.json()
 
@@ -35,24 +300,123 @@ def get_currency_rate(base_currency: str) -> float:
         return 0.0
 
 
+def get_rates(currencies: Iterable[str]) -> Dict[str, float]:
+    """
+    Получает курсы нескольких валют к RUB одним запросом.
+
+    API возвращает котировки RUB к каждой валюте (source=RUB), курс валюты к RUB —
+    обратная величина. Для RUB курс 1.0 без запроса. После enable_rate_cache() свежие
+    курсы берутся из кэша, а запрашиваются только отсутствующие и устаревшие.
+
+    :param currencies: Коды валют (например, ["USD", "EUR"])
+    :return: Словарь {код: курс}; при ошибке курс равен 0.0, как в get_currency_rate
+    """
+    codes: List[str] = list(dict.fromkeys(currencies))
+    rates = {code: 1.0 for code in codes if code == "RUB"}
+    wanted = tuple(code for code in codes if code != "RUB")
+    if wanted:
+        cache = _rate_cache
+        rates.update(_fetch_rates(wanted) if cache is None else cache.get_many(wanted, _fetch_rates))
+    return {code: rates[code] for code in codes}
+
+
+def _fetch_rates(wanted: Tuple[str, ...]) -> Dict[str, float]:
+    return _rate_flight.do(("rates", wanted), lambda: _request_rates(wanted))
+
+
+def get_historical_rates(day: str, currencies: Iterable[str]) -> Dict[str, float]:
+    """
+    Получает курсы нескольких валют к RUB на прошедший день одним запросом.
+
+    :param day: День в формате ГГГГ-ММ-ДД
+    :param currencies: Коды валют
+    :return: Словарь {код: курс}; для RUB — 1.0, при ошибке — 0.0
+    """
+    codes: List[str] = list(dict.fromkeys(currencies))
+    rates = {code: 1.0 for code in codes if code == "RUB"}
+    wanted = tuple(code for code in codes if code != "RUB")
+    if wanted:
+        rates.update(_rate_flight.do(("historical", day, wanted), lambda: _request_rates(wanted, day)))
+    return {code: rates[code] for code in codes}
+
+
+def _request_rates(wanted: Tuple[str, ...], day: Optional[str] = None) -> Dict[str, float]:
+    rates = dict.fromkeys(wanted, 0.0)
+    if day is None:
+        url = f"{_api_url()}/live?source=RUB&currencies={','.join(wanted)}"
+    else:
+        url = f"{_api_url()}/historical?date={day}&source=RUB&currencies={','.join(wanted)}"
+    try:
+        response = _get(url)
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get("success"):
+            quotes = data["quotes"]
+            for code in wanted:
+                quote = quotes.get(f"RUB{code}", 0.0)
+                rates[code] = 1 / quote if quote > 0 else 0.0
+        else:
+            print(f"Ошибка при получении курсов {', '.join(wanted)}:", data.get("message"))
+    except (requests.RequestException, KeyError, ValueError, TypeError) as e:
+        print(f"Ошибка сети или формата данных для {', '.join(wanted)}:", e)
+    return rates
+
+
+_rate_history: Optional[RateHistory] = None
+_rate_history_lock = threading.Lock()
+
+
+def get_rate_history(path: str = DEFAULT_PATH) -> RateHistory:
+    """Таблица исторических курсов: загружается из файла один раз за время работы программы."""
+    global _rate_history
+    if _rate_history is None or _rate_history.path != path:
+        with _rate_history_lock:
+            if _rate_history is None or _rate_history.path != path:
+                _rate_history = RateHistory.load(path)
+    return _rate_history
+
+
 def get_exchange_rates() -> dict:
     """
-    Получает курсы USD и EUR к RUB в двух отдельных запросах.
+    Получает курсы USD и EUR к RUB одним запросом (через get_rates).
 
     :return: Словарь с курсами {'USD': rate, 'EUR': rate}
     """
-    return {"USD": get_currency_rate("USD"), "EUR": get_currency_rate("EUR")}
+    return get_rates(["USD", "EUR"])
+
 
+@overload
+def convert_to_rub(amount: Money, currency: str, exchange_rates: dict[str, float]) -> Money:
+    ...
 
+
+@overload
 def convert_to_rub(amount: Union[str, float], currency: str, exchange_rates: dict[str, float]) -> float:
+    ...
+
+
+@timed()
+def convert_to_rub(
+    amount: Union[str, float, Money], currency: str, exchange_rates: dict[str, float]
+) -> Union[float, Money]:
     """
     Конвертирует сумму в RUB на основе переданных курсов.
 
-    :param amount: Сумма транзакции
+    :param amount: Сумма транзакции (строка, число или Money)
     :param currency: Код валюты (например, USD, EUR, RUB)
     :param exchange_rates: Словарь с курсами {'USD': rate, 'EUR': rate}
-    :return: Сумма в рублях (float)
+    :return: Сумма в рублях: float, а для Money — Money в RUB, округлённая до копейки (ROUND_HALF_UP)
     """
+    if isinstance(amount, Money):
+        if currency == "RUB":
+            return Money(amount.minor, "RUB")
+        money_rate = exchange_rates.get(currency, 0.0)
+        if money_rate <= 0:
+            print(f"Некорректный курс для {currency}: {money_rate}")
+            return Money(0, "RUB")
+        return amount.convert(money_rate, "RUB")
+
     if currency == "RUB":
         return float(amount)
 
@@ -62,3 +426,285 @@ def convert_to_rub(amount: Union[str, float], currency: str, exchange_rates: dic
         return float(0.0)
 
     return float(amount) * rate
+
+
+# Группы меньше этого размера быстрее умножить в цикле Python, чем передавать в NumPy
+NUMPY_MIN_GROUP = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Модуль numpy, если он установлен (необязательная зависимость), иначе None."""
+    try:
+        import numpy  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return numpy
+
+
+def convert_many(
+    transactions: Iterable[TransactionLike], rates: Dict[str, float], use_numpy: Optional[bool] = None
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Пакетная конвертация транзакций в RUB.
+
+    Транзакции за один проход раскладываются по валютам, затем каждая группа
+    переводится в рубли целиком: сумма разбирается один раз и сразу умножается на курс
+    группы. Результат для каждой транзакции совпадает с convert_to_rub, сообщение о
+    некорректном курсе печатается один раз на валюту. Подытоги считаются через math.fsum.
+    Если суммы группы — Money (загрузка с as_money=True), группа считается в целых
+    копейках: результаты и подытог — Money в RUB, подытог точный. Записи без суммы
+    не входят ни в одну группу и подытоги: для них возвращается 0 того же типа, что
+    и у остальных результатов (Money в RUB, если все суммы — Money, иначе 0.0).
+
+    :param transactions: Транзакции (словари или записи Transaction)
+    :param rates: Курсы валют к RUB, как в convert_to_rub
+    :param use_numpy: True — умножать большие группы через NumPy, False — без NumPy,
+        None — через NumPy, если он установлен
+    :return: Суммы в RUB в порядке транзакций и подытоги в RUB по валютам
+    """
+    np = None
+    if use_numpy is not False:
+        np = _numpy()
+        if np is None and use_numpy:
+            raise ImportError("Для use_numpy=True нужен установленный пакет numpy.")
+
+    groups: Dict[str, Tuple[List[int], List[Any]]] = {}
+    no_amount: List[int] = []
+    count = 0
+    for count, transaction in enumerate(transactions, 1):
+        if isinstance(transaction, dict):
+            # Быстрый путь для словаря в формате operations.json; нестандартные записи — через общие функции
+            try:
+                operation_amount = transaction["operationAmount"]
+                code, amount = operation_amount["currency"]["code"], operation_amount["amount"]
+            except (KeyError, TypeError):
+                code, amount = currency_code(transaction) or "", _amount(transaction)
+        else:
+            code, amount = transaction.currency_code or "", transaction.amount
+        if amount is None:
+            # Запись без суммы (например, пустой словарь) не участвует в группах и проверке курса
+            no_amount.append(count - 1)
+            continue
+        group = groups.get(code)
+        if group is None:
+            group = groups[code] = ([], [])
+        group[0].append(count - 1)
+        group[1].append(amount)
+
+    result: List[Any] = [0.0] * count
+    subtotals: Dict[str, Any] = {}
+    all_money = bool(groups)
+    for code, (positions, amounts) in groups.items():
+        in_money = all(isinstance(amount, Money) for amount in amounts)
+        all_money = all_money and in_money
+        rate = 1.0 if code == "RUB" else rates.get(code, 0.0)
+        if rate <= 0:
+            print(f"Некорректный курс для {code}: {rate}")
+            zero = Money(0, "RUB") if in_money else 0.0
+            for position in positions:
+                result[position] = zero
+            subtotals[code] = zero
+            continue
+        if in_money:
+            minors = multiply_minor([amount.minor for amount in amounts], rate)
+            for position, minor in zip(positions, minors):
+                result[position] = Money(minor, "RUB")
+            subtotals[code] = Money(sum(minors), "RUB")
+            continue
+        if np is not None and len(amounts) >= NUMPY_MIN_GROUP:
+            converted = (np.array(amounts, dtype=np.float64) * rate).tolist()
+        else:
+            converted = [float(amount) * rate for amount in amounts]
+        for position, value in zip(positions, converted):
+            result[position] = value
+        subtotals[code] = math.fsum(converted)
+    if all_money:
+        zero = Money(0, "RUB")
+        for position in no_amount:
+            result[position] = zero
+    return result, subtotals
+
+
+def total_in_rub(
+    transactions: Iterable[TransactionLike], rates: Dict[str, float], use_numpy: Optional[bool] = None
+) -> Union[float, Money]:
+    """
+    Общая сумма транзакций в RUB (см. convert_many).
+
+    :param transactions: Транзакции (словари или записи Transaction)
+    :param rates: Курсы валют к RUB
+    :param use_numpy: Как в convert_many
+    :return: Сумма в рублях: Money, если все суммы были Money, иначе float
+    """
+    _, subtotals = convert_many(transactions, rates, use_numpy)
+    if subtotals and all(isinstance(subtotal, Money) for subtotal in subtotals.values()):
+        return Money.sum(subtotals.values(), "RUB")
+    return math.fsum(map(float, subtotals.values()))
+
+
+async def get_currency_rate_async(base_currency: str, semaphore: Optional[asyncio.Semaphore] = None) -> float:
+    """
+    Асинхронный вариант get_currency_rate.
+
+    Запрос выполняется в пуле потоков (asyncio.to_thread) через ту же сессию, кэш и
+    повторы, поэтому не блокирует цикл событий. semaphore ограничивает число
+    одновременных запросов.
+
+    :param base_currency: Базовая валюта (например, USD или EUR)
+    :param semaphore: Общий семафор для ограничения параллельных запросов
+    :return: Курс (float) или 0.0 при ошибке
+    """
+    if semaphore is None:
+        return await asyncio.to_thread(get_currency_rate, base_currency)
+    async with semaphore:
+        return await asyncio.to_thread(get_currency_rate, base_currency)
+
+
+async def get_rates_async(currencies: Iterable[str], concurrency: int = 8) -> Dict[str, float]:
+    """
+    Получает курсы нескольких валют к RUB параллельно, не больше concurrency запросов одновременно.
+
+    :param currencies: Коды валют
+    :param concurrency: Наибольшее число одновременных запросов
+    :return: Словарь {код: курс}; для RUB — 1.0 без запроса, при ошибке — 0.0
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency должен быть положительным числом")
+    codes = list(dict.fromkeys(currencies))
+    semaphore = asyncio.Semaphore(concurrency)
+    wanted = [code for code in codes if code != "RUB"]
+    fetched = await asyncio.gather(*(get_currency_rate_async(code, semaphore) for code in wanted))
+    rates = dict(zip(wanted, fetched))
+    return {code: 1.0 if code == "RUB" else rates[code] for code in codes}
+
+
+def convert_transactions_at_date(
+    transactions: Iterable[TransactionLike], history: Optional[RateHistory] = None, fetch_missing: bool = True
+) -> List[Union[float, Money]]:
+    """
+    Конвертирует каждую транзакцию в RUB по курсу на день её даты.
+
+    Курсы берутся из таблицы history (по умолчанию — get_rate_history()). Курсы, которых
+    нет в таблице, запрашиваются одним запросом на каждый недостающий день и сохраняются
+    в файл таблицы, поэтому повторная конвертация тех же дней не обращается к сети.
+    Если курс получить не удалось, используется курс ближайшего предыдущего дня, а неудача
+    запоминается в таблице (RateHistory.mark_failed), и пока таблица в памяти, этот день
+    повторно не запрашивается.
+
+    :param transactions: Транзакции (словари или записи Transaction)
+    :param history: Таблица исторических курсов
+    :param fetch_missing: Запрашивать ли недостающие курсы у API
+    :return: Суммы в RUB в порядке транзакций (Money для сумм Money); 0.0, если курс неизвестен,
+        нет валюты или суммы, а дата отсутствует или некорректна
+    """
+    rows = [(transaction, currency_code(transaction) or "", _day(transaction)) for transaction in transactions]
+    if history is None:
+        history = get_rate_history()
+
+    if fetch_missing:
+        missing = history.missing((code, day) for _, code, day in rows if code and day is not None)
+        for number, codes in sorted(missing.items()):
+            rates = get_historical_rates(date.fromordinal(number).isoformat(), codes)
+            history.update(number, rates)
+            for failed in [code for code, fetched in rates.items() if fetched <= 0]:
+                history.mark_failed(failed, number)
+        if missing and history.path is not None:
+            history.save()
+
+    result: List[Union[float, Money]] = []
+    for transaction, code, day in rows:
+        amount = _amount(transaction)
+        if amount is None or not code:
+            result.append(0.0)
+            continue
+        rate = history.rate_at(code, day) if day is not None else None
+        result.append(convert_to_rub(amount, code, {code: rate or 0.0}))
+    return result
+
+
+def _day(transaction: TransactionLike) -> Optional[int]:
+    """Номер дня даты транзакции; None, если даты нет или её не удалось разобрать."""
+    day = transaction.get("date")
+    if not day:
+        return None
+    try:
+        return day_number(day)
+    except ValueError:
+        return None
+
+
+def _amount(transaction: TransactionLike) -> Any:
+    """Сумма транзакции; None, если в записи нет суммы (например, пустой словарь в operations.json)."""
+    if isinstance(transaction, Transaction):
+        return transaction.amount
+    operation_amount = transaction.get("operationAmount")
+    return operation_amount.get("amount") if isinstance(operation_amount, dict) else None
+
+
+async def _as_async(transactions: Union[Iterable[TransactionLike], AsyncIterable[TransactionLike]]) -> AsyncIterator:
+    if isinstance(transactions, AsyncIterable):
+        async for transaction in transactions:
+            yield transaction
+    else:
+        for transaction in transactions:
+            yield transaction
+
+
+async def convert_transactions_async(
+    transactions: Union[Iterable[TransactionLike], AsyncIterable[TransactionLike]], concurrency: int = 8
+) -> AsyncIterator[Tuple[TransactionLike, Union[float, Money]]]:
+    """
+    Асинхронный конвейер конвертации транзакций в RUB.
+
+    Курс каждой новой валюты запрашивается сразу, как только она встретилась во входе
+    (не больше concurrency запросов одновременно), а транзакции выдаются, как только
+    готов курс их валюты: рублёвые — сразу, остальные — по мере прихода курсов. Поэтому
+    порядок выдачи может отличаться от входного. Вход может быть обычным или
+    асинхронным итерируемым (например, другим этапом конвейера). Записи без кода
+    валюты или без суммы выдаются сразу с суммой 0.0, курс для них не запрашивается.
+
+    :param transactions: Транзакции (словари или записи Transaction)
+    :param concurrency: Наибольшее число одновременных запросов курсов
+    :return: Асинхронный итератор пар (транзакция, сумма в RUB)
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency должен быть положительным числом")
+    semaphore = asyncio.Semaphore(concurrency)
+    requests_by_code: Dict[str, "asyncio.Task[float]"] = {}
+    waiting: Dict[str, List[TransactionLike]] = {}
+    rates: Dict[str, float] = {"RUB": 1.0}
+
+    def ready() -> List[Tuple[TransactionLike, Union[float, Money]]]:
+        converted = []
+        for code, task in list(requests_by_code.items()):
+            if task.done():
+                del requests_by_code[code]
+                rates[code] = task.result()
+                for transaction in waiting.pop(code, []):
+                    converted.append((transaction, convert_to_rub(_amount(transaction), code, rates)))
+        return converted
+
+    try:
+        async for transaction in _as_async(transactions):
+            code = currency_code(transaction) or ""
+            if not code or _amount(transaction) is None:
+                yield transaction, 0.0
+            elif code in rates:
+                yield transaction, convert_to_rub(_amount(transaction), code, rates)
+            else:
+                waiting.setdefault(code, []).append(transaction)
+                if code not in requests_by_code:
+                    requests_by_code[code] = asyncio.create_task(get_currency_rate_async(code, semaphore))
+                    # Даём задаче начать запрос, не дожидаясь конца входных данных
+                    await asyncio.sleep(0)
+            for item in ready():
+                yield item
+
+        while requests_by_code:
+            await asyncio.wait(requests_by_code.values(), return_when=asyncio.FIRST_COMPLETED)
+            for item in ready():
+                yield item
+    finally:
+        for task in requests_by_code.values():
+            task.cancel()
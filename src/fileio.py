@@ -0,0 +1,30 @@
+import os
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional
+
+
+@contextmanager
+def atomic_write(
+    path: str, mode: str = "w", encoding: Optional[str] = None, newline: Optional[str] = None
+) -> Iterator[IO[Any]]:
+    """
+    Открывает временный файл рядом с path; при успешном выходе из блока атомарно подменяет им path.
+
+    Читатель никогда не увидит наполовину записанный файл. Если блок прерван исключением,
+    временный файл удаляется, а прежний файл остаётся нетронутым.
+
+    :param path: Путь к итоговому файлу
+    :param mode: Режим открытия временного файла ("w" или "wb")
+    :param encoding: Кодировка для текстового режима
+    :param newline: Перевод строки для текстового режима, как в open
+    :return: Открытый временный файл
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, encoding=encoding, newline=newline) as file:
+            yield file
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -1,74 +1,34 @@
-from typing import Dict, Iterator, List
+from typing import Iterable, Iterator, Optional
 
-transactions = [
-    {
-        "id": 939719570,
-        "state": "EXECUTED",
-        "date": "2018-06-30T02:08:58.425572",
-        "operationAmount": {"amount": "9824.07", "currency": {"name": "USD", "code": "USD"}},
-        "description": "Перевод организации",
-        "from": "Счет 75106830613657916952",
-        "to": "Счет 11776614605963066702",
-    },
-    {
-        "id": 142264268,
-        "state": "EXECUTED",
-        "date": "2019-04-04T23:20:05.206878",
-        "operationAmount": {"amount": "79114.93", "currency": {"name": "USD", "code": "USD"}},
-        "description": "Перевод со счета на счет",
-        "from": "Счет 19708645243227258542",
-        "to": "Счет 75651667383060284188",
-    },
-    {
-        "id": 873106923,
-        "state": "EXECUTED",
-        "date": "2019-03-23T01:09:46.296404",
-        "operationAmount": {"amount": "43318.34", "currency": {"name": "руб.", "code": "RUB"}},
-        "description": "Перевод со счета на счет",
-        "from": "Счет 44812258784861134719",
-        "to": "Счет 74489636417521191160",
-    },
-    {
-        "id": 895315941,
-        "state": "EXECUTED",
-        "date": "2018-08-19T04:27:37.904916",
-        "operationAmount": {"amount": "56883.54", "currency": {"name": "USD", "code": "USD"}},
-        "description": "Перевод с карты на карту",
-        "from": "Visa Classic 6831982476737658",
-        "to": "Visa Platinum 8990922113665229",
-    },
-    {
-        "id": 594226727,
-        "state": "CANCELED",
-        "date": "2018-09-12T21:27:25.241689",
-        "operationAmount": {"amount": "67314.70", "currency": {"name": "руб.", "code": "RUB"}},
-        "description": "Перевод организации",
-        "from": "Visa Platinum 1246377376343588",
-        "to": "Счет 14211924144426031657",
-    },
-]
+from src.index import TransactionIndex
+from src.transaction import Transaction, TransactionLike
 
 
-def filter_by_currency(transactions: List[Dict], currency_code: str) -> Iterator[Dict]:
+def filter_by_currency(
+    transactions: Iterable[TransactionLike], currency_code: str, index: Optional[TransactionIndex] = None
+) -> Iterator[TransactionLike]:
     """
     Функция возвращает итератор, который поочередно выдает транзакции,
     где валюта операции соответствует заданной (например, USD).
+    Принимает как список, так и итератор (например, из iter_transactions),
+    а также записи Transaction. Если передан index, транзакции берутся из него.
     """
+    if index is not None:
+        index.check_source(transactions)
+        yield from index.by_currency(currency_code)
+        return
     for transaction in transactions:
-        if "operationAmount" in transaction and "currency" in transaction["operationAmount"]:
+        if isinstance(transaction, Transaction):
+            if transaction.currency_code == currency_code:
+                yield transaction
+        elif "operationAmount" in transaction and "currency" in transaction["operationAmount"]:
             if transaction["operationAmount"]["currency"]["code"] == currency_code:
                 yield transaction
 
 
-# Пример использования функции
-usd_transactions = filter_by_currency(transactions, "USD")
-for _ in range(3):
-    print(next(usd_transactions))
-
-
-def transaction_descriptions(transactions: List[Dict]) -> Iterator[str]:
+def transaction_descriptions(transactions: Iterable[TransactionLike]) -> Iterator[str]:
     """
-    Генератор, который принимает список словарей с транзакциями
+    Генератор, который принимает список словарей с транзакциями (или записей Transaction)
     и возвращает описание каждой операции по очереди.
     """
     for transaction in transactions:
@@ -76,12 +36,6 @@ def transaction_descriptions(transactions: List[Dict]) -> Iterator[str]:
             yield transaction["description"]
 
 
-# Пример использования функции
-descriptions = transaction_descriptions(transactions)
-for _ in range(5):
-    print(next(descriptions))
-
-
 def card_number_generator(start: int, stop: int) -> Iterator[str]:
     """
     Генератор, который выдает номера банковских карт в формате XXXX XXXX XXXX XXXX.
@@ -91,8 +45,3 @@ def card_number_generator(start: int, stop: int) -> Iterator[str]:
     for number in range(start, stop + 1):
         formatted_number = f"{number:016d}"
         yield f"{formatted_number[0:4]} {formatted_number[4:8]} {formatted_number[8:12]} {formatted_number[12:16]}"
-
-
-# Пример использования функции
-for card_number in card_number_generator(123456789012345, 123456789012347):
-    print(card_number)
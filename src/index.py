@@ -0,0 +1,145 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from src.transaction import Transaction, TransactionLike
+
+
+def currency_code(transaction: TransactionLike) -> Optional[str]:
+    """Достаёт код валюты так же, как generators.filter_by_currency."""
+    if isinstance(transaction, Transaction):
+        return transaction.currency_code
+    operation_amount = transaction.get("operationAmount")
+    if not isinstance(operation_amount, dict):
+        return None
+    currency = operation_amount.get("currency")
+    if not isinstance(currency, dict):
+        return None
+    return currency.get("code")
+
+
+class TransactionIndex:
+    """
+    Вторичные индексы над списком транзакций для повторяющихся запросов.
+
+    Строится один раз: хеш-индексы по статусу и коду валюты отвечают на запрос
+    на равенство за O(k), отсортированный индекс по дате — на диапазон дат
+    за O(log n + k). Результаты совпадают с filter_by_state, filter_by_currency
+    и sort_by_date, которые принимают индекс через параметр index.
+    """
+
+    def __init__(self, transactions: Sequence[TransactionLike]) -> None:
+        self.transactions = transactions
+        self._by_state: Dict[Optional[str], List[int]] = {}
+        self._by_currency: Dict[Optional[str], List[int]] = {}
+
+        for position, transaction in enumerate(transactions):
+            self._by_state.setdefault(transaction.get("state"), []).append(position)
+            self._by_currency.setdefault(currency_code(transaction), []).append(position)
+
+        # Сортировка устойчива, поэтому одинаковые даты остаются в исходном порядке, как в sort_by_date
+        self._dates = [transaction.get("date", "") for transaction in transactions]
+        self._date_order = sorted(range(len(transactions)), key=self._dates.__getitem__)
+        self._date_keys = [self._dates[position] for position in self._date_order]
+        self._date_order_desc: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def clear(self) -> None:
+        """
+        Очищает индекс (например, перед повторной загрузкой переписанного файла).
+
+        Исходный список не изменяется: индекс переходит на новый пустой список.
+        """
+        self.transactions = []
+        self._by_state.clear()
+        self._by_currency.clear()
+        self._dates.clear()
+        self._date_order.clear()
+        self._date_keys.clear()
+        self._date_order_desc = None
+
+    def extend(self, transactions: Iterable[TransactionLike]) -> None:
+        """
+        Дописывает новые транзакции в конец исходного списка и в индексы без их перестроения.
+
+        Хеш-индексы пополняются за O(1) на запись, в порядок по дате запись вставляется
+        после всех записей с той же датой — так же, как при построении индекса заново.
+        Исходная последовательность должна быть списком.
+        """
+        if not isinstance(self.transactions, list):
+            raise TypeError("Дописывать можно только в индекс над списком транзакций.")
+        for transaction in transactions:
+            position = len(self.transactions)
+            self.transactions.append(transaction)
+            self._by_state.setdefault(transaction.get("state"), []).append(position)
+            self._by_currency.setdefault(currency_code(transaction), []).append(position)
+
+            date = transaction.get("date", "")
+            self._dates.append(date)
+            low = bisect_left(self._date_keys, date)
+            high = bisect_right(self._date_keys, date)
+            if self._date_order_desc is not None:
+                # По убыванию: после всех более поздних дат и после равных (они раньше в списке)
+                self._date_order_desc.insert(len(self._date_keys) - low, position)
+            self._date_keys.insert(high, date)
+            self._date_order.insert(high, position)
+
+    def check_source(self, transactions: object) -> None:
+        """
+        Проверяет, что индекс построен именно над переданным списком и что список не менялся
+        в обход extend (иначе номера в индексе не соответствуют записям).
+        """
+        if transactions is not self.transactions:
+            raise ValueError("Индекс построен над другим списком транзакций.")
+        if len(self.transactions) != len(self._dates):
+            raise ValueError(
+                f"Список транзакций изменён после построения индекса: {len(self.transactions)} записей, "
+                f"в индексе {len(self._dates)}."
+            )
+
+    def state_positions(self, state: str) -> List[int]:
+        """Номера транзакций с заданным статусом по возрастанию."""
+        return self._by_state.get(state, [])
+
+    def currency_positions(self, code: str) -> List[int]:
+        """Номера транзакций в заданной валюте по возрастанию."""
+        return self._by_currency.get(code, [])
+
+    def date_positions(self, start: Optional[str] = None, end: Optional[str] = None) -> List[int]:
+        """Номера транзакций с датой в диапазоне [start, end] в порядке возрастания даты."""
+        low = 0 if start is None else bisect_left(self._date_keys, start)
+        high = len(self._date_keys) if end is None else bisect_right(self._date_keys, end)
+        return self._date_order[low:high]
+
+    def take(self, positions: Sequence[int]) -> List[TransactionLike]:
+        """Транзакции по их номерам."""
+        transactions = self.transactions
+        return [transactions[position] for position in positions]
+
+    def by_state(self, state: str = "EXECUTED") -> List[TransactionLike]:
+        """Транзакции с заданным статусом в исходном порядке."""
+        return self.take(self.state_positions(state))
+
+    def by_currency(self, currency_code: str) -> List[TransactionLike]:
+        """Транзакции в заданной валюте в исходном порядке."""
+        return self.take(self.currency_positions(currency_code))
+
+    def sorted_by_date(self, reverse: bool = True, limit: Optional[int] = None) -> List[TransactionLike]:
+        """Транзакции, упорядоченные по дате, как в sort_by_date (первые limit, если он задан)."""
+        if not reverse:
+            order = self._date_order
+        else:
+            if self._date_order_desc is None:
+                self._date_order_desc = sorted(range(len(self._dates)), key=self._dates.__getitem__, reverse=True)
+            order = self._date_order_desc
+        return self.take(order if limit is None else order[:limit])
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[TransactionLike]:
+        """
+        Транзакции с датой в диапазоне [start, end] по возрастанию даты.
+
+        Границы сравниваются как строки ISO, поэтому можно передавать и неполные даты,
+        например between("2019-01-01", "2019-12-31T23:59:59.999999").
+        """
+        return self.take(self.date_positions(start, end))
@@ -0,0 +1,222 @@
+import codecs
+import hashlib
+import json
+import os
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from src.aggregation import Aggregator
+from src.index import TransactionIndex
+from src.fileio import atomic_write
+from src.log_config import get_logger
+from src.utils import _ChunkReader, _is_truncated
+
+logger = get_logger(__name__, "utils.log")
+
+STATE_SUFFIX = ".ingest"
+STATE_VERSION = 1
+
+# Сколько байт перед отметкой сравнивается, чтобы заметить, что файл переписан, а не дополнен
+FINGERPRINT_BYTES = 256
+
+_EMPTY_FINGERPRINT = hashlib.sha256(b"").hexdigest()
+
+
+def state_path(file_path: str) -> str:
+    """Возвращает путь к файлу состояния, который лежит рядом с исходным JSON-файлом."""
+    return file_path + STATE_SUFFIX
+
+
+def _fingerprint(file: BinaryIO, offset: int) -> str:
+    """sha256 последних FINGERPRINT_BYTES байт перед offset."""
+    start = max(0, offset - FINGERPRINT_BYTES)
+    file.seek(start)
+    return hashlib.sha256(file.read(offset - start)).hexdigest()
+
+
+class IncrementalLoader:
+    """
+    Инкрементальная загрузка operations.json: при каждом вызове poll разбираются только
+    записи, дописанные в массив после прошлого вызова.
+
+    Отметка (high-water mark) — смещение в байтах сразу после последней разобранной
+    записи. Она, число записей, id последней записи, отпечаток байт перед отметкой
+    и состояние агрегатов сохраняются в файл рядом с данными (см. state_path), поэтому
+    после перезапуска чтение продолжается с отметки без полного пересчёта.
+    Если отпечаток не совпал или файл стал короче отметки, файл считается переписанным:
+    агрегаты и индекс очищаются, и файл читается с начала. Недописанная последняя
+    запись не разбирается, пока писатель её не закончит.
+
+    Агрегаты (Aggregator) пополняются новыми записями и восстанавливаются из состояния;
+    индекс (TransactionIndex) живёт только в памяти и пополняется через extend. Он должен
+    быть пустым или содержать ровно уже учтённые записи: пустой индекс после перезапуска
+    заполняется при следующем poll записями файла до отметки.
+
+    :raises ValueError: Если непустой индекс не совпадает по числу записей с сохранённым состоянием
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        aggregators: Sequence[Aggregator] = (),
+        index: Optional[TransactionIndex] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        self.file_path = file_path
+        self.aggregators = list(aggregators)
+        self.index = index
+        self.state_file = state_file or state_path(file_path)
+        self.offset = 0
+        self.count = 0
+        self.last_id: Optional[int] = None
+        self._fingerprint = _EMPTY_FINGERPRINT
+        self._load_state()
+        if index is not None and len(index) not in (0, self.count):
+            raise ValueError(f"Индекс содержит {len(index)} записей, а в состоянии учтено {self.count}.")
+
+    def _load_state(self) -> None:
+        """Восстанавливает отметку и агрегаты; при несовместимом состоянии чтение начнётся с начала файла."""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if state.get("version") != STATE_VERSION:
+                raise ValueError("неизвестная версия состояния")
+            saved = [Aggregator.from_dict(data) for data in state["aggregates"]]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Не удалось прочитать состояние %s, файл будет прочитан с начала: %s", self.state_file, e)
+            return
+
+        if [(saved_one.by, saved_one.metrics) for saved_one in saved] != [
+            (aggregator.by, aggregator.metrics) for aggregator in self.aggregators
+        ]:
+            logger.info("Набор агрегатов изменился, файл %s будет прочитан с начала.", self.file_path)
+            return
+        for aggregator, saved_one in zip(self.aggregators, saved):
+            aggregator.clear()
+            aggregator.merge(saved_one)
+        self.offset = state["offset"]
+        self.count = state["count"]
+        self.last_id = state["last_id"]
+        self._fingerprint = state["fingerprint"]
+
+    def _save_state(self) -> None:
+        """Атомарно записывает состояние."""
+        state = {
+            "version": STATE_VERSION,
+            "file": os.path.abspath(self.file_path),
+            "offset": self.offset,
+            "count": self.count,
+            "last_id": self.last_id,
+            "fingerprint": self._fingerprint,
+            "aggregates": [aggregator.to_dict() for aggregator in self.aggregators],
+        }
+        with atomic_write(self.state_file, encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+
+    def reset(self) -> None:
+        """Забывает отметку, агрегаты и индекс: следующий poll прочитает файл с начала."""
+        self.offset = 0
+        self.count = 0
+        self.last_id = None
+        self._fingerprint = _EMPTY_FINGERPRINT
+        for aggregator in self.aggregators:
+            aggregator.clear()
+        if self.index is not None:
+            self.index.clear()
+
+    def poll(self) -> List[Dict]:
+        """
+        Разбирает записи, дописанные после отметки, учитывает их в агрегатах и индексе
+        и сохраняет новую отметку.
+
+        :return: Новые записи (пустой список, если ничего не добавилось или файла нет)
+        """
+        if not os.path.exists(self.file_path):
+            logger.warning("Файл %s не найден.", self.file_path)
+            return []
+
+        with open(self.file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if self.offset and (size < self.offset or _fingerprint(file, self.offset) != self._fingerprint):
+                logger.warning("Файл %s переписан, он будет прочитан с начала.", self.file_path)
+                self.reset()
+            if self.index is not None and self.count and not len(self.index):
+                self._rebuild_index(file, self.index)
+            file.seek(self.offset)
+            # Незаконченный многобайтовый символ в конце файла остаётся до следующего вызова
+            text = codecs.getincrementaldecoder("utf-8")().decode(file.read(), final=False)
+
+            records, consumed = self._parse(text, self.offset == 0)
+            if not consumed:
+                return []
+            self.offset += len(text[:consumed].encode("utf-8"))
+            self._fingerprint = _fingerprint(file, self.offset)
+
+        self.count += len(records)
+        if records:
+            self.last_id = records[-1].get("id")
+        for aggregator in self.aggregators:
+            aggregator.update(records)
+        if self.index is not None:
+            self.index.extend(records)
+        self._save_state()
+        logger.info("Из файла %s загружено %d новых транзакций (всего %d).", self.file_path, len(records), self.count)
+        return records
+
+    def _rebuild_index(self, file: BinaryIO, index: TransactionIndex) -> None:
+        """Заполняет пустой индекс записями до отметки (после перезапуска индекс в памяти пуст)."""
+        file.seek(0)
+        records, _ = self._parse(file.read(self.offset).decode("utf-8"), True)
+        if len(records) != self.count:
+            logger.warning("Записи в файле %s не совпали с состоянием, он будет прочитан с начала.", self.file_path)
+            self.reset()
+            return
+        index.extend(records)
+        logger.info("Индекс восстановлен по %d записям из файла %s.", len(records), self.file_path)
+
+    def _parse(self, text: str, at_start: bool) -> Tuple[List[Dict], int]:
+        """
+        Разбирает элементы массива с начала text; возвращает записи и число разобранных символов.
+
+        :param at_start: text начинается с начала файла (с '['), а не с отметки
+        """
+        records: List[Dict] = []
+        reader = _ChunkReader.from_text(text)
+        consumed = 0
+        if at_start:
+            first = reader.next_char()
+            if first != "[":
+                if first:
+                    logger.warning("Файл %s содержит данные, не являющиеся списком.", self.file_path)
+                return records, consumed
+            reader.pos += 1
+        need_comma = not at_start
+
+        while True:
+            char = reader.next_char()
+            if not char or char == "]":
+                break
+            if need_comma:
+                if char != ",":
+                    logger.error("Ошибка при чтении JSON из файла %s: ожидалась ','.", self.file_path)
+                    break
+                reader.pos += 1
+            try:
+                value = reader.decode_value()
+            except json.JSONDecodeError as e:
+                # Запись, оборванная в конце text, ещё дописывается — продолжим со следующим вызовом
+                if not _is_truncated(e, text):
+                    logger.error(
+                        "Ошибка при чтении JSON из файла %s после %d записей: %s",
+                        self.file_path,
+                        self.count + len(records),
+                        e,
+                    )
+                break
+            # Элементы, не являющиеся словарями, пропускаются, как в load_transactions(as_records=True)
+            if isinstance(value, dict):
+                records.append(value)
+            consumed = reader.pos
+            need_comma = True
+        return records, consumed
@@ -0,0 +1,135 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Union
+
+# Каталог logs в корне проекта
+LOGS_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(module)s - %(message)s"
+
+# Уровень по умолчанию берётся из переменной окружения процесса LOG_LEVEL (файл .env здесь не читается);
+# в продакшене стоит задать INFO или WARNING, тогда вызовы logger.debug отсекаются проверкой уровня
+# и сообщения даже не форматируются
+DEFAULT_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_logs_dir = LOGS_DIR
+_level: Union[int, str] = DEFAULT_LEVEL
+_loggers: List[logging.Logger] = []
+
+
+class _FileRouter(logging.Handler):
+    """Обработчик в фоновом потоке: пишет запись в файл, указанный в record.log_file."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handlers: Dict[str, logging.FileHandler] = {}
+
+    def _handler_for(self, file_name: str) -> logging.FileHandler:
+        handler = self._handlers.get(file_name)
+        if handler is None:
+            os.makedirs(_logs_dir, exist_ok=True)
+            # Режим "a": запуск программы не затирает предыдущий лог
+            handler = logging.FileHandler(os.path.join(_logs_dir, file_name), mode="a", encoding="utf-8")
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            self._handlers[file_name] = handler
+        return handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._handler_for(getattr(record, "log_file", "app.log")).handle(record)
+
+    def close(self) -> None:
+        for handler in self._handlers.values():
+            handler.close()
+        self._handlers.clear()
+        super().close()
+
+
+class _ModuleQueueHandler(QueueHandler):
+    """
+    Кладёт запись в общую очередь, помечая файл назначения.
+
+    Форматирование и запись в файл выполняются в фоновом потоке QueueListener,
+    поэтому вызывающий код не ждёт дискового ввода-вывода. Поток и файлы
+    создаются лениво — при первой записи, а не при импорте модуля.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        super().__init__(_queue)  # type: ignore[arg-type]
+        self.file_name = file_name
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Запись не покидает процесс, поэтому сообщение форматируется уже в фоновом потоке
+        record.log_file = self.file_name
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener is None:
+            _start_listener()
+        super().emit(record)
+
+
+def _start_listener() -> None:
+    global _listener
+    with _lock:
+        if _listener is None:
+            listener = QueueListener(_queue, _FileRouter())  # type: ignore[arg-type]
+            listener.start()
+            _listener = listener
+
+
+def flush_logs() -> None:
+    """Дописывает в файлы все записи из очереди и закрывает файлы (поток перезапустится при следующей записи)."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is not None:
+            # Остановка под блокировкой: новый поток не начнёт читать очередь, пока старый не дойдёт до её конца
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
+atexit.register(flush_logs)
+
+
+def get_logger(name: str, file_name: str) -> logging.Logger:
+    """
+    Возвращает логгер модуля, пишущий в logs/<file_name> через общую очередь.
+
+    Вызов не создаёт ни каталогов, ни файлов и не запускает потоков — всё это
+    происходит при первой записи в лог.
+
+    :param name: Имя логгера (обычно __name__)
+    :param file_name: Имя файла в каталоге логов, например "masks.log"
+    :return: Настроенный логгер
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(_level)
+    logger.handlers.clear()
+    logger.addHandler(_ModuleQueueHandler(file_name))
+    _loggers.append(logger)
+    return logger
+
+
+def configure_logging(level: Union[int, str, None] = None, logs_dir: Optional[str] = None) -> None:
+    """
+    Меняет уровень логирования и/или каталог логов для всех логгеров, созданных через get_logger.
+
+    :param level: Уровень (например, "WARNING" или logging.INFO)
+    :param logs_dir: Каталог для файлов логов
+    """
+    global _level, _logs_dir
+    if logs_dir is not None:
+        flush_logs()
+        _logs_dir = logs_dir
+    if level is not None:
+        _level = level.upper() if isinstance(level, str) else level
+        for logger in _loggers:
+            logger.setLevel(_level)
@@ -1,28 +1,8 @@
-import logging
-import os
+from typing import Iterable, List
 
-# Создаем директорию logs в корне проекта
-logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
-os.makedirs(logs_dir, exist_ok=True)
+from src.log_config import get_logger
 
-# Путь к файлу лога
-log_file_path = os.path.join(logs_dir, "masks.log")
-
-# Настройка логгера
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-logger.handlers.clear()  # Удаляем старые handlers
-
-# FileHandler
-file_handler = logging.FileHandler(log_file_path, mode="w", encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
-
-# Формат лога
-formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(module)s - %(message)s")
-file_handler.setFormatter(formatter)
-
-# Добавляем handler
-logger.addHandler(file_handler)
+logger = get_logger(__name__, "masks.log")
 
 
 def get_mask_card_number(card_number: str) -> str:
@@ -101,3 +81,57 @@ def get_mask_account(account_number: str) -> str:
     masked_account_number = f"**{cleaned_account_number_str[-4:]}"
     logger.info("Маскированный номер счета: %s", masked_account_number)
     return masked_account_number
+
+
+# Таблица для str.translate: удаляет все не-цифры среди первых 0x500 символов (латиница, кириллица,
+# пробелы, тире). Более редкие символы не удаляются, для них остаётся посимвольная проверка.
+_NON_DIGITS = {code: None for code in range(0x500) if not chr(code).isdigit()}
+
+# Сколько последних цифр оставляет get_mask_card_number для каждой допустимой длины номера
+_CARD_TAIL = {13: 1, 15: 3, 16: 4, 18: 2, 19: 3}
+
+
+def _digits(value: str) -> str:
+    """То же, что "".join(char for char in value if char.isdigit()), но за один вызов translate."""
+    cleaned = value.translate(_NON_DIGITS)
+    if cleaned.isdigit():
+        return cleaned
+    return "".join(char for char in cleaned if char.isdigit())
+
+
+def mask_card_numbers(card_numbers: Iterable[str]) -> List[str]:
+    """
+    Пакетный вариант get_mask_card_number: маскирует номера карт в порядке входа.
+
+    Результат побайтно совпадает с get_mask_card_number, но без проверок и записей
+    в лог на каждый номер: в лог пишется одна итоговая строка. Некорректный номер
+    передаётся в get_mask_card_number, поэтому ошибки те же, что у одиночной функции.
+    """
+    masked = []
+    for card_number in card_numbers:
+        cleaned = _digits(card_number) if isinstance(card_number, str) else ""
+        tail = _CARD_TAIL.get(len(cleaned))
+        if tail is None:
+            masked.append(get_mask_card_number(card_number))
+        else:
+            masked.append(f"{cleaned[:4]} {cleaned[4:6]}** **** {cleaned[-tail:]}")
+    logger.info("Замаскировано номеров карт: %d", len(masked))
+    return masked
+
+
+def mask_accounts(account_numbers: Iterable[str]) -> List[str]:
+    """
+    Пакетный вариант get_mask_account: маскирует номера счетов в порядке входа.
+
+    Результат побайтно совпадает с get_mask_account, в лог пишется одна итоговая строка.
+    Некорректный номер передаётся в get_mask_account, поэтому ошибки те же.
+    """
+    masked = []
+    for account_number in account_numbers:
+        cleaned = _digits(account_number) if isinstance(account_number, str) else ""
+        if len(cleaned) == 20:
+            masked.append(f"**{cleaned[-4:]}")
+        else:
+            masked.append(get_mask_account(account_number))
+    logger.info("Замаскировано номеров счетов: %d", len(masked))
+    return masked
@@ -0,0 +1,138 @@
+import json
+import threading
+from typing import Dict, List, Optional
+
+from src.fileio import atomic_write
+
+# Границы корзин гистограммы: 1 мкс * 2**k, от 1 мкс до ~67 с, плюс корзина +Inf
+BUCKET_COUNT = 27
+BUCKET_BOUNDS_US = [2**k for k in range(BUCKET_COUNT)]
+
+METRIC_PREFIX = "homework_function"
+
+
+class FunctionStats:
+    """Счётчики вызовов и ошибок и гистограмма длительностей одной функции."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.buckets = [0] * (BUCKET_COUNT + 1)
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = self.errors = self.total_ns = 0
+            self.buckets = [0] * (BUCKET_COUNT + 1)
+
+    def record(self, elapsed_ns: int, failed: bool = False) -> None:
+        """Учитывает один вызов длительностью elapsed_ns наносекунд."""
+        # Наименьшее k, при котором длительность <= 2**k мкс, — через длину числа в битах, без поиска по границам
+        bucket = min(max((elapsed_ns + 999) // 1000 - 1, 0).bit_length(), BUCKET_COUNT)
+        with self._lock:
+            self.calls += 1
+            self.total_ns += elapsed_ns
+            self.buckets[bucket] += 1
+            if failed:
+                self.errors += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Оценка перцентиля в секундах (верхняя граница корзины); None, если вызовов не было."""
+        if self.calls == 0:
+            return None
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold and count:
+                return BUCKET_BOUNDS_US[bucket] / 1e6 if bucket < BUCKET_COUNT else float("inf")
+        return float("inf")
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.total_ns / 1e9,
+            "p50_seconds": self.percentile(0.5),
+            "p99_seconds": self.percentile(0.99),
+            "buckets": {_bound_label(bucket): count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+def _bound_label(bucket: int) -> str:
+    return "+Inf" if bucket == BUCKET_COUNT else repr(BUCKET_BOUNDS_US[bucket] / 1e6)
+
+
+class MetricsRegistry:
+    """Реестр статистики функций, обёрнутых декоратором timed."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, FunctionStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, name: str) -> FunctionStats:
+        """Возвращает (создавая при необходимости) статистику функции."""
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, FunctionStats(name))
+        return stats
+
+    def names(self) -> List[str]:
+        return sorted(self._stats)
+
+    def reset(self) -> None:
+        """Обнуляет всю статистику (например, после выгрузки очередного окна наблюдений)."""
+        for stats in list(self._stats.values()):
+            stats.reset()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: self._stats[name].as_dict() for name in self.names()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Текстовый формат экспозиции Prometheus."""
+        histogram = f"{METRIC_PREFIX}_duration_seconds"
+        errors = f"{METRIC_PREFIX}_errors_total"
+        lines = [
+            f"# HELP {histogram} Время выполнения функции.",
+            f"# TYPE {histogram} histogram",
+        ]
+        for name in self.names():
+            stats = self._stats[name]
+            label = f'function="{_escape_label(name)}"'
+            cumulative = 0
+            for bucket, count in enumerate(stats.buckets):
+                cumulative += count
+                lines.append(f'{histogram}_bucket{{{label},le="{_bound_label(bucket)}"}} {cumulative}')
+            lines.append(f"{histogram}_sum{{{label}}} {stats.total_ns / 1e9!r}")
+            lines.append(f"{histogram}_count{{{label}}} {stats.calls}")
+        lines.append(f"# HELP {errors} Число вызовов, завершившихся исключением.")
+        lines.append(f"# TYPE {errors} counter")
+        for name in self.names():
+            lines.append(f'{errors}{{function="{_escape_label(name)}"}} {self._stats[name].errors}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        _write_atomic(path, self.to_json())
+
+    def write_prometheus(self, path: str) -> None:
+        """Пишет метрики в файл, например для textfile collector у node_exporter."""
+        _write_atomic(path, self.to_prometheus())
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: str, content: str) -> None:
+    with atomic_write(path, encoding="utf-8") as file:
+        file.write(content)
+
+
+# Реестр по умолчанию, в который пишет timed
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,178 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from operator import attrgetter
+from typing import Any, Iterable, List, Tuple, Union
+
+# Денежные суммы хранятся в целых минимальных единицах (копейках, центах)
+MINOR_DIGITS = 2
+SCALE: int = 10**MINOR_DIGITS
+
+Number = Union[int, float, Decimal]
+
+_minor = attrgetter("minor")
+_currency = attrgetter("currency")
+
+
+def to_minor(amount: Union[str, Number]) -> int:
+    """
+    Переводит сумму ('9824.07', 12.5, Decimal) в целое число минимальных единиц.
+
+    Лишние знаки после запятой округляются до ближайшего, половина — от нуля (ROUND_HALF_UP),
+    как в TransactionTable. Строки обычного вида разбираются без Decimal.
+
+    :raises ValueError: Если строка не является числом
+    """
+    if isinstance(amount, str):
+        # Самый частый вид — "9824.07": цифры без знака и полная дробная часть
+        if amount[-MINOR_DIGITS - 1 : -MINOR_DIGITS] == ".":
+            digits = amount[: -MINOR_DIGITS - 1] + amount[-MINOR_DIGITS:]
+            if digits.isdigit() and digits.isascii():
+                return int(digits)
+        text = amount.strip()
+        body = text[1:] if text[:1] in ("-", "+") else text
+        whole, _, fraction = body.partition(".")
+        if (
+            whole.isascii()
+            and whole.isdigit()
+            and len(fraction) <= MINOR_DIGITS
+            and (not fraction or fraction.isdigit())
+            and fraction.isascii()
+        ):
+            minor = int(whole) * SCALE + (int(fraction.ljust(MINOR_DIGITS, "0")) if fraction else 0)
+            return -minor if text[:1] == "-" else minor
+    elif isinstance(amount, bool):
+        raise ValueError(f"Некорректная сумма: {amount!r}")
+    elif isinstance(amount, int):
+        return amount * SCALE
+    elif isinstance(amount, float):
+        amount = repr(amount)
+
+    try:
+        return int((Decimal(amount) * SCALE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError) as e:
+        raise ValueError(f"Некорректная сумма: {amount!r}") from e
+
+
+def rate_ratio(rate: Number) -> Tuple[int, int]:
+    """Точная дробь (числитель, знаменатель) для курса в его десятичной записи (90.12 -> 2253/25)."""
+    if isinstance(rate, float):
+        return Decimal(repr(rate)).as_integer_ratio()
+    return Decimal(rate).as_integer_ratio()
+
+
+def _round_div(numerator: int, denominator: int) -> int:
+    """Деление с округлением до ближайшего целого, половина — от нуля (знаменатель положителен)."""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def multiply_minor(minors: Iterable[int], rate: Number) -> List[int]:
+    """Умножает суммы в минимальных единицах на курс с округлением ROUND_HALF_UP."""
+    numerator, denominator = rate_ratio(rate)
+    if denominator == 1:
+        return [minor * numerator for minor in minors]
+    return [_round_div(minor * numerator, denominator) for minor in minors]
+
+
+class Money:
+    """
+    Денежная сумма с фиксированной точкой: целое число минимальных единиц и код валюты.
+
+    Сложение и вычитание точные и допустимы только для одной валюты. Умножение на курс
+    (convert) выполняется в целых числах по точной десятичной записи курса и округляется
+    до минимальной единицы по правилу ROUND_HALF_UP. float(money) и str(money) позволяют
+    передавать сумму туда, где раньше была строка из operations.json.
+    """
+
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor: int, currency: str) -> None:
+        self.minor = minor
+        self.currency = currency
+
+    @classmethod
+    def parse(cls, amount: Union[str, Number], currency: str) -> "Money":
+        """Создаёт сумму из строки или числа (см. to_minor)."""
+        return cls(to_minor(amount), currency)
+
+    @property
+    def amount(self) -> Decimal:
+        """Точное значение суммы в Decimal."""
+        return Decimal(self.minor).scaleb(-MINOR_DIGITS)
+
+    def convert(self, rate: Number, currency: str = "RUB") -> "Money":
+        """Переводит сумму в другую валюту по курсу с округлением ROUND_HALF_UP."""
+        numerator, denominator = rate_ratio(rate)
+        return Money(_round_div(self.minor * numerator, denominator), currency)
+
+    @staticmethod
+    def sum(items: Iterable["Money"], currency: str) -> "Money":
+        """Сумма в одной валюте: складываются целые числа, без накопления ошибки округления."""
+        items = items if isinstance(items, (list, tuple)) else list(items)
+        if items and set(map(_currency, items)) != {currency}:
+            raise ValueError(f"Можно складывать только суммы в валюте {currency}.")
+        return Money(sum(map(_minor, items)), currency)
+
+    def _same_currency(self, other: "Money") -> None:
+        if self.currency != other.currency:
+            raise ValueError(f"Нельзя смешивать валюты {self.currency} и {other.currency}.")
+
+    def __add__(self, other: Any) -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._same_currency(other)
+        return Money(self.minor + other.minor, self.currency)
+
+    def __radd__(self, other: Any) -> "Money":
+        # Поддержка встроенной sum(), которая начинает с 0
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: Any) -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._same_currency(other)
+        return Money(self.minor - other.minor, self.currency)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.minor, self.currency)
+
+    def __mul__(self, factor: Any) -> "Money":
+        if isinstance(factor, bool) or not isinstance(factor, (int, float, Decimal)):
+            return NotImplemented
+        return self.convert(factor, self.currency)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __hash__(self) -> int:
+        return hash((self.minor, self.currency))
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._same_currency(other)
+        return self.minor < other.minor
+
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._same_currency(other)
+        return self.minor <= other.minor
+
+    def __float__(self) -> float:
+        return self.minor / SCALE
+
+    def __str__(self) -> str:
+        sign = "-" if self.minor < 0 else ""
+        units, cents = divmod(abs(self.minor), SCALE)
+        return f"{sign}{units}.{cents:0{MINOR_DIGITS}d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}', {self.currency!r})"
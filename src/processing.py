@@ -1,13 +1,177 @@
-from typing import Dict, List
+import heapq
+import json
+from typing import IO, Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 
+from src.decorators import timed
+from src.index import TransactionIndex
+from src.money import Money
+from src.transaction import TransactionLike
 
-def filter_by_state(transactions: List[Dict], state: str = "EXECUTED") -> List[Dict]:
-    """Функция фильтрует список транзакций по состоянию."""
+# Курсор страницы: дата и id последней показанной транзакции
+Cursor = Tuple[str, int]
 
+
+def filter_by_state(
+    transactions: Iterable[TransactionLike], state: str = "EXECUTED", index: Optional[TransactionIndex] = None
+) -> List[TransactionLike]:
+    """Функция фильтрует транзакции по состоянию.
+    Принимает как список, так и итератор (например, из iter_transactions),
+    а также записи Transaction вместо словарей.
+    Если передан index, построенный над этим же списком, ответ берётся из него без просмотра списка."""
+
+    if index is not None:
+        index.check_source(transactions)
+        return index.by_state(state)
     return [transaction for transaction in transactions if transaction.get("state") == state]
 
 
-def sort_by_date(transactions: List[Dict], reverse: bool = True) -> List[Dict]:
-    """Функция сортирует список транзакций по дате."""
+def date_key(transaction: TransactionLike) -> str:
+    """Ключ сортировки по дате: транзакции без даты считаются самыми ранними."""
+
+    return transaction.get("date", "")  # type: ignore[no-any-return]
+
+
+def page_key(transaction: TransactionLike) -> Cursor:
+    """Ключ постраничной выдачи: дата, а при равных датах — id."""
+
+    return transaction.get("date", ""), transaction.get("id", 0)
+
+
+@timed()
+def sort_by_date(
+    transactions: Iterable[TransactionLike],
+    reverse: bool = True,
+    index: Optional[TransactionIndex] = None,
+    limit: Optional[int] = None,
+) -> List[TransactionLike]:
+    """Функция сортирует список транзакций по дате.
+    Если передан index, используется его готовый порядок по дате.
+    Если задан limit, возвращаются только первые limit транзакций: они выбираются
+    через кучу за O(n log limit) без полной сортировки, результат совпадает с sort_by_date(...)[:limit]."""
+
+    if limit is not None and limit <= 0:
+        return []
+    if index is not None:
+        index.check_source(transactions)
+        return index.sorted_by_date(reverse, limit)
+    if limit is not None:
+        # nlargest/nsmallest устойчивы и эквивалентны sorted(...)[:limit]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(limit, transactions, key=date_key)
+    return sorted(transactions, key=date_key, reverse=reverse)
+
+
+def paginate_by_date(
+    transactions: Iterable[TransactionLike], limit: int, after: Optional[Cursor] = None, reverse: bool = True
+) -> Tuple[List[TransactionLike], Optional[Cursor]]:
+    """Функция возвращает страницу транзакций, упорядоченных по дате, и курсор следующей страницы.
+
+    Курсор — пара (дата, id) последней транзакции страницы (см. page_key). Равные даты
+    упорядочиваются по id, поэтому страницы не пересекаются и не теряют записи,
+    даже если между запросами в список добавились новые транзакции.
+    Для первой страницы after не передаётся; курсор None означает, что страниц больше нет."""
+
+    if limit <= 0:
+        raise ValueError("limit должен быть положительным числом")
+    if after is None:
+        candidates: Iterable[TransactionLike] = transactions
+    elif reverse:
+        candidates = (transaction for transaction in transactions if page_key(transaction) < after)
+    else:
+        candidates = (transaction for transaction in transactions if page_key(transaction) > after)
+
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    # Берём на одну запись больше, чтобы узнать, есть ли следующая страница
+    page = select(limit + 1, candidates, key=page_key)
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, page_key(page[-1])
+
+
+# Ключ, под которым суммы Money записываются во временные файлы внешней сортировки
+_MONEY_KEY = "__money__"
+
+
+def _spill_run(run: List[Dict], reverse: bool, tmp_dir: Optional[str]) -> Tuple[IO[str], bool]:
+    """
+    Сортирует порцию транзакций и записывает её во временный файл в формате JSON Lines.
+
+    :return: Файл и признак того, что в порции были суммы Money (их нужно восстановить при чтении)
+    """
+
+    # tempfile нужен только внешней сортировке, поэтому не замедляет импорт модуля
+    import tempfile
+
+    has_money = False
+
+    def to_json(value: Any) -> Any:
+        nonlocal has_money
+        if isinstance(value, Money):
+            has_money = True
+            return {_MONEY_KEY: [value.minor, value.currency]}
+        raise TypeError(f"Объект типа {type(value).__name__} не сериализуется в JSON")
+
+    encoder = json.JSONEncoder(ensure_ascii=False, default=to_json)
+    run_file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=tmp_dir)
+    for transaction in sort_by_date(run, reverse=reverse):
+        run_file.write(encoder.encode(transaction))
+        run_file.write("\n")
+    run_file.seek(0)
+    return run_file, has_money
+
+
+def _from_json(value: Dict) -> Any:
+    money = value.get(_MONEY_KEY)
+    return Money(*money) if money is not None and len(value) == 1 else value
+
+
+def _read_run(run_file: IO[str], has_money: bool) -> Iterator[Any]:
+    object_hook = _from_json if has_money else None
+    for line in run_file:
+        yield json.loads(line, object_hook=object_hook)
+
+
+def external_sort_by_date(
+    transactions: Iterable[Dict],
+    reverse: bool = True,
+    run_size: int = 100_000,
+    tmp_dir: Optional[str] = None,
+) -> Generator[Dict, None, None]:
+    """
+    Сортировка по дате для данных, которые не помещаются в память (внешняя сортировка слиянием).
+
+    Входные транзакции (например, из iter_transactions) читаются порциями по run_size,
+    каждая порция сортируется и сбрасывается во временный файл, после чего файлы
+    потоково сливаются. Порядок совпадает с sort_by_date, включая порядок равных дат.
+    Временные файлы удаляются после завершения или закрытия итератора.
+
+    :param transactions: Итерируемые словари транзакций
+    :param reverse: Направление сортировки, как в sort_by_date
+    :param run_size: Сколько транзакций держать в памяти при формировании одного файла
+    :param tmp_dir: Каталог для временных файлов (по умолчанию — системный)
+    :return: Итератор транзакций в порядке даты
+    """
+    run_files: List[Tuple[IO[str], bool]] = []
+    try:
+        run: List[Dict] = []
+        for transaction in transactions:
+            run.append(transaction)
+            if len(run) >= run_size:
+                run_files.append(_spill_run(run, reverse, tmp_dir))
+                run = []
+
+        if not run_files:
+            # Всё поместилось в одну порцию — сбрасывать на диск незачем
+            yield from sorted(run, key=date_key, reverse=reverse)
+            return
 
-    return sorted(transactions, key=lambda x: x.get("date", ""), reverse=reverse)
+        if run:
+            run_files.append(_spill_run(run, reverse, tmp_dir))
+        del run
+        runs = (_read_run(run_file, has_money) for run_file, has_money in run_files)
+        # При равных ключах heapq.merge берёт элемент из более раннего файла, поэтому слияние устойчиво
+        yield from heapq.merge(*runs, key=date_key, reverse=reverse)
+    finally:
+        for run_file, _ in run_files:
+            run_file.close()
@@ -0,0 +1,175 @@
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.index import TransactionIndex, currency_code
+from src.processing import sort_by_date
+from src.transaction import TransactionLike
+
+
+class Query:
+    """
+    Ленивый запрос к транзакциям.
+
+    Методы where, currency, between, order_by_date и limit только записывают план
+    и возвращают новый Query; данные обрабатываются при вызове all() или итерации.
+    Все фильтры применяются за один проход, limit передаётся в сортировку (выбор
+    через кучу вместо полной сортировки), а при наличии TransactionIndex источник
+    сужается по самому избирательному индексу. explain() показывает выбранный план.
+
+    Пример:
+        Query(transactions).where(state="EXECUTED").currency("USD").order_by_date().limit(10).all()
+    """
+
+    def __init__(self, transactions: Iterable[TransactionLike], index: Optional[TransactionIndex] = None) -> None:
+        if index is not None:
+            index.check_source(transactions)
+        self._transactions = transactions
+        self._index = index
+        self._conditions: Dict[str, Any] = {}
+        self._currency: Optional[str] = None
+        self._date_range: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self._reverse: Optional[bool] = None
+        self._limit: Optional[int] = None
+
+    def _copy(self, **changes: Any) -> "Query":
+        query = Query.__new__(Query)
+        query.__dict__.update(self.__dict__)
+        query._conditions = dict(self._conditions)
+        for name, value in changes.items():
+            setattr(query, f"_{name}", value)
+        return query
+
+    def where(self, **conditions: Any) -> "Query":
+        """Условия на равенство по ключам транзакции верхнего уровня (state, description, id, ...)."""
+        query = self._copy()
+        query._conditions.update(conditions)
+        return query
+
+    def currency(self, code: str) -> "Query":
+        """Только транзакции в заданной валюте, как в filter_by_currency."""
+        return self._copy(currency=code)
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> "Query":
+        """Только транзакции с датой в диапазоне [start, end] (строки ISO, как в TransactionIndex.between)."""
+        return self._copy(date_range=(start, end))
+
+    def order_by_date(self, reverse: bool = True) -> "Query":
+        """Упорядочить результат по дате, как в sort_by_date."""
+        return self._copy(reverse=reverse)
+
+    def limit(self, count: int) -> "Query":
+        """Вернуть не больше count транзакций."""
+        return self._copy(limit=count)
+
+    def _predicates(self, skip: str = "") -> List[Tuple[str, Callable[[TransactionLike], bool]]]:
+        """Условия, которые нужно проверить при проходе по данным (кроме уже покрытого индексом skip)."""
+        predicates: List[Tuple[str, Callable[[TransactionLike], bool]]] = []
+        for key, value in self._conditions.items():
+            if key == "state" and skip == "state":
+                continue
+            predicates.append((f"{key} = {value!r}", _equals(key, value)))
+        if self._currency is not None and skip != "currency":
+            code = self._currency
+            predicates.append((f"currency = {code!r}", lambda t: currency_code(t) == code))
+        if self._date_range is not None and skip != "date":
+            start, end = self._date_range
+            predicates.append((f"date in [{start!r}, {end!r}]", lambda t: _date_in_range(t, start, end)))
+        return predicates
+
+    def _choose_index(self) -> Tuple[str, Optional[List[int]]]:
+        """Выбирает индекс с наименьшим числом кандидатов."""
+        index = self._index
+        if index is None:
+            return "", None
+
+        options = []
+        if "state" in self._conditions:
+            options.append(("state", index.state_positions(self._conditions["state"])))
+        if self._currency is not None:
+            options.append(("currency", index.currency_positions(self._currency)))
+        if self._date_range is not None:
+            options.append(("date", index.date_positions(*self._date_range)))
+        if not options:
+            return "", None
+        return min(options, key=lambda option: len(option[1]))
+
+    def _plan(self) -> Tuple[List[str], Callable[[], List[TransactionLike]]]:
+        """Строит план: описание шагов и функцию, которая его выполняет."""
+        steps = []
+        index = self._index
+        reverse, limit = self._reverse, self._limit
+        used_index, positions = self._choose_index()
+
+        if index is not None and positions is not None:
+            names = {"state": "статус", "currency": "валюта", "date": "диапазон дат"}
+            steps.append(f"поиск по индексу: {names[used_index]} ({len(positions)} из {len(index)} транзакций)")
+        elif index is not None and reverse is not None and not self._conditions and self._currency is None:
+            order_reverse = reverse
+            steps.append(f"готовый порядок индекса по дате ({'убывание' if reverse else 'возрастание'})")
+            if limit is not None:
+                steps.append(f"первые {limit}")
+            return steps, lambda: index.sorted_by_date(order_reverse, limit)
+        else:
+            steps.append("полный проход по транзакциям")
+
+        predicates = self._predicates(skip=used_index)
+        if predicates:
+            steps.append("фильтр за один проход: " + " AND ".join(name for name, _ in predicates))
+
+        if reverse is not None:
+            direction = "убывание" if reverse else "возрастание"
+            if limit is not None:
+                steps.append(f"top-{limit} по дате через кучу ({direction})")
+            else:
+                steps.append(f"сортировка по дате ({direction})")
+        elif limit is not None:
+            steps.append(f"остановка после {limit} совпадений")
+
+        checks = [check for _, check in predicates]
+
+        def matches(transaction: TransactionLike) -> bool:
+            for check in checks:
+                if not check(transaction):
+                    return False
+            return True
+
+        def execute() -> List[TransactionLike]:
+            if index is not None and positions is not None:
+                # Позиции из индекса по дате идут в порядке даты — возвращаем исходный порядок
+                ordered = sorted(positions) if used_index == "date" else positions
+                source: Iterable[TransactionLike] = index.take(ordered)
+            else:
+                source = self._transactions
+            rows: Iterator[TransactionLike] = filter(matches, source) if checks else iter(source)
+            if reverse is not None:
+                return sort_by_date(rows, reverse=reverse, limit=limit)
+            if limit is not None:
+                return list(islice(rows, limit))
+            return list(rows)
+
+        return steps, execute
+
+    def explain(self) -> str:
+        """Возвращает текстовое описание плана выполнения."""
+        steps, _ = self._plan()
+        return "\n".join(f"{number}. {step}" for number, step in enumerate(steps, 1))
+
+    def all(self) -> List[TransactionLike]:
+        """Выполняет запрос и возвращает список транзакций."""
+        _, execute = self._plan()
+        return execute()
+
+    def __iter__(self) -> Iterator[TransactionLike]:
+        return iter(self.all())
+
+
+def _date_in_range(transaction: TransactionLike, start: Optional[str], end: Optional[str]) -> bool:
+    date = transaction.get("date", "")
+    return (start is None or date >= start) and (end is None or date <= end)
+
+
+def _equals(key: str, value: Any) -> Callable[[TransactionLike], bool]:
+    def check(transaction: TransactionLike) -> bool:
+        return bool(transaction.get(key) == value)
+
+    return check
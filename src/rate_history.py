@@ -0,0 +1,191 @@
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from src.fileio import atomic_write
+from src.log_config import get_logger
+
+logger = get_logger(__name__, "utils.log")
+
+# Файл по умолчанию — рядом с operations.json
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "rates_history.bin")
+
+MAGIC = b"RATEHIST\x01"
+
+# Заголовок файла: сигнатура и число валют; у каждой валюты — код и число записей,
+# за которыми идут массив дней (int32, номер дня по date.toordinal) и массив курсов (float64)
+_HEADER = struct.Struct(f"<{len(MAGIC)}sI")
+_CURRENCY = struct.Struct("<8sI")
+
+# День: дата, строка ISO ("2019-07-03" или "2019-07-03T18:35:29.512364") или номер дня (date.toordinal)
+Day = Union[str, date, int]
+
+
+def day_number(day: Day) -> int:
+    """Номер дня по date.toordinal."""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return day.toordinal()
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class RateHistory:
+    """
+    Таблица исторических курсов валют к RUB с ключом (валюта, день).
+
+    Для каждой валюты хранятся два параллельных массива, отсортированных по дню:
+    номера дней (array('i')) и курсы (array('d')). Поиск курса — bisect за O(log n);
+    если на нужный день курса нет, берётся ближайший предыдущий день (выходные,
+    праздники). Таблица сохраняется в компактный двоичный файл и загружается одним чтением.
+
+    Пары (валюта, день), курс для которых получить не удалось, отмечаются через mark_failed
+    и не возвращаются из missing, чтобы не запрашивать их снова при каждой конвертации.
+    Отметки хранятся только в памяти: после новой загрузки таблицы запрос будет повторён.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        # Файл, из которого загружена таблица; convert_transactions_at_date сохраняет в него новые курсы
+        self.path = path
+        self._days: Dict[str, array] = {}
+        self._rates: Dict[str, array] = {}
+        self._failed: Set[Tuple[str, int]] = set()
+
+    def __len__(self) -> int:
+        return sum(len(days) for days in self._days.values())
+
+    def currencies(self) -> List[str]:
+        return sorted(self._days)
+
+    def set(self, currency: str, day: Day, rate: float) -> None:
+        """Записывает курс валюты на день (заменяет прежний, если он был)."""
+        number = day_number(day)
+        days = self._days.setdefault(currency, array("i"))
+        rates = self._rates.setdefault(currency, array("d"))
+        position = bisect_left(days, number)
+        if position < len(days) and days[position] == number:
+            rates[position] = rate
+        else:
+            days.insert(position, number)
+            rates.insert(position, rate)
+
+    def update(self, day: Day, rates: Mapping[str, float]) -> None:
+        """Записывает курсы нескольких валют на один день; нулевые (неудачные) курсы пропускаются."""
+        for currency, rate in rates.items():
+            if rate > 0:
+                self.set(currency, day, rate)
+
+    def mark_failed(self, currency: str, day: Day) -> None:
+        """Отмечает, что курс валюты на день получить не удалось: missing больше не вернёт эту пару."""
+        self._failed.add((currency, day_number(day)))
+
+    def has(self, currency: str, day: Day) -> bool:
+        """Есть ли курс валюты ровно на этот день."""
+        days = self._days.get(currency)
+        if days is None:
+            return False
+        number = day_number(day)
+        position = bisect_left(days, number)
+        return position < len(days) and days[position] == number
+
+    def rate_at(self, currency: str, day: Day) -> Optional[float]:
+        """
+        Курс валюты к RUB на день или на ближайший предыдущий день, для которого он известен.
+
+        :return: Курс; 1.0 для RUB; None, если для валюты нет курсов на этот день и раньше
+        """
+        if currency == "RUB":
+            return 1.0
+        days = self._days.get(currency)
+        if days is None:
+            return None
+        position = bisect_right(days, day_number(day)) - 1
+        if position < 0:
+            return None
+        return float(self._rates[currency][position])
+
+    def missing(self, pairs: Iterable[Tuple[str, Day]]) -> Dict[int, List[str]]:
+        """
+        Для пар (валюта, день) без точного курса возвращает {номер дня: [валюты]}.
+        RUB и пары, отмеченные через mark_failed, пропускаются.
+        """
+        result: Dict[int, List[str]] = {}
+        failed = self._failed
+        for currency, day in pairs:
+            if currency != "RUB" and not self.has(currency, day):
+                number = day_number(day)
+                if (currency, number) in failed:
+                    continue
+                codes = result.setdefault(number, [])
+                if currency not in codes:
+                    codes.append(currency)
+        return result
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Атомарно записывает таблицу в файл (по умолчанию — в тот, из которого она загружена)."""
+        path = path or self.path or DEFAULT_PATH
+        chunks = [_HEADER.pack(MAGIC, len(self._days))]
+        for currency in self.currencies():
+            days = self._days[currency]
+            chunks.append(_CURRENCY.pack(currency.encode("ascii"), len(days)))
+            chunks.append(_to_little_endian(days))
+            chunks.append(_to_little_endian(self._rates[currency]))
+
+        with atomic_write(path, "wb") as file:
+            file.write(b"".join(chunks))
+        logger.debug("Записана таблица курсов %s (%d записей).", path, len(self))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "RateHistory":
+        """
+        Загружает таблицу из файла.
+
+        :return: Таблица; пустая, если файла нет или он повреждён (тогда курсы будут запрошены заново)
+        """
+        history = cls(path)
+        if not os.path.exists(path):
+            return history
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            magic, count = _HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("неизвестная сигнатура")
+            offset = _HEADER.size
+            for _ in range(count):
+                raw_code, length = _CURRENCY.unpack_from(data, offset)
+                offset += _CURRENCY.size
+                days_end = offset + 4 * length
+                rates_end = days_end + 8 * length
+                if rates_end > len(data):
+                    raise ValueError("файл обрезан")
+                currency = raw_code.rstrip(b"\0").decode("ascii")
+                history._days[currency] = _from_little_endian("i", data[offset:days_end])
+                history._rates[currency] = _from_little_endian("d", data[days_end:rates_end])
+                offset = rates_end
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Не удалось прочитать таблицу курсов %s: %s", path, e)
+            return cls(path)
+
+        logger.info("Загружено %d исторических курсов из %s.", len(history), path)
+        return history
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+from src.metrics import REGISTRY, FunctionStats
+
+T = TypeVar("T")
+
+
+class _Call:
+    """Выполняющийся вызов: результат или исключение и событие готовности."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов (single-flight).
+
+    Пока вызов с ключом key выполняется, другие потоки с тем же ключом не запускают
+    его повторно, а ждут и получают тот же результат (или то же исключение).
+    Завершённые вызовы не запоминаются — это не кэш.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """Выполняет func или присоединяется к уже выполняющемуся вызову с тем же ключом."""
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if call is None:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as error:
+                call.error = error
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, int]:
+        """Число выполненных вызовов и присоединившихся к ним (объединённых)."""
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты вызовов «маркерная корзина».
+
+    Корзина вмещает burst маркеров и пополняется со скоростью rate маркеров в секунду;
+    каждый вызов acquire() забирает один маркер, а если маркеров нет — ждёт его
+    появления. Ожидающие потоки бронируют маркеры по очереди, поэтому суммарная
+    частота не превышает rate даже при множестве потоков. Время ожидания попадает
+    в гистограмму metrics (stats_name) и в счётчики stats().
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        stats_name: Optional[str] = None,
+    ) -> None:
+        if rate <= 0 or burst <= 0:
+            raise ValueError("Скорость и ёмкость корзины должны быть положительными.")
+        self.rate = rate
+        self.burst = burst
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self._wait_stats: Optional[FunctionStats] = REGISTRY.stats(stats_name) if stats_name else None
+
+    def acquire(self) -> float:
+        """Забирает маркер, при необходимости дожидаясь его; возвращает время ожидания в секундах."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Маркер бронируется сразу: при нехватке баланс уходит в минус, следующий поток ждёт дольше
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            if wait > 0:
+                self.waited += 1
+                self.wait_seconds += wait
+
+        if wait > 0:
+            self._sleep(wait)
+        if self._wait_stats is not None:
+            self._wait_stats.record(int(wait * 1e9))
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        """Число выданных маркеров, число ожиданий и суммарное время ожидания."""
+        with self._lock:
+            return {"acquired": self.acquired, "waited": self.waited, "wait_seconds": self.wait_seconds}
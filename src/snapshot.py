@@ -0,0 +1,175 @@
+import gc
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from src.fileio import atomic_write
+from src.log_config import get_logger
+
+logger = get_logger(__name__, "utils.log")
+
+# Формат marshal зависит от версии Python, поэтому она входит в сигнатуру файла
+MAGIC = b"OPSNAP" + bytes([2, marshal.version, sys.version_info[0], sys.version_info[1]])
+
+# Заголовок: сигнатура, mtime_ns и размер исходного файла, sha256 исходного файла, длина и sha256 данных
+_HEADER = struct.Struct(f"<{len(MAGIC)}sqq32sq32s")
+
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+class _SourceChanged(Exception):
+    """Исходный файл изменился, пока строился снимок."""
+
+
+def snapshot_path(file_path: str) -> str:
+    """Возвращает путь к снимку, который лежит рядом с исходным JSON-файлом."""
+    return file_path + SNAPSHOT_SUFFIX
+
+
+def _file_digest(file_path: str) -> bytes:
+    """Считает sha256 файла, читая его блоками."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def _source_key(file_path: str) -> Tuple[int, int]:
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_source(file_path: str) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    Читает исходный JSON-файл целиком для последующей записи снимка.
+
+    mtime и размер снимаются до чтения: если файл перепишут во время чтения,
+    снимок получит старую метку и при следующей загрузке будет признан устаревшим.
+
+    :param file_path: Путь к исходному JSON-файлу
+    :return: Содержимое файла и пара (mtime_ns, размер)
+    """
+    key = _source_key(file_path)
+    with open(file_path, "rb") as file:
+        return file.read(), key
+
+
+def _share_strings(value: Any, pool: Dict[str, str]) -> Any:
+    """
+    Заменяет одинаковые строки одним объектом.
+
+    marshal записывает повторно встречающийся объект ссылкой, поэтому статусы,
+    валюты и ключи словарей попадают в снимок один раз — файл почти вдвое меньше.
+    """
+    if isinstance(value, str):
+        return pool.setdefault(value, value)
+    if isinstance(value, dict):
+        return {pool.setdefault(key, key): _share_strings(item, pool) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_share_strings(item, pool) for item in value]
+    return value
+
+
+def _loads_without_gc(data: memoryview) -> Any:
+    """Декодирует marshal с отключённым сборщиком мусора: данные без циклов, а сборки на миллионах словарей дороги."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return marshal.loads(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_snapshot(file_path: str) -> Optional[list]:
+    """
+    Читает снимок транзакций для JSON-файла через mmap.
+
+    :param file_path: Путь к исходному JSON-файлу
+    :return: Список транзакций или None, если снимка нет, он устарел или повреждён
+    """
+    path = snapshot_path(file_path)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        mtime_ns, size = _source_key(file_path)
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < _HEADER.size:
+                logger.warning("Снимок %s повреждён: слишком короткий.", path)
+                return None
+
+            magic, snap_mtime_ns, snap_size, snap_digest, length, payload_digest = _HEADER.unpack_from(mapped)
+            if magic != MAGIC:
+                logger.info("Снимок %s создан другой версией, игнорируем.", path)
+                return None
+            # Дешёвая проверка mtime и размера идёт первой, хеш считается только если они совпали
+            if (snap_mtime_ns, snap_size) != (mtime_ns, size) or snap_digest != _file_digest(file_path):
+                logger.info("Снимок %s устарел.", path)
+                return None
+            if _HEADER.size + length != len(mapped):
+                logger.warning("Снимок %s повреждён: неверная длина данных.", path)
+                return None
+
+            with memoryview(mapped) as view, view[_HEADER.size :] as payload:
+                # marshal не рассчитан на повреждённые данные, поэтому они проверяются до loads
+                if hashlib.sha256(payload).digest() != payload_digest:
+                    logger.warning("Снимок %s повреждён: не совпала контрольная сумма данных.", path)
+                    return None
+                data = _loads_without_gc(payload)
+    except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+        logger.warning("Не удалось прочитать снимок %s: %s", path, e)
+        return None
+
+    if not isinstance(data, list):
+        logger.warning("Снимок %s повреждён: данные не являются списком.", path)
+        return None
+
+    logger.info("Загружено %d транзакций из снимка %s.", len(data), path)
+    return data
+
+
+def write_snapshot(file_path: str, transactions: list, source: bytes, source_key: Tuple[int, int]) -> bool:
+    """
+    Сохраняет транзакции в бинарный снимок рядом с JSON-файлом.
+
+    Хеш считается по тем же байтам, из которых разобраны транзакции (см. read_source),
+    а не по файлу на диске: иначе файл, переписанный между чтением и записью снимка,
+    попал бы в заголовок вместе со старыми данными. Если метка файла успела
+    измениться, снимок не записывается.
+
+    Файл записывается во временный и атомарно подменяется, поэтому читатель
+    никогда не увидит наполовину записанный снимок.
+
+    :param file_path: Путь к исходному JSON-файлу
+    :param transactions: Транзакции, разобранные из source
+    :param source: Содержимое исходного файла
+    :param source_key: mtime_ns и размер файла, снятые до его чтения
+    :return: True, если снимок записан
+    """
+    path = snapshot_path(file_path)
+    try:
+        mtime_ns, size = source_key
+        payload = marshal.dumps(_share_strings(transactions, {}))
+        payload_digest = hashlib.sha256(payload).digest()
+        header = _HEADER.pack(MAGIC, mtime_ns, size, hashlib.sha256(source).digest(), len(payload), payload_digest)
+        with atomic_write(path, "wb") as file:
+            file.write(header)
+            file.write(payload)
+            # Проверка прямо перед подменой: временный файл удаляется, прежний снимок остаётся
+            if _source_key(file_path) != source_key:
+                raise _SourceChanged
+    except _SourceChanged:
+        logger.info("Файл %s изменился во время загрузки, снимок не записан.", file_path)
+        return False
+    except (OSError, ValueError) as e:
+        logger.warning("Не удалось записать снимок %s: %s", path, e)
+        return False
+
+    logger.debug("Записан снимок %s (%d байт).", path, _HEADER.size + len(payload))
+    return True
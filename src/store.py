@@ -0,0 +1,254 @@
+import sqlite3
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.decorators import timed
+from src.log_config import get_logger
+from src.money import Money
+from src.transaction import Transaction, TransactionLike
+from src.utils import iter_transactions
+
+logger = get_logger(__name__, "utils.log")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY,
+    id INTEGER,
+    state TEXT,
+    date TEXT,
+    amount TEXT,
+    currency_name TEXT,
+    currency_code TEXT,
+    description TEXT,
+    account_from TEXT,
+    account_to TEXT
+)
+"""
+
+# Индексы создаются после первой массовой загрузки: вставка в таблицу без индексов быстрее
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS transactions_state ON transactions (state)",
+    "CREATE INDEX IF NOT EXISTS transactions_currency ON transactions (currency_code)",
+    "CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date)",
+    "CREATE INDEX IF NOT EXISTS transactions_from ON transactions (account_from)",
+    "CREATE INDEX IF NOT EXISTS transactions_to ON transactions (account_to)",
+)
+
+_FIELDS = "id, state, date, amount, currency_name, currency_code, description, account_from, account_to"
+_SELECT = f"SELECT {_FIELDS} FROM transactions"
+_INSERT = f"INSERT INTO transactions ({_FIELDS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def _to_row(transaction: TransactionLike) -> Tuple:
+    """Значения столбцов для транзакции; суммы Money сохраняются строкой, как в operations.json."""
+    if isinstance(transaction, Transaction):
+        amount = transaction.amount
+        return (
+            transaction.id,
+            transaction.state,
+            transaction.date,
+            str(amount) if isinstance(amount, Money) else amount,
+            transaction.currency_name,
+            transaction.currency_code,
+            transaction.description,
+            transaction.from_,
+            transaction.to,
+        )
+    operation_amount = transaction.get("operationAmount") or {}
+    currency = operation_amount.get("currency") or {}
+    amount = operation_amount.get("amount")
+    return (
+        transaction.get("id"),
+        transaction.get("state"),
+        transaction.get("date"),
+        str(amount) if isinstance(amount, Money) else amount,
+        currency.get("name"),
+        currency.get("code"),
+        transaction.get("description"),
+        transaction.get("from"),
+        transaction.get("to"),
+    )
+
+
+def _to_dict(row: Tuple) -> Dict:
+    """Словарь в формате operations.json из строки таблицы (отсутствовавшие ключи не включаются)."""
+    transaction_id, state, date, amount, currency_name, currency_code, description, account_from, account_to = row
+    result: Dict[str, Any] = {}
+    if transaction_id is not None:
+        result["id"] = transaction_id
+    if state is not None:
+        result["state"] = state
+    if date is not None:
+        result["date"] = date
+    if amount is not None or currency_name is not None or currency_code is not None:
+        operation_amount: Dict[str, Any] = {}
+        if amount is not None:
+            operation_amount["amount"] = amount
+        if currency_name is not None or currency_code is not None:
+            currency = {}
+            if currency_name is not None:
+                currency["name"] = currency_name
+            if currency_code is not None:
+                currency["code"] = currency_code
+            operation_amount["currency"] = currency
+        result["operationAmount"] = operation_amount
+    if description is not None:
+        result["description"] = description
+    if account_from is not None:
+        result["from"] = account_from
+    if account_to is not None:
+        result["to"] = account_to
+    return result
+
+
+class TransactionStore:
+    """
+    Хранилище транзакций в SQLite для данных, которые не помещаются в память словарями.
+
+    Транзакции хранятся плоскими строками (как поля Transaction) с индексами по статусу,
+    коду валюты, дате и счетам. Фильтры и сортировка выполняются запросом SQL,
+    а результаты читаются из курсора порциями и выдаются по одному словарю в формате
+    operations.json, поэтому их можно передавать в существующие функции. Порядок
+    совпадает с filter_by_state, filter_by_currency и sort_by_date над исходным списком:
+    при равных датах сохраняется порядок загрузки.
+    """
+
+    def __init__(self, path: str = ":memory:", fetch_size: int = 1000) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._fetch_size = fetch_size
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "TransactionStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0])
+
+    @timed()
+    def import_transactions(self, transactions: Iterable[TransactionLike], batch_size: int = 50_000) -> int:
+        """
+        Массово загружает транзакции (словари или Transaction) через executemany.
+
+        Каждая порция из batch_size записей вставляется в одной транзакции SQLite,
+        поэтому принимается и итератор (например, iter_transactions) без загрузки всего в память.
+        Элементы, не являющиеся словарями или Transaction, пропускаются.
+
+        :return: Число загруженных транзакций
+        """
+        items = (item for item in transactions if isinstance(item, (dict, Transaction)))
+        count = 0
+        while True:
+            rows = [_to_row(transaction) for transaction in islice(items, batch_size)]
+            if not rows:
+                break
+            with self._connection:
+                self._connection.executemany(_INSERT, rows)
+            count += len(rows)
+
+        with self._connection:
+            for statement in _INDEXES:
+                self._connection.execute(statement)
+        logger.info("Загружено %d транзакций в %s.", count, self.path)
+        return count
+
+    def import_json(self, file_path: str, batch_size: int = 50_000) -> int:
+        """Загружает транзакции из JSON-файла в формате operations.json, читая его потоково."""
+        return self.import_transactions(iter_transactions(file_path), batch_size)
+
+    def _rows(self, sql: str, params: List[Any]) -> Iterator[Dict]:
+        cursor = self._connection.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(self._fetch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _to_dict(row)
+
+    @staticmethod
+    def _sql(
+        state: Optional[str] = None,
+        currency: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        account: Optional[str] = None,
+        order_by_date: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[str, List[Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        filters = (("state = ?", state), ("currency_code = ?", currency), ("date >= ?", start), ("date <= ?", end))
+        for condition, value in filters:
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if account is not None:
+            conditions.append("(account_from = ? OR account_to = ?)")
+            params.extend((account, account))
+
+        sql = _SELECT
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        if order_by_date is None:
+            sql += " ORDER BY seq"
+        else:
+            # При равных датах — порядок загрузки, как у устойчивой сортировки в sort_by_date
+            sql += " ORDER BY date DESC, seq" if order_by_date else " ORDER BY date, seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def query(
+        self,
+        state: Optional[str] = None,
+        currency: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        account: Optional[str] = None,
+        order_by_date: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Транзакции, отобранные запросом SQL, по одной.
+
+        :param state: Статус, как в filter_by_state
+        :param currency: Код валюты, как в filter_by_currency
+        :param start: Нижняя граница даты (строка ISO, включительно)
+        :param end: Верхняя граница даты (строка ISO, включительно)
+        :param account: Счёт или карта в поле from или to
+        :param order_by_date: None — порядок загрузки, True — по убыванию даты (как sort_by_date),
+            False — по возрастанию
+        :param limit: Не больше limit транзакций
+        :return: Итератор словарей в формате operations.json
+        """
+        return self._rows(*self._sql(state, currency, start, end, account, order_by_date, limit))
+
+    def filter_by_state(self, state: str = "EXECUTED") -> Iterator[Dict]:
+        """Транзакции с заданным статусом в порядке загрузки."""
+        return self.query(state=state)
+
+    def filter_by_currency(self, currency_code: str) -> Iterator[Dict]:
+        """Транзакции в заданной валюте в порядке загрузки."""
+        return self.query(currency=currency_code)
+
+    def sort_by_date(self, reverse: bool = True, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Транзакции, упорядоченные по дате, как в sort_by_date (первые limit, если он задан)."""
+        return self.query(order_by_date=reverse, limit=limit)
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict]:
+        """Транзакции с датой в диапазоне [start, end] по возрастанию даты, как TransactionIndex.between."""
+        return self.query(start=start, end=end, order_by_date=False)
+
+    def explain(self, **conditions: Any) -> List[str]:
+        """План запроса SQLite для query(**conditions): видно, какой индекс используется."""
+        sql, params = self._sql(**conditions)
+        return [row[-1] for row in self._connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
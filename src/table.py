@@ -0,0 +1,153 @@
+from array import array
+from datetime import datetime, timezone
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from src.money import Money, to_minor
+
+# Значение для отсутствующей даты: такие записи сортируются раньше всех, как "" в sort_by_date
+MISSING_DATE = -(2**63)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _date_to_micros(date_str: Optional[str]) -> int:
+    """Переводит дату в формате ISO ('2018-06-30T02:08:58.425572') в микросекунды от эпохи."""
+    if not date_str:
+        return MISSING_DATE
+    try:
+        date = datetime.fromisoformat(date_str)
+    except ValueError:
+        return MISSING_DATE
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = date - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _amount_to_minor(amount: Union[str, Money, None]) -> int:
+    """Переводит сумму-строку ('9824.07') или Money в целое число копеек/центов."""
+    if amount is None:
+        return 0
+    if isinstance(amount, Money):
+        return amount.minor
+    try:
+        return to_minor(amount)
+    except ValueError:
+        return 0
+
+
+class _InternedColumn:
+    """Колонка повторяющихся строк, хранящая маленькие целые коды вместо самих значений."""
+
+    def __init__(self) -> None:
+        self.codes = array("B")
+        self.values: List[Optional[str]] = []
+        self._lookup: Dict[Optional[str], int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            if code == 256 and self.codes.typecode == "B":
+                self.codes = array("H", self.codes)
+            self._lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code_of(self, value: str) -> Optional[int]:
+        return self._lookup.get(value)
+
+    def value_at(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+    def select(self, value: str, selection: Optional[Sequence[int]]) -> array:
+        """Возвращает номера строк, в которых колонка равна value."""
+        code = self.code_of(value)
+        if code is None:
+            return array("I")
+        codes = self.codes
+        if selection is not None:
+            return array("I", [row for row in selection if codes[row] == code])
+        if codes.typecode == "B":
+            # Маска строится на уровне C: нужный код превращается в 1, остальные в 0
+            table = bytes(1 if i == code else 0 for i in range(256))
+            return array("I", compress(range(len(codes)), codes.tobytes().translate(table)))
+        return array("I", [row for row, row_code in enumerate(codes) if row_code == code])
+
+
+class TransactionTable:
+    """
+    Колоночное хранилище транзакций.
+
+    Идентификаторы, суммы (в копейках/центах) и даты (микросекунды от эпохи) лежат
+    в компактных массивах array, статус и код валюты — в виде интернированных кодов.
+    Фильтры и сортировка возвращают выборки — массивы номеров строк, а не копии словарей;
+    исходные записи можно получить через rows().
+
+    При keep_records=False исходные словари не сохраняются (только колонки),
+    что и даёт основную экономию памяти, но rows() становится недоступен.
+    """
+
+    def __init__(self, keep_records: bool = True) -> None:
+        self.keep_records = keep_records
+        self._size = 0
+        self.ids = array("q")
+        self.amounts = array("q")
+        self.dates = array("q")
+        self.states = _InternedColumn()
+        self.currencies = _InternedColumn()
+        self._records: List[Dict] = []
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict], keep_records: bool = True) -> "TransactionTable":
+        """Строит таблицу из результата load_transactions или iter_transactions."""
+        table = cls(keep_records)
+        for transaction in transactions:
+            table.append(transaction)
+        return table
+
+    def append(self, transaction: Dict) -> None:
+        """Добавляет одну транзакцию в конец таблицы."""
+        operation_amount = transaction.get("operationAmount") or {}
+        currency = operation_amount.get("currency") or {}
+
+        self.ids.append(transaction.get("id") or 0)
+        self.amounts.append(_amount_to_minor(operation_amount.get("amount")))
+        self.dates.append(_date_to_micros(transaction.get("date")))
+        self.states.append(transaction.get("state"))
+        self.currencies.append(currency.get("code"))
+        if self.keep_records:
+            self._records.append(transaction)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def state(self, row: int) -> Optional[str]:
+        return self.states.value_at(row)
+
+    def currency(self, row: int) -> Optional[str]:
+        return self.currencies.value_at(row)
+
+    def filter_by_state(self, state: str = "EXECUTED", selection: Optional[Sequence[int]] = None) -> array:
+        """Табличный аналог processing.filter_by_state: номера строк с заданным статусом."""
+        return self.states.select(state, selection)
+
+    def filter_by_currency(self, currency_code: str, selection: Optional[Sequence[int]] = None) -> array:
+        """Табличный аналог generators.filter_by_currency: номера строк в заданной валюте."""
+        return self.currencies.select(currency_code, selection)
+
+    def sort_by_date(self, reverse: bool = True, selection: Optional[Sequence[int]] = None) -> array:
+        """Табличный аналог processing.sort_by_date: номера строк, упорядоченные по дате."""
+        rows = range(len(self)) if selection is None else selection
+        return array("I", sorted(rows, key=self.dates.__getitem__, reverse=reverse))
+
+    def rows(self, selection: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Возвращает исходные записи для выборки (без копирования словарей)."""
+        if not self.keep_records:
+            raise ValueError("Таблица создана без исходных записей (keep_records=False).")
+        if selection is None:
+            return list(self._records)
+        records = self._records
+        return [records[row] for row in selection]
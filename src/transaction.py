@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+from src.money import Money
+
+# Ключи словаря транзакции верхнего уровня и соответствующие им поля Transaction
+_FIELDS = {"id": "id", "state": "state", "date": "date", "description": "description", "from": "from_", "to": "to"}
+
+
+@dataclass(slots=True)
+class Transaction:
+    """
+    Плоская запись транзакции со слотами вместо трёх вложенных словарей.
+
+    Поддерживает чтение в стиле словаря (get, [], in) по ключам исходного формата,
+    поэтому filter_by_state, sort_by_date, filter_by_currency и transaction_descriptions
+    принимают её наравне со словарём. Значение None означает, что ключа в исходной записи не было.
+    """
+
+    id: Optional[int] = None
+    state: Optional[str] = None
+    date: Optional[str] = None
+    # Строка из operations.json или Money, если транзакции загружены с as_money=True
+    amount: Union[str, Money, None] = None
+    currency_name: Optional[str] = None
+    currency_code: Optional[str] = None
+    description: Optional[str] = None
+    from_: Optional[str] = None
+    to: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Transaction":
+        """Создаёт запись из словаря в формате operations.json."""
+        operation_amount = data.get("operationAmount") or {}
+        currency = operation_amount.get("currency") or {}
+        return cls(
+            data.get("id"),
+            data.get("state"),
+            data.get("date"),
+            operation_amount.get("amount"),
+            currency.get("name"),
+            currency.get("code"),
+            data.get("description"),
+            data.get("from"),
+            data.get("to"),
+        )
+
+    def to_dict(self) -> Dict:
+        """Возвращает словарь в формате operations.json (отсутствующие поля не включаются)."""
+        result: Dict[str, Any] = {}
+        for key in ("id", "state", "date"):
+            if self.get(key) is not None:
+                result[key] = self.get(key)
+        operation_amount = self._operation_amount()
+        if operation_amount is not None:
+            result["operationAmount"] = operation_amount
+        for key in ("description", "from", "to"):
+            if self.get(key) is not None:
+                result[key] = self.get(key)
+        return result
+
+    def _operation_amount(self) -> Optional[Dict]:
+        if self.amount is None and self.currency_name is None and self.currency_code is None:
+            return None
+        operation_amount: Dict[str, Any] = {}
+        if self.amount is not None:
+            operation_amount["amount"] = self.amount
+        if self.currency_name is not None or self.currency_code is not None:
+            currency = {}
+            if self.currency_name is not None:
+                currency["name"] = self.currency_name
+            if self.currency_code is not None:
+                currency["code"] = self.currency_code
+            operation_amount["currency"] = currency
+        return operation_amount
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Аналог dict.get по ключам исходного формата."""
+        if key == "operationAmount":
+            value = self._operation_amount()
+        else:
+            field = _FIELDS.get(key)
+            if field is None:
+                return default
+            value = getattr(self, field)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+
+# Транзакция в любом из поддерживаемых видов: словарь из operations.json или Transaction
+TransactionLike = Union[Dict, Transaction]
@@ -1,10 +1,106 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from src.decorators import timed
 from src.masks import get_mask_account, get_mask_card_number
 
 
+class MaskCache:
+    """
+    Ограниченный LRU-кэш замаскированных номеров для mask_account_card.
+
+    Ключом служит хеш BLAKE2b с секретным ключом, который создаётся для каждого кэша
+    заново, поэтому исходные номера карт и счетов в кэше не хранятся вовсе. Хранится не
+    больше capacity записей; при переполнении вытесняется самая давно использованная.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity <= 0:
+            raise ValueError("Ёмкость кэша должна быть положительной.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._secret = os.urandom(16)
+        self._lock = threading.Lock()
+
+    def _key(self, card_info: str) -> bytes:
+        return hashlib.blake2b(card_info.encode("utf-8"), key=self._secret, digest_size=16).digest()
+
+    def get_or_mask(self, card_info: str, mask: Callable[[str], str]) -> str:
+        """Возвращает результат из кэша или вызывает mask и запоминает результат (ошибки не кэшируются)."""
+        key = self._key(card_info)
+        with self._lock:
+            masked = self._entries.get(key)
+            if masked is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return masked
+            self.misses += 1
+
+        masked = mask(card_info)
+
+        with self._lock:
+            self._entries[key] = masked
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return masked
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий, промахов и вытеснений."""
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_mask_cache: Optional[MaskCache] = None
+
+
+def enable_mask_cache(capacity: int = 4096) -> MaskCache:
+    """Включает кэширование результатов mask_account_card и возвращает кэш (для статистики и clear())."""
+    global _mask_cache
+    _mask_cache = MaskCache(capacity)
+    return _mask_cache
+
+
+def disable_mask_cache() -> None:
+    """Выключает кэширование mask_account_card и освобождает кэш."""
+    global _mask_cache
+    _mask_cache = None
+
+
+@timed()
 def mask_account_card(card_info: str) -> str:
     """Функция обрабатывает информацию как о картах,
-    так и о счетах и возвращает строку с замаскированным номером."""
+    так и о счетах и возвращает строку с замаскированным номером.
+    После enable_mask_cache() повторяющиеся номера берутся из LRU-кэша."""
+
+    cache = _mask_cache
+    if cache is not None and isinstance(card_info, str):
+        return cache.get_or_mask(card_info, _mask_account_card)
+    return _mask_account_card(card_info)
+
 
+def _mask_account_card(card_info: str) -> str:
     if "Счет" in card_info:
         return f"{card_info[:5]}{get_mask_account(card_info)}"
     else:
@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Курсы валют к рублю, которые отдаёт заглушка
+RUB_RATES = {"RUB": 1.0, "USD": 90.0, "EUR": 100.0, "CNY": 12.5}
+
+
+class RateStubServer:
+    """
+    Локальная заглушка эндпоинта live API apilayer.
+
+    Отвечает на /live?source=XXX&currencies=YYY,ZZZ котировками из RUB_RATES, а на
+    /historical?date=ГГГГ-ММ-ДД&... — курсами из history[дата] (или тоже из RUB_RATES).
+    Умеет задерживать ответ (delay для всех запросов, slow — по коду валюты source),
+    отвечать ошибкой 500 на ближайшие fail_next запросов и на запросы с валютами
+    из failing. Все запросы записываются в requests, max_in_flight — наибольшее
+    число одновременно обрабатываемых запросов.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.slow: Dict[str, float] = {}
+        self.history: Dict[str, Dict[str, float]] = {}
+        self.fail_next = 0
+        self.failing: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests: List[Dict[str, str]] = []
+        self.headers: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "RateStubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "RateStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _respond(self, path: str, headers: Dict[str, str]) -> Tuple[int, Optional[Dict]]:
+        parsed = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        with self._lock:
+            self.requests.append(params)
+            self.headers.append(headers)
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return 500, None
+        source = params.get("source", "USD")
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay + self.slow.get(source, 0.0))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        currencies = params.get("currencies", "RUB").split(",")
+        if parsed.path not in ("/live", "/historical") or any(code in self.failing for code in [source, *currencies]):
+            return 500, None
+        rub_rates = self.history.get(params.get("date", ""), RUB_RATES)
+        if source not in rub_rates or any(code not in rub_rates for code in currencies):
+            return 200, {"success": False, "error": {"code": 201}, "message": "invalid currency"}
+        quotes = {f"{source}{code}": rub_rates[source] / rub_rates[code] for code in currencies}
+        return 200, {"success": True, "source": source, "quotes": quotes}
+
+    def _handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                status, body = stub._respond(self.path, dict(self.headers))
+                payload = json.dumps(body).encode("utf-8") if body is not None else b"error"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
@@ -1,7 +1,18 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 import pytest
 
+from src.log_config import LOGS_DIR, configure_logging
+from src.utils import load_transactions
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _tmp_logs_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Тесты пишут логи во временный каталог, а не в logs/ проекта (там оказались бы номера карт и счетов)."""
+    configure_logging(logs_dir=str(tmp_path_factory.mktemp("logs")))
+    yield
+    configure_logging(logs_dir=LOGS_DIR)
+
 
 @pytest.fixture
 def date_test() -> str:
@@ -57,3 +68,8 @@ def transactions() -> List[Dict]:
             "to": "Счет 14211924144426031657",
         },
     ]
+
+
+@pytest.fixture
+def operations() -> List[Dict]:
+    return load_transactions("data/operations.json")
@@ -0,0 +1,115 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import pytest
+
+from src.aggregation import Aggregator, aggregate
+from src.generators import filter_by_currency
+from src.processing import filter_by_state
+from src.transaction import Transaction
+from src.utils import load_transactions
+
+
+def test_aggregate_by_state_and_currency(transactions: List[Dict]) -> None:
+    result = aggregate(transactions, by=["state", "currency"], metrics=["count", "sum_amount"])
+
+    assert result == {
+        ("EXECUTED", "USD"): {"count": 3, "sum_amount": 145822.54},
+        ("EXECUTED", "RUB"): {"count": 1, "sum_amount": 43318.34},
+        ("CANCELED", "RUB"): {"count": 1, "sum_amount": 67314.70},
+    }
+
+
+def test_min_max_avg_by_date(transactions: List[Dict]) -> None:
+    result = aggregate(iter(transactions), by=["year", "currency"], metrics=["min_amount", "max_amount", "avg_amount"])
+
+    assert result[("2018", "USD")] == {
+        "min_amount": 9824.07,
+        "max_amount": 56883.54,
+        "avg_amount": pytest.approx(33353.805),
+    }
+    assert result[("2018", "RUB")] == {"min_amount": 67314.70, "max_amount": 67314.70, "avg_amount": 67314.70}
+    assert aggregate(transactions, by=["month"])[("2019-04",)] == {"count": 1}
+
+
+def test_matches_filters_on_operations() -> None:
+    operations = load_transactions("data/operations.json")
+    result = aggregate(operations, by=["state", "currency"], metrics=["count"])
+
+    for (state, code), values in result.items():
+        if state is not None:
+            expected = list(filter_by_currency(filter_by_state(operations, state), code))
+            assert values["count"] == len(expected)
+    assert sum(values["count"] for values in result.values()) == len(operations)
+
+
+def test_records_money_and_bad_amounts(transactions: List[Dict]) -> None:
+    records = [Transaction.from_dict(transaction) for transaction in transactions]
+    money = load_transactions("data/operations.json", as_money=True)
+    plain = load_transactions("data/operations.json")
+    metrics = ["count", "sum_amount", "min_amount", "max_amount"]
+
+    expected = aggregate(transactions, by=["currency"], metrics=metrics)
+    assert aggregate(records, by=["currency"], metrics=metrics) == expected
+    assert aggregate(money, by=["currency"], metrics=metrics) == aggregate(plain, by=["currency"], metrics=metrics)
+
+    bad: List[Dict] = [{"state": "X"}, {"state": "X", "operationAmount": {"amount": "abc"}}]
+    result = aggregate(bad, by=["state", "currency"], metrics=metrics)
+    assert result == {("X", None): {"count": 2, "sum_amount": 0.0, "min_amount": None, "max_amount": None}}
+
+
+def test_merge_chunks_equals_single_pass() -> None:
+    operations = load_transactions("data/operations.json")
+    by, metrics = ["description", "currency"], ["count", "sum_amount", "min_amount", "max_amount", "avg_amount"]
+
+    parts = [Aggregator(by, metrics).update(operations[start : start + 17]) for start in range(0, len(operations), 17)]
+    merged = Aggregator(by, metrics)
+    for part in reversed(parts):
+        merged.merge(part)
+
+    expected = aggregate(operations, by=by, metrics=metrics)
+    assert merged.result().keys() == expected.keys()
+    for key, values in expected.items():
+        assert merged.result()[key] == values
+
+    with pytest.raises(ValueError):
+        merged.merge(Aggregator(["state"], metrics))
+
+
+def test_rows_and_validation(transactions: List[Dict]) -> None:
+    aggregator = Aggregator(["state"], ["count"])
+    for transaction in transactions:
+        aggregator.add(transaction)
+
+    assert len(aggregator) == 2
+    assert aggregator.rows() == [{"state": "EXECUTED", "count": 4}, {"state": "CANCELED", "count": 1}]
+    assert aggregate(transactions, by=[], metrics=["count"]) == {(): {"count": 5}}
+    with pytest.raises(ValueError):
+        Aggregator(["colour"])
+    with pytest.raises(ValueError):
+        Aggregator(["state"], ["median"])
+    # Суммы в разных валютах не складываются
+    with pytest.raises(ValueError):
+        Aggregator(["state"], ["count", "sum_amount"])
+
+
+def test_pickle_and_process_pool() -> None:
+    operations = load_transactions("data/operations.json")
+    by, metrics = ["state", "currency"], ["count", "sum_amount", "max_amount"]
+    aggregator = Aggregator(by, metrics).update(operations)
+
+    restored = pickle.loads(pickle.dumps(aggregator))
+    assert restored.result() == aggregator.result()
+    assert restored.update(operations[:1]).result() != aggregator.result()
+
+    chunks = [operations[start : start + 40] for start in range(0, len(operations), 40)]
+    merged = Aggregator(by, metrics)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for part in executor.map(_aggregate_chunk, chunks):
+            merged.merge(part)
+    assert merged.result() == aggregator.result()
+
+
+def _aggregate_chunk(chunk: List[Dict]) -> Aggregator:
+    return Aggregator(["state", "currency"], ["count", "sum_amount", "max_amount"]).update(chunk)
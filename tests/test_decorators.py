@@ -1,6 +1,11 @@
+import re
+import threading
+import time
+
 import pytest
 
-from src.decorators import log
+from src.decorators import flush_log_files, log, timed
+from src.metrics import REGISTRY, MetricsRegistry
 
 
 # Тест 1: Проверяем, что при успешном выполнении функции выводятся правильные логи в консоль
@@ -39,6 +44,7 @@ def test_log_file(tmpdir):  # type: ignore[no-untyped-def]
         return a * b
 
     multiply(4, 7)
+    flush_log_files()
 
     content = log_file.read()
     assert "Calling function 'multiply' with args: (4, 7), kwargs: {}" in content
@@ -68,3 +74,158 @@ def test_function_result_unchanged():  # type: ignore[no-untyped-def]
         return x * x
 
     assert square(6) == 36
+
+
+# Тест 6: Записи буферизуются и попадают в файл при сбросе буфера
+def test_log_file_is_buffered(tmpdir):  # type: ignore[no-untyped-def]
+    log_file = tmpdir.join("buffered_log.txt")
+
+    @log(filename=str(log_file), flush_interval=None)
+    def add(a, b):  # type: ignore[no-untyped-def]
+        return a + b
+
+    add(1, 2)
+    assert not log_file.exists()
+
+    flush_log_files()
+    assert log_file.read().splitlines() == [
+        "Calling function 'add' with args: (1, 2), kwargs: {}",
+        "Function 'add' returned: 3",
+    ]
+
+
+# Тест 7: Буфер сбрасывается при превышении размера и по таймеру
+def test_log_file_flushed_by_size_and_interval(tmpdir):  # type: ignore[no-untyped-def]
+    by_size = tmpdir.join("size_log.txt")
+    by_interval = tmpdir.join("interval_log.txt")
+
+    @log(filename=str(by_size), buffer_size=10, flush_interval=None)
+    def first(x):  # type: ignore[no-untyped-def]
+        return x
+
+    @log(filename=str(by_interval), flush_interval=0.01)
+    def second(x):  # type: ignore[no-untyped-def]
+        return x
+
+    first(1)
+    second(2)
+    assert "Function 'first' returned: 1" in by_size.read()
+
+    for _ in range(100):
+        if by_interval.exists() and "returned: 2" in by_interval.read():
+            break
+        time.sleep(0.01)
+    assert "Function 'second' returned: 2" in by_interval.read()
+
+
+# Тест 8: Строки из разных потоков не перемешиваются
+def test_log_file_lines_are_whole_across_threads(tmpdir):  # type: ignore[no-untyped-def]
+    log_file = tmpdir.join("threads_log.txt")
+
+    @log(filename=str(log_file), buffer_size=256)
+    def echo(text):  # type: ignore[no-untyped-def]
+        return text
+
+    def worker(number: int) -> None:
+        for _ in range(200):
+            echo(str(number) * 50)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    flush_log_files()
+
+    lines = log_file.read().splitlines()
+    assert len(lines) == 8 * 200 * 2
+    pattern = re.compile(
+        r"Calling function 'echo' with args: \('(\d)\1{49}',\), kwargs: \{\}|Function 'echo' returned: (\d)\2{49}"
+    )
+    for line in lines:
+        assert pattern.fullmatch(line)
+
+
+# Тест 9: Выборка логирует каждый N-й вызов, а ошибки — всегда
+def test_log_sampling(capsys):  # type: ignore[no-untyped-def]
+    @log(sample_every=3)
+    def check(x):  # type: ignore[no-untyped-def]
+        if x < 0:
+            raise ValueError("negative")
+        return x
+
+    for number in range(6):
+        check(number)
+    with pytest.raises(ValueError):
+        check(-1)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line for line in lines if "returned" in line] == [
+        "Function 'check' returned: 0",
+        "Function 'check' returned: 3",
+    ]
+    assert "Function 'check' raised exception: ValueError: negative with args: (-1,), kwargs: {}" in lines
+
+
+# Тест 10: Длинные представления аргументов и результата обрезаются
+def test_log_max_repr(capsys):  # type: ignore[no-untyped-def]
+    @log(max_repr=10)
+    def repeat(text, times=1):  # type: ignore[no-untyped-def]
+        return text * times
+
+    repeat("abc", times=10)
+
+    out = capsys.readouterr().out
+    assert "Calling function 'repeat' with args: ('abc',), kwargs: {'times': ..." in out
+    assert "Function 'repeat' returned: abcabcabca..." in out
+
+
+# Тест 11: Декоратор сохраняет имя и строку документации функции
+def test_log_preserves_metadata():  # type: ignore[no-untyped-def]
+    @log(filename=None)
+    def documented():  # type: ignore[no-untyped-def]
+        """Документация."""
+
+    assert documented.__name__ == "documented"
+    assert documented.__doc__ == "Документация."
+
+
+# Тест 12: timed считает вызовы и ошибки и не меняет результат
+def test_timed_counts_calls_and_errors():  # type: ignore[no-untyped-def]
+    registry = MetricsRegistry()
+
+    @timed(registry=registry)
+    def divide(a, b):  # type: ignore[no-untyped-def]
+        """Деление."""
+        return a / b
+
+    assert divide(6, 3) == 2
+    with pytest.raises(ZeroDivisionError):
+        divide(1, 0)
+
+    name = f"{__name__}.test_timed_counts_calls_and_errors.<locals>.divide"
+    assert registry.names() == [name]
+    stats = registry.stats(name)
+    assert stats.calls == 2
+    assert stats.errors == 1
+    assert sum(stats.buckets) == 2
+    assert divide.__name__ == "divide"
+    assert divide.__doc__ == "Деление."
+
+
+# Тест 13: Имя метрики можно задать явно; горячие функции пишут в реестр по умолчанию
+def test_timed_name_and_default_registry():  # type: ignore[no-untyped-def]
+    registry = MetricsRegistry()
+
+    @timed(name="custom", registry=registry)
+    def noop():  # type: ignore[no-untyped-def]
+        return None
+
+    noop()
+    assert registry.stats("custom").calls == 1
+
+    from src.processing import sort_by_date
+
+    before = REGISTRY.stats("src.processing.sort_by_date").calls
+    sort_by_date([{"date": "2019-01-01"}])
+    assert REGISTRY.stats("src.processing.sort_by_date").calls == before + 1
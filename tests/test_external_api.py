@@ -1,15 +1,47 @@
+import asyncio
+import math
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 import requests
 
-from src.external_api import convert_to_rub, get_currency_rate, get_exchange_rates
+from src import external_api
+from src.external_api import (
+    RateCache,
+    coalescing_stats,
+    convert_many,
+    convert_to_rub,
+    convert_transactions_async,
+    convert_transactions_at_date,
+    disable_rate_cache,
+    disable_rate_limit,
+    enable_rate_cache,
+    enable_rate_limit,
+    get_currency_rate,
+    get_currency_rate_async,
+    get_exchange_rates,
+    get_historical_rates,
+    get_rate_history,
+    get_rates,
+    get_rates_async,
+    set_http_get,
+    total_in_rub,
+)
+from src.money import Money
+from src.rate_history import RateHistory
+from src.transaction import Transaction
+from src.utils import load_transactions
+from tests.api_stub import RateStubServer
 
 
 class TestExternalAPI(unittest.TestCase):
 
     # Тест для успешного получения курса
-    @patch("src.external_api.requests.get")
+    @patch("src.external_api.requests.Session.get")
     def test_get_currency_rate_success(self, mock_get): # type: ignore[no-untyped-def]
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -20,7 +52,7 @@ class TestExternalAPI(unittest.TestCase):
         self.assertAlmostEqual(result, 75.5, delta=0.01)
 
     # Тест для ошибки API (например, invalid base currency)
-    @patch("src.external_api.requests.get")
+    @patch("src.external_api.requests.Session.get")
     def test_get_currency_rate_api_error(self, mock_get): # type: ignore[no-untyped-def]
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -31,7 +63,7 @@ class TestExternalAPI(unittest.TestCase):
         self.assertEqual(result, 0.0)
 
     # Тест для сетевой ошибки (например, ConnectionError)
-    @patch("src.external_api.requests.get")
+    @patch("src.external_api.requests.Session.get")
     def test_get_currency_rate_connection_error(self, mock_get): # type: ignore[no-untyped-def]
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
 
@@ -39,7 +71,7 @@ class TestExternalAPI(unittest.TestCase):
         self.assertEqual(result, 0.0)
 
     # Тест для таймаута
-    @patch("src.external_api.requests.get")
+    @patch("src.external_api.requests.Session.get")
     def test_get_currency_rate_timeout_error(self, mock_get): # type: ignore[no-untyped-def]
         mock_get.side_effect = requests.exceptions.Timeout("Request timeout")
 
@@ -47,7 +79,7 @@ class TestExternalAPI(unittest.TestCase):
         self.assertEqual(result, 0.0)
 
     # Тест для некорректного JSON
-    @patch("src.external_api.requests.get")
+    @patch("src.external_api.requests.Session.get")
     def test_get_currency_rate_invalid_json(self, mock_get): # type: ignore[no-untyped-def]
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -58,27 +90,57 @@ class TestExternalAPI(unittest.TestCase):
         self.assertEqual(result, 0.0)
 
     # Тест для get_exchange_rates (успешный случай)
-    @patch("src.external_api.get_currency_rate")
-    def test_get_exchange_rates(self, mock_get_currency_rate): # type: ignore[no-untyped-def]
-        mock_get_currency_rate.side_effect = [75.0, 85.0]  # USD, EUR
+    @patch("src.external_api.get_rates")
+    def test_get_exchange_rates(self, mock_get_rates):  # type: ignore[no-untyped-def]
+        mock_get_rates.return_value = {"USD": 75.0, "EUR": 85.0}
 
         result = get_exchange_rates()
         self.assertEqual(result, {"USD": 75.0, "EUR": 85.0})
+        mock_get_rates.assert_called_once_with(["USD", "EUR"])
 
-    # Тест для get_exchange_rates, когда один из запросов неудачен
-    @patch("src.external_api.get_currency_rate")
-    def test_get_exchange_rates_with_failure(self, mock_get_currency_rate): # type: ignore[no-untyped-def]
-        mock_get_currency_rate.side_effect = [75.0, 0.0]  # USD, EUR
+    # Тест для get_exchange_rates, когда курс одной из валют не получен
+    @patch("src.external_api.get_rates")
+    def test_get_exchange_rates_with_failure(self, mock_get_rates):  # type: ignore[no-untyped-def]
+        mock_get_rates.return_value = {"USD": 75.0, "EUR": 0.0}
 
         result = get_exchange_rates()
         self.assertEqual(result, {"USD": 75.0, "EUR": 0.0})
 
+    # Тест для get_rates: один запрос, курс — обратная величина котировки RUB
+    @patch("src.external_api.requests.Session.get")
+    def test_get_rates_single_request(self, mock_get):  # type: ignore[no-untyped-def]
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"success": True, "quotes": {"RUBUSD": 0.0125, "RUBEUR": 0.01}}
+        mock_get.return_value = mock_response
+
+        result = get_rates(["USD", "EUR", "RUB", "USD"])
+        self.assertEqual(result, {"USD": 80.0, "EUR": 100.0, "RUB": 1.0})
+        mock_get.assert_called_once()
+        self.assertIn("source=RUB&currencies=USD,EUR", mock_get.call_args.args[0])
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], external_api.TIMEOUT)
+
+    # Тест для get_rates при сетевой ошибке
+    @patch("src.external_api.requests.Session.get")
+    def test_get_rates_connection_error(self, mock_get):  # type: ignore[no-untyped-def]
+        mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
+
+        result = get_rates(["USD", "EUR"])
+        self.assertEqual(result, {"USD": 0.0, "EUR": 0.0})
+
     # Тест для convert_to_rub (USD → RUB)
     def test_convert_usd_to_rub(self): # type: ignore[no-untyped-def]
         exchange_rates = {"USD": 75.0, "EUR": 85.0}
         result = convert_to_rub(100, "USD", exchange_rates)
         self.assertAlmostEqual(result, 7500.0, delta=0.01)
 
+    # Тест для convert_to_rub с Money: результат в копейках с округлением ROUND_HALF_UP
+    def test_convert_money_to_rub(self):  # type: ignore[no-untyped-def]
+        exchange_rates = {"USD": 75.125}
+        self.assertEqual(convert_to_rub(Money.parse("1.02", "USD"), "USD", exchange_rates), Money(7663, "RUB"))
+        self.assertEqual(convert_to_rub(Money.parse("5", "RUB"), "RUB", exchange_rates), Money(500, "RUB"))
+        with patch("builtins.print"):
+            self.assertEqual(convert_to_rub(Money.parse("1", "EUR"), "EUR", exchange_rates), Money(0, "RUB"))
+
     # Тест для convert_to_rub (EUR → RUB)
     def test_convert_eur_to_rub(self): # type: ignore[no-untyped-def]
         exchange_rates = {"USD": 75.0, "EUR": 85.0}
@@ -126,3 +188,445 @@ class TestExternalAPI(unittest.TestCase):
         exchange_rates = {"USD": 75.0}
         result = convert_to_rub(100, "EUR", exchange_rates)
         self.assertEqual(result, 0.0)
+
+
+class TestConvertMany(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.rates = {"USD": 75.0, "EUR": 85.0, "CNY": 0.0}
+        self.transactions = [
+            {"operationAmount": {"amount": "100", "currency": {"code": "USD"}}},
+            {"operationAmount": {"amount": "500.50", "currency": {"code": "RUB"}}},
+            Transaction(amount="2.5", currency_code="EUR"),
+            {"operationAmount": {"amount": "-10", "currency": {"code": "USD"}}},
+            {"operationAmount": {"amount": "1", "currency": {"code": "CNY"}}},
+            {"operationAmount": {"amount": "7", "currency": {"code": "GBP"}}},
+        ]
+
+    # Результат совпадает с поштучным convert_to_rub, подытоги — по валютам
+    def test_convert_many_matches_convert_to_rub(self):  # type: ignore[no-untyped-def]
+        with patch("builtins.print"):
+            expected = [
+                convert_to_rub(external_api._amount(t), external_api.currency_code(t) or "", self.rates)
+                for t in self.transactions
+            ]
+            result, subtotals = convert_many(self.transactions, self.rates, use_numpy=False)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(subtotals, {"USD": 6750.0, "RUB": 500.5, "EUR": 212.5, "CNY": 0.0, "GBP": 0.0})
+
+    # Сообщение о некорректном курсе печатается один раз на валюту
+    def test_convert_many_reports_bad_rate_once(self):  # type: ignore[no-untyped-def]
+        with patch("builtins.print") as mock_print:
+            convert_many(self.transactions * 3, self.rates, use_numpy=False)
+        self.assertEqual(mock_print.call_count, 2)
+
+    def test_total_in_rub(self):  # type: ignore[no-untyped-def]
+        with patch("builtins.print"):
+            self.assertEqual(total_in_rub(self.transactions, self.rates, use_numpy=False), 7463.0)
+        self.assertEqual(total_in_rub([], self.rates), 0.0)
+
+    # Реальный файл: пустая запись не ломает пакетную конвертацию и даёт 0
+    def test_total_in_rub_operations(self):  # type: ignore[no-untyped-def]
+        operations = load_transactions("data/operations.json")
+        with patch("builtins.print") as mock_print:
+            result, subtotals = convert_many(operations, {"USD": 90.0}, use_numpy=False)
+            total = total_in_rub(operations, {"USD": 90.0}, use_numpy=False)
+
+        self.assertEqual(result[operations.index({})], 0.0)
+        self.assertEqual(set(subtotals), {"USD", "RUB"})
+        mock_print.assert_not_called()
+        self.assertAlmostEqual(total, subtotals["USD"] + subtotals["RUB"])
+        self.assertAlmostEqual(math.fsum(result), total, places=2)
+
+    # С суммами Money запись без суммы даёт Money(0, "RUB"), и итог остаётся Money
+    def test_total_in_rub_operations_money(self):  # type: ignore[no-untyped-def]
+        operations = load_transactions("data/operations.json", as_money=True)
+        result, subtotals = convert_many(operations, {"USD": 90.0}, use_numpy=False)
+        total = total_in_rub(operations, {"USD": 90.0}, use_numpy=False)
+
+        self.assertEqual(result[operations.index({})], Money(0, "RUB"))
+        self.assertEqual(set(subtotals), {"USD", "RUB"})
+        self.assertIsInstance(total, Money)
+        self.assertEqual(total, Money.sum(subtotals.values(), "RUB"))
+
+    def test_convert_many_invalid_amount(self):  # type: ignore[no-untyped-def]
+        with self.assertRaises(ValueError):
+            convert_many([{"operationAmount": {"amount": "x", "currency": {"code": "USD"}}}], self.rates)
+
+    # Суммы Money конвертируются в целых копейках, подытоги точные
+    def test_convert_many_money(self):  # type: ignore[no-untyped-def]
+        transactions = [
+            {"operationAmount": {"amount": Money.parse("0.10", "USD"), "currency": {"code": "USD"}}},
+            Transaction(amount=Money.parse("0.10", "USD"), currency_code="USD"),
+            {"operationAmount": {"amount": Money.parse("500.50", "RUB"), "currency": {"code": "RUB"}}},
+            {"operationAmount": {"amount": Money.parse("1", "CNY"), "currency": {"code": "CNY"}}},
+        ]
+        with patch("builtins.print"):
+            result, subtotals = convert_many(transactions, {"USD": 90.005, "CNY": 0.0})
+            total = total_in_rub(transactions, {"USD": 90.005, "CNY": 0.0})
+
+        self.assertEqual(result, [Money(900, "RUB"), Money(900, "RUB"), Money(50050, "RUB"), Money(0, "RUB")])
+        self.assertEqual(subtotals, {"USD": Money(1800, "RUB"), "RUB": Money(50050, "RUB"), "CNY": Money(0, "RUB")})
+        self.assertEqual(total, Money(51850, "RUB"))
+        self.assertEqual(result[0], convert_to_rub(Money.parse("0.10", "USD"), "USD", {"USD": 90.005}))
+
+    @unittest.skipIf(external_api._numpy() is None, "numpy не установлен")
+    def test_convert_many_numpy_matches_python(self):  # type: ignore[no-untyped-def]
+        with patch.object(external_api, "NUMPY_MIN_GROUP", 1), patch("builtins.print"):
+            self.assertEqual(
+                convert_many(self.transactions, self.rates, use_numpy=True),
+                convert_many(self.transactions, self.rates, use_numpy=False),
+            )
+
+    @unittest.skipUnless(external_api._numpy() is None, "numpy установлен")
+    def test_convert_many_numpy_required(self):  # type: ignore[no-untyped-def]
+        with self.assertRaises(ImportError):
+            convert_many(self.transactions, self.rates, use_numpy=True)
+
+
+class TestRateCache(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.now = 0.0
+        self.calls = []
+        self.cache = RateCache(ttl=60.0, clock=lambda: self.now)
+
+    def fetch(self, currency):  # type: ignore[no-untyped-def]
+        self.calls.append(currency)
+        return 90.0 + len(self.calls)
+
+    def wait_refresh(self):  # type: ignore[no-untyped-def]
+        deadline = time.monotonic() + 5
+        while self.cache._refreshing and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # Повторный запрос в пределах TTL не обращается к API
+    def test_hit_within_ttl(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(self.cache.get_or_fetch("USD", self.fetch), 91.0)
+        self.now = 59.0
+        self.assertEqual(self.cache.get_or_fetch("USD", self.fetch), 91.0)
+        self.assertEqual(self.calls, ["USD"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    # После TTL сразу возвращается старое значение, а новое приходит из фонового потока
+    def test_stale_while_revalidate(self):  # type: ignore[no-untyped-def]
+        self.cache.get_or_fetch("USD", self.fetch)
+        self.now = 61.0
+        self.assertEqual(self.cache.get_or_fetch("USD", self.fetch), 91.0)
+        self.wait_refresh()
+        self.assertEqual(self.cache.get_or_fetch("USD", self.fetch), 92.0)
+        self.assertEqual(
+            self.cache.stats(),
+            {"size": 1, "hits": 1, "stale_hits": 1, "misses": 1, "refreshes": 1, "refresh_errors": 0},
+        )
+
+    # Одновременно идёт не больше одного фонового обновления валюты
+    def test_single_refresh_per_currency(self):  # type: ignore[no-untyped-def]
+        self.cache.get_or_fetch("USD", self.fetch)
+        release = threading.Event()
+
+        def slow_fetch(currency):  # type: ignore[no-untyped-def]
+            release.wait(5)
+            return self.fetch(currency)
+
+        self.now = 61.0
+        for _ in range(10):
+            self.assertEqual(self.cache.get_or_fetch("USD", slow_fetch), 91.0)
+        release.set()
+        self.wait_refresh()
+        self.assertEqual(self.calls, ["USD", "USD"])
+
+    # Ошибки не кэшируются, а неудачное обновление оставляет прежний курс
+    def test_failures_not_cached(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(self.cache.get_or_fetch("USD", lambda currency: 0.0), 0.0)
+        self.assertEqual(len(self.cache), 0)
+
+        self.cache.get_or_fetch("USD", self.fetch)
+        self.now = 61.0
+        self.cache.get_or_fetch("USD", lambda currency: 0.0)
+        self.wait_refresh()
+        self.assertEqual(self.cache.get_or_fetch("USD", self.fetch), 91.0)
+        self.assertEqual(self.cache.stats()["refresh_errors"], 1)
+
+    # Пакетный запрос: свежие курсы из кэша, запрашиваются только недостающие и устаревшие
+    def test_get_many(self):  # type: ignore[no-untyped-def]
+        requested = []
+
+        def fetch_many(codes):  # type: ignore[no-untyped-def]
+            requested.append(codes)
+            return {code: 0.0 if code == "CNY" else 90.0 + len(requested) for code in codes}
+
+        self.assertEqual(self.cache.get_many(["USD", "CNY"], fetch_many), {"USD": 91.0, "CNY": 0.0})
+        self.now = 30.0
+        self.cache.get_or_fetch("EUR", self.fetch)
+        self.now = 70.0
+        result = self.cache.get_many(["USD", "EUR", "CNY"], fetch_many)
+        self.assertEqual(result, {"USD": 92.0, "EUR": 91.0, "CNY": 0.0})
+        self.assertEqual(requested, [("USD", "CNY"), ("USD", "CNY")])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_invalid_ttl(self):  # type: ignore[no-untyped-def]
+        with self.assertRaises(ValueError):
+            RateCache(ttl=0)
+
+
+class TestStubServer(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.server = RateStubServer().start()
+        self.url_patch = patch.object(external_api, "API_URL", self.server.url)
+        self.url_patch.start()
+        self.key_patch = patch.object(external_api, "API_KEY", "test-key")
+        self.key_patch.start()
+        # Свежая сессия без пауз между повторами
+        self.retry_patch = patch.object(external_api, "RETRY_BACKOFF", 0)
+        self.retry_patch.start()
+        self.session_patch = patch.object(external_api, "_session_instance", None)
+        self.session_patch.start()
+        self.history_patch = patch.object(external_api, "_rate_history", None)
+        self.history_patch.start()
+
+    def tearDown(self):  # type: ignore[no-untyped-def]
+        disable_rate_cache()
+        disable_rate_limit()
+        set_http_get(None)
+        self.history_patch.stop()
+        self.session_patch.stop()
+        self.retry_patch.stop()
+        self.key_patch.stop()
+        self.url_patch.stop()
+        self.server.stop()
+
+    # Настоящий HTTP-запрос к локальной заглушке
+    def test_get_currency_rate_over_http(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(get_currency_rate("USD"), 90.0)
+        self.assertEqual(self.server.requests, [{"source": "USD", "currencies": "RUB"}])
+        self.assertEqual(self.server.headers[0]["apikey"], "test-key")
+
+    # get_exchange_rates с включённым кэшем: второй вызов обходится без запроса
+    def test_get_exchange_rates_cached(self):  # type: ignore[no-untyped-def]
+        cache = enable_rate_cache(ttl=300)
+        self.assertEqual(get_exchange_rates(), {"USD": 90.0, "EUR": 100.0})
+        self.assertEqual(get_exchange_rates(), {"USD": 90.0, "EUR": 100.0})
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    # С кэшем пакет конвертаций делает по одному запросу на валюту
+    def test_rate_cache_over_http(self):  # type: ignore[no-untyped-def]
+        cache = enable_rate_cache(ttl=60.0)
+        for _ in range(5):
+            self.assertEqual(get_currency_rate("USD"), 90.0)
+            self.assertEqual(get_currency_rate("EUR"), 100.0)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(cache.stats()["hits"], 8)
+
+    # Подменённый HTTP-клиент получает адрес и заголовки запроса
+    def test_injected_http_get(self):  # type: ignore[no-untyped-def]
+        seen = []
+
+        def http_get(url, **kwargs):  # type: ignore[no-untyped-def]
+            seen.append(url)
+            return requests.get(url, **kwargs)
+
+        set_http_get(http_get)
+        self.assertEqual(get_currency_rate("EUR"), 100.0)
+        self.assertEqual(seen, [f"{self.server.url}/live?source=EUR&currencies=RUB"])
+
+    # Адрес API из .env читается при первом запросе, а не при импорте модуля
+    def test_api_url_from_dotenv(self):  # type: ignore[no-untyped-def]
+        def load_dotenv():  # type: ignore[no-untyped-def]
+            os.environ["EXCHANGE_API_URL"] = self.server.url
+
+        with patch.object(external_api, "API_URL", None), patch.dict(os.environ), patch.object(
+            external_api, "load_dotenv", side_effect=load_dotenv
+        ):
+            self.assertEqual(get_currency_rate("EUR"), 100.0)
+            self.assertEqual(external_api.API_URL, self.server.url)
+        self.assertEqual(len(self.server.requests), 1)
+
+    # Ошибка сервера превращается в курс 0.0 (после исчерпания повторов)
+    def test_server_error(self):  # type: ignore[no-untyped-def]
+        self.server.failing = ["USD"]
+        with patch("builtins.print"):
+            self.assertEqual(get_currency_rate("USD"), 0.0)
+        self.assertEqual(len(self.server.requests), external_api.RETRIES + 1)
+
+    # get_rates получает все курсы одним запросом
+    def test_get_rates_over_http(self):  # type: ignore[no-untyped-def]
+        rates = get_rates(["USD", "EUR", "CNY", "RUB"])
+        self.assertEqual(rates, {"USD": 90.0, "EUR": 100.0, "CNY": 12.5, "RUB": 1.0})
+        self.assertEqual(self.server.requests, [{"source": "RUB", "currencies": "USD,EUR,CNY"}])
+        self.assertEqual(get_exchange_rates(), {"USD": 90.0, "EUR": 100.0})
+
+    # Временные ошибки 5xx повторяются, соединение переиспользуется
+    def test_get_rates_retries(self):  # type: ignore[no-untyped-def]
+        self.server.fail_next = 2
+        self.assertEqual(get_rates(["USD"]), {"USD": 90.0})
+        self.assertEqual(len(self.server.requests), 3)
+        session = external_api._session()
+        get_rates(["EUR"])
+        self.assertIs(external_api._session(), session)
+
+    # Асинхронные запросы идут параллельно, но не больше concurrency одновременно
+    def test_get_rates_async_concurrency(self):  # type: ignore[no-untyped-def]
+        self.server.delay = 0.2
+        start = time.perf_counter()
+        rates = asyncio.run(get_rates_async(["USD", "EUR", "CNY", "RUB"], concurrency=3))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(rates, {"USD": 90.0, "EUR": 100.0, "CNY": 12.5, "RUB": 1.0})
+        self.assertEqual(self.server.max_in_flight, 3)
+        self.assertLess(elapsed, 0.5)
+
+        self.server.max_in_flight = 0
+        asyncio.run(get_rates_async(["USD", "EUR"], concurrency=1))
+        self.assertEqual(self.server.max_in_flight, 1)
+
+    # Ошибка по одной валюте не мешает остальным
+    def test_get_rates_async_failure(self):  # type: ignore[no-untyped-def]
+        self.server.failing = ["EUR"]
+        with patch("builtins.print"):
+            rates = asyncio.run(get_rates_async(["USD", "EUR"]))
+        self.assertEqual(rates, {"USD": 90.0, "EUR": 0.0})
+        self.assertEqual(asyncio.run(get_currency_rate_async("CNY")), 12.5)
+        with self.assertRaises(ValueError):
+            asyncio.run(get_rates_async(["USD"], concurrency=0))
+
+    # Конвейер выдаёт транзакции по мере прихода курсов их валют
+    def test_convert_transactions_async(self):  # type: ignore[no-untyped-def]
+        self.server.slow = {"EUR": 0.3}
+        transactions = [
+            {"id": 1, "operationAmount": {"amount": "2", "currency": {"code": "EUR"}}},
+            {"id": 2, "operationAmount": {"amount": "3", "currency": {"code": "USD"}}},
+            Transaction(id=3, amount="100", currency_code="RUB"),
+            {"id": 4, "operationAmount": {"amount": "1", "currency": {"code": "USD"}}},
+        ]
+
+        async def feed():  # type: ignore[no-untyped-def]
+            for transaction in transactions:
+                yield transaction
+
+        async def collect():  # type: ignore[no-untyped-def]
+            return [(t.get("id"), amount) async for t, amount in convert_transactions_async(feed())]
+
+        result = asyncio.run(collect())
+        self.assertEqual(result, [(3, 100.0), (2, 270.0), (4, 90.0), (1, 200.0)])
+        self.assertEqual(len(self.server.requests), 2)
+
+    # Реальный файл: пустая запись выдаётся с 0.0, курс для пустого кода валюты не запрашивается
+    def test_convert_transactions_async_operations(self):  # type: ignore[no-untyped-def]
+        operations = load_transactions("data/operations.json")
+
+        async def collect():  # type: ignore[no-untyped-def]
+            return [(t, amount) async for t, amount in convert_transactions_async(operations)]
+
+        result = asyncio.run(collect())
+        self.assertEqual(len(result), len(operations))
+        self.assertIn(({}, 0.0), result)
+        self.assertEqual(self.server.requests, [{"source": "USD", "currencies": "RUB"}])
+
+    # Одновременные запросы одного курса из разных потоков уходят в API один раз
+    def test_concurrent_requests_coalesced(self):  # type: ignore[no-untyped-def]
+        self.server.slow = {"USD": 0.3}
+        before = coalescing_stats()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_currency_rate("USD"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        after = coalescing_stats()
+        self.assertEqual(results, [90.0] * 8)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(after["calls"] - before["calls"], 1)
+        self.assertEqual(after["coalesced"] - before["coalesced"], 7)
+
+    # Ограничитель растягивает поток запросов во времени
+    def test_rate_limit(self):  # type: ignore[no-untyped-def]
+        limiter = enable_rate_limit(rate=20, burst=1)
+        start = time.perf_counter()
+        for code in ["USD", "EUR", "CNY"]:
+            get_currency_rate(code)
+        elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertEqual(limiter.stats()["acquired"], 3)
+        self.assertEqual(limiter.stats()["waited"], 2)
+        self.assertEqual(len(self.server.requests), 3)
+
+    # Исторические курсы: один запрос на день, повторная конвертация — без сети
+    def test_convert_transactions_at_date(self):  # type: ignore[no-untyped-def]
+        self.server.history = {
+            "2019-07-01": {"RUB": 1.0, "USD": 63.0, "EUR": 71.0},
+            "2019-07-03": {"RUB": 1.0, "USD": 64.0, "EUR": 72.0},
+        }
+        transactions = [
+            {"date": "2019-07-01T10:00:00", "operationAmount": {"amount": "2", "currency": {"code": "USD"}}},
+            {"date": "2019-07-03T11:00:00", "operationAmount": {"amount": "1", "currency": {"code": "EUR"}}},
+            Transaction(date="2019-07-03T12:00:00", amount="3", currency_code="USD"),
+            {"date": "2019-07-03T13:00:00", "operationAmount": {"amount": "5", "currency": {"code": "RUB"}}},
+            {"operationAmount": {"amount": "5", "currency": {"code": "USD"}}},
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "rates.bin")
+            history = get_rate_history(path)
+            self.assertIs(get_rate_history(path), history)
+
+            with patch("builtins.print"):
+                self.assertEqual(convert_transactions_at_date(transactions, history), [126.0, 72.0, 192.0, 5.0, 0.0])
+            self.assertEqual(
+                [(request["date"], request["currencies"]) for request in self.server.requests],
+                [("2019-07-01", "USD"), ("2019-07-03", "EUR,USD")],
+            )
+
+            # Таблица сохранена в файл: новая загрузка отвечает без запросов к API
+            with patch("builtins.print"):
+                result = convert_transactions_at_date(transactions, RateHistory.load(path))
+            self.assertEqual(result, [126.0, 72.0, 192.0, 5.0, 0.0])
+            self.assertEqual(len(self.server.requests), 2)
+
+        # Без запросов к API берётся курс ближайшего предыдущего дня
+        later = [{"date": "2019-07-06T00:00:00", "operationAmount": {"amount": "1", "currency": {"code": "USD"}}}]
+        self.assertEqual(convert_transactions_at_date(later, history, fetch_missing=False), [64.0])
+        self.assertEqual(get_historical_rates("2019-07-01", ["RUB", "USD"]), {"RUB": 1.0, "USD": 63.0})
+
+    # Реальный файл: пустая запись даёт 0.0, курсы запрашиваются только для известных валют
+    def test_convert_transactions_at_date_operations(self):  # type: ignore[no-untyped-def]
+        operations = load_transactions("data/operations.json")
+        result = convert_transactions_at_date(operations, RateHistory())
+
+        self.assertEqual(len(result), len(operations))
+        self.assertEqual(result[operations.index({})], 0.0)
+        self.assertEqual({request["currencies"] for request in self.server.requests}, {"USD"})
+        for transaction, amount in zip(operations, result):
+            if external_api.currency_code(transaction) == "RUB":
+                self.assertEqual(amount, float(transaction["operationAmount"]["amount"]))
+
+    # Некорректная дата не прерывает конвертацию: запись даёт 0.0, курс для неё не запрашивается
+    def test_convert_transactions_at_date_bad_date(self):  # type: ignore[no-untyped-def]
+        self.server.history = {"2019-07-01": {"RUB": 1.0, "USD": 63.0}}
+        transactions = [
+            {"date": "garbage", "operationAmount": {"amount": "1", "currency": {"code": "USD"}}},
+            {"date": "2019-07-01T10:00:00", "operationAmount": {"amount": "2", "currency": {"code": "USD"}}},
+        ]
+
+        with patch("builtins.print"):
+            self.assertEqual(convert_transactions_at_date(transactions, RateHistory()), [0.0, 126.0])
+        self.assertEqual([request["date"] for request in self.server.requests], ["2019-07-01"])
+
+    # Неудачный запрос курса запоминается и не повторяется при следующей конвертации
+    def test_convert_transactions_at_date_failed_not_refetched(self):  # type: ignore[no-untyped-def]
+        self.server.failing = ["EUR"]
+        history = RateHistory()
+        transactions = [
+            {"date": "2019-07-01T10:00:00", "operationAmount": {"amount": "1", "currency": {"code": "EUR"}}},
+        ]
+
+        with patch("builtins.print"):
+            self.assertEqual(convert_transactions_at_date(transactions, history), [0.0])
+            self.assertEqual(convert_transactions_at_date(transactions, history), [0.0])
+        self.assertEqual(len(self.server.requests), external_api.RETRIES + 1)
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from src.fileio import atomic_write
+
+
+def test_atomic_write_replaces_file(tmp_path):  # type: ignore[no-untyped-def]
+    path = tmp_path / "data.txt"
+    path.write_text("old", encoding="utf-8")
+
+    with atomic_write(str(path), encoding="utf-8") as file:
+        file.write("new")
+
+    assert path.read_text(encoding="utf-8") == "new"
+    assert os.listdir(tmp_path) == ["data.txt"]
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):  # type: ignore[no-untyped-def]
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path), "wb") as file:
+            file.write(b"partial")
+            raise RuntimeError("сбой")
+
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["data.bin"]
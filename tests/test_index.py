@@ -0,0 +1,70 @@
+from typing import Dict, List
+
+import pytest
+
+from src.generators import filter_by_currency
+from src.index import TransactionIndex
+from src.processing import filter_by_state, sort_by_date
+from src.transaction import Transaction
+
+
+def test_index_matches_scans(operations: List[Dict]) -> None:
+    index = TransactionIndex(operations)
+
+    for state in ("EXECUTED", "CANCELED", "PENDING"):
+        assert filter_by_state(operations, state, index=index) == filter_by_state(operations, state)
+    for code in ("USD", "RUB", "EUR"):
+        assert list(filter_by_currency(operations, code, index=index)) == list(filter_by_currency(operations, code))
+    for reverse in (True, False):
+        assert sort_by_date(operations, reverse, index=index) == sort_by_date(operations, reverse)
+        assert sort_by_date(operations, reverse, index=index, limit=20) == sort_by_date(operations, reverse)[:20]
+
+
+def test_between(transactions: List[Dict]) -> None:
+    index = TransactionIndex(transactions)
+
+    assert [t["id"] for t in index.between("2018-08-01", "2019-03-31")] == [895315941, 594226727, 873106923]
+    assert [t["id"] for t in index.between(start="2019")] == [873106923, 142264268]
+    assert [t["id"] for t in index.between(end="2018-07")] == [939719570]
+    assert index.between("2020", "2021") == []
+    assert index.between() == sort_by_date(transactions, reverse=False)
+
+
+def test_equal_dates_keep_original_order() -> None:
+    transactions: List[Dict] = [{"id": 1, "date": "2019"}, {"id": 2}, {"id": 3, "date": "2019"}, {"id": 4}]
+    index = TransactionIndex(transactions)
+
+    for reverse in (True, False):
+        assert sort_by_date(transactions, reverse, index=index) == sort_by_date(transactions, reverse)
+
+
+def test_index_over_records(transactions: List[Dict]) -> None:
+    records = [Transaction.from_dict(transaction) for transaction in transactions]
+    index = TransactionIndex(records)
+
+    assert index.by_currency("RUB") == [records[2], records[4]]
+    assert index.by_state("CANCELED") == [records[4]]
+
+
+def test_index_from_other_list_is_rejected(transactions: List[Dict]) -> None:
+    index = TransactionIndex(transactions)
+
+    with pytest.raises(ValueError):
+        filter_by_state(list(transactions), index=index)
+    with pytest.raises(ValueError):
+        list(filter_by_currency(transactions[:2], "USD", index=index))
+
+
+def test_index_over_changed_list_is_rejected(transactions: List[Dict]) -> None:
+    source = list(transactions)
+    index = TransactionIndex(source)
+    source.append(transactions[0])
+
+    with pytest.raises(ValueError):
+        filter_by_state(source, index=index)
+    with pytest.raises(ValueError):
+        sort_by_date(source, index=index)
+
+    del source[-1]
+    index.extend([transactions[1]])
+    assert filter_by_state(source, index=index) == filter_by_state(source)
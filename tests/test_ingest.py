@@ -0,0 +1,173 @@
+import json
+import os
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from src.aggregation import Aggregator, aggregate
+from src.index import TransactionIndex
+from src.ingest import IncrementalLoader, state_path
+from src.utils import load_transactions
+
+
+def _write(path: str, transactions: List[Dict]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(transactions, file, ensure_ascii=False, indent=4)
+
+
+def _append(path: str, transactions: List[Dict]) -> None:
+    """Дописывает записи в массив так, как это делает писатель: заменяет закрывающую скобку."""
+    with open(path, "rb+") as file:
+        data = file.read()
+        end = data.rstrip().rindex(b"]")
+        file.seek(end)
+        items = ",\n".join(json.dumps(item, ensure_ascii=False) for item in transactions).encode("utf-8")
+        file.write((b",\n" if data[:end].strip() != b"[" else b"") + items + b"\n]")
+        file.truncate()
+
+
+def _loader(path: str, index: Optional[TransactionIndex] = None) -> IncrementalLoader:
+    return IncrementalLoader(path, [Aggregator(["state", "currency"], ["count", "sum_amount"])], index=index)
+
+
+def test_only_new_records_are_parsed(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions[:3])
+    index = TransactionIndex([])
+    loader = IncrementalLoader(path, [Aggregator(["state", "currency"], ["count", "sum_amount"])], index=index)
+
+    assert loader.poll() == transactions[:3]
+    assert loader.poll() == []
+
+    _append(path, transactions[3:])
+    assert loader.poll() == transactions[3:]
+    assert loader.count == 5
+    assert loader.last_id == transactions[-1]["id"]
+    assert loader.aggregators[0].result() == aggregate(transactions, ["state", "currency"], ["count", "sum_amount"])
+    assert index.transactions == transactions
+    assert index.by_state("CANCELED") == [transactions[4]]
+
+
+def test_state_survives_restart(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions[:2])
+    _loader(path).poll()
+    assert os.path.exists(state_path(path))
+
+    _append(path, transactions[2:])
+    restarted = _loader(path)
+    assert restarted.count == 2
+    assert restarted.poll() == transactions[2:]
+    assert restarted.aggregators[0].result() == aggregate(transactions, ["state", "currency"], ["count", "sum_amount"])
+
+
+def test_index_rebuilt_after_restart(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions[:2])
+    _loader(path).poll()
+
+    _append(path, transactions[2:])
+    index = TransactionIndex([])
+    restarted = _loader(path, index)
+    assert restarted.poll() == transactions[2:]
+    assert index.transactions == transactions
+    assert index.by_state("CANCELED") == [transactions[4]]
+
+    # Непустой индекс, не совпадающий с состоянием, — ошибка, а не молча неполные запросы
+    with pytest.raises(ValueError):
+        _loader(path, TransactionIndex(transactions[:1]))
+
+
+def test_unfinished_record_waits(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions[:1])
+    loader = _loader(path)
+    loader.poll()
+
+    full = json.dumps(transactions[1], ensure_ascii=False).encode("utf-8")
+    with open(path, "rb+") as file:
+        data = file.read()
+        file.seek(data.rindex(b"]"))
+        file.write(b",\n" + full[:40])
+        file.truncate()
+    with patch("src.ingest.logger") as mock_logger:
+        assert loader.poll() == []
+    mock_logger.error.assert_not_called()
+
+    with open(path, "ab") as file:
+        file.write(full[40:] + b"\n]")
+    assert loader.poll() == [transactions[1]]
+
+
+@pytest.mark.parametrize("text", ['[{"id":1},{"id":2,}, {"id":3}]', '[{"id":1},{"id":2,}', '[{"id":1},{"id": tru}'])
+def test_corrupt_record_is_reported(tmp_path, text):  # type: ignore[no-untyped-def]
+    path = tmp_path / "operations.json"
+    path.write_text(text, encoding="utf-8")
+    loader = _loader(str(path))
+
+    with patch("src.ingest.logger") as mock_logger:
+        assert loader.poll() == [{"id": 1}]
+    mock_logger.error.assert_called_once()
+
+
+def test_rewritten_file_is_read_again(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions)
+    index = TransactionIndex([])
+    loader = IncrementalLoader(path, [Aggregator(["state"])], index=index)
+    loader.poll()
+
+    _write(path, transactions[3:])
+    assert loader.poll() == transactions[3:]
+    assert loader.count == 2
+    assert loader.aggregators[0].result() == {("EXECUTED",): {"count": 1}, ("CANCELED",): {"count": 1}}
+    assert index.transactions == transactions[3:]
+
+
+def test_index_clear_keeps_source_list(transactions: List[Dict]) -> None:
+    source = list(transactions)
+    index = TransactionIndex(source)
+    index.clear()
+
+    assert source == transactions
+    assert len(index) == 0
+    assert index.by_state("EXECUTED") == []
+    index.extend(transactions[:1])
+    assert index.transactions == transactions[:1]
+    assert source == transactions
+
+
+def test_changed_or_broken_state_starts_over(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "operations.json")
+    _write(path, transactions)
+    _loader(path).poll()
+
+    other = IncrementalLoader(path, [Aggregator(["month"])])
+    assert len(other.poll()) == 5
+
+    with open(state_path(path), "w", encoding="utf-8") as file:
+        file.write("{broken")
+    assert len(_loader(path).poll()) == 5
+
+
+def test_index_extend_matches_rebuild() -> None:
+    operations = load_transactions("data/operations.json")
+    index = TransactionIndex(operations[:30])
+    index.sorted_by_date()
+    for start in range(30, len(operations), 25):
+        index.extend(operations[start : start + 25])
+
+    rebuilt = TransactionIndex(index.transactions)
+    for reverse in (True, False):
+        assert index.sorted_by_date(reverse) == rebuilt.sorted_by_date(reverse)
+    assert index.by_state("EXECUTED") == rebuilt.by_state("EXECUTED")
+    assert index.by_currency("USD") == rebuilt.by_currency("USD")
+    assert index.between("2019-01", "2019-06") == rebuilt.between("2019-01", "2019-06")
+
+
+def test_aggregator_round_trip(transactions: List[Dict]) -> None:
+    aggregator = Aggregator(["currency", "month"], ["count", "min_amount", "avg_amount"]).update(transactions)
+    restored = Aggregator.from_dict(json.loads(json.dumps(aggregator.to_dict())))
+
+    assert restored.result() == aggregator.result()
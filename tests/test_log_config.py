@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+
+from src import log_config
+from src.log_config import configure_logging, flush_logs, get_logger
+from src.masks import get_mask_account
+
+
+@pytest.fixture
+def logs_dir(tmp_path):  # type: ignore[no-untyped-def]
+    previous = log_config._logs_dir
+    directory = tmp_path / "logs"
+    configure_logging(logs_dir=str(directory))
+    yield directory
+    # Возвращаем каталог сессии из conftest, а не logs/ проекта
+    configure_logging(level="DEBUG", logs_dir=previous)
+
+
+class _CountingArg:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "arg"
+
+
+def test_get_logger_has_no_side_effects(logs_dir):  # type: ignore[no-untyped-def]
+    get_logger("tests.quiet", "quiet.log")
+    assert not logs_dir.exists()
+
+
+def test_records_are_written_in_background(logs_dir):  # type: ignore[no-untyped-def]
+    get_mask_account("35383033474447895560")
+    flush_logs()
+
+    content = (logs_dir / "masks.log").read_text(encoding="utf-8")
+    assert "[DEBUG] masks - Вызов функции get_mask_account с аргументом: 35383033474447895560" in content
+    assert "[INFO] masks - Маскированный номер счета: **5560" in content
+
+
+def test_log_file_is_appended_not_truncated(logs_dir):  # type: ignore[no-untyped-def]
+    logger = get_logger("tests.append", "append.log")
+    logger.info("первая запись")
+    flush_logs()
+    logger.info("вторая запись")
+    flush_logs()
+
+    content = (logs_dir / "append.log").read_text(encoding="utf-8")
+    assert "первая запись" in content and "вторая запись" in content
+
+
+def test_level_skips_debug_formatting(logs_dir):  # type: ignore[no-untyped-def]
+    logger = get_logger("tests.level", "level.log")
+    debug_arg, info_arg = _CountingArg(), _CountingArg()
+
+    configure_logging(level="INFO")
+    logger.debug("отладка %s", debug_arg)
+    logger.info("информация %s", info_arg)
+    flush_logs()
+
+    assert debug_arg.calls == 0
+    assert info_arg.calls >= 1
+    content = (logs_dir / "level.log").read_text(encoding="utf-8")
+    assert "отладка" not in content and "информация arg" in content
+    assert logging.getLogger("src.masks").level == logging.INFO
@@ -1,6 +1,8 @@
+import logging
+
 import pytest
 
-from src.masks import get_mask_account, get_mask_card_number
+from src.masks import get_mask_account, get_mask_card_number, mask_accounts, mask_card_numbers
 
 
 @pytest.mark.parametrize(
@@ -38,3 +40,56 @@ def test_get_mask_account(string_account: str, expected_result_account: str):  #
 def test_get_mask_account_wrong(wrong_data_account):  # type: ignore[no-untyped-def]
     with pytest.raises(ValueError):
         get_mask_account(wrong_data_account)
+
+
+BATCH_CARDS = [
+    "1234567890123",
+    "1234567890123455",
+    "123456789012345",
+    "1234-5678-9012-3459",
+    "123456789012345678",
+    "1234567890123456789",
+    "Visa Platinum 8990922113665229",
+    "1234 5678 9012 3458",
+    "12３4567890123456",
+    "¹234567890123456",
+    "1234๐567 9012x3456",
+]
+
+BATCH_ACCOUNTS = [
+    "35383033474447895560",
+    "Счет 73654108430135874305",
+    "7365 4108 4301 3587 43０5",
+    "²7365410843013587430",
+]
+
+
+def test_mask_card_numbers_matches_single():  # type: ignore[no-untyped-def]
+    assert mask_card_numbers(BATCH_CARDS) == [get_mask_card_number(card) for card in BATCH_CARDS]
+
+
+def test_mask_accounts_matches_single():  # type: ignore[no-untyped-def]
+    assert mask_accounts(iter(BATCH_ACCOUNTS)) == [get_mask_account(account) for account in BATCH_ACCOUNTS]
+
+
+@pytest.mark.parametrize("wrong_data_card", [123456789012, "12345678901234567890", None, ""])
+def test_mask_card_numbers_wrong(wrong_data_card):  # type: ignore[no-untyped-def]
+    with pytest.raises(ValueError):
+        mask_card_numbers(["1234567890123456", wrong_data_card])
+
+
+@pytest.mark.parametrize("wrong_data_account", [7365410843013587, "", None])
+def test_mask_accounts_wrong(wrong_data_account):  # type: ignore[no-untyped-def]
+    with pytest.raises(ValueError):
+        mask_accounts(["35383033474447895560", wrong_data_account])
+
+
+def test_batch_logs_single_line(caplog):  # type: ignore[no-untyped-def]
+    with caplog.at_level(logging.DEBUG, logger="src.masks"):
+        mask_card_numbers(["1234567890123456"] * 100)
+        mask_accounts(["35383033474447895560"] * 100)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Замаскировано номеров карт: 100",
+        "Замаскировано номеров счетов: 100",
+    ]
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.metrics import BUCKET_COUNT, FunctionStats, MetricsRegistry
+
+
+@pytest.mark.parametrize(
+    "elapsed_ns, bucket",
+    [(0, 0), (1000, 0), (1001, 1), (2000, 1), (2001, 2), (4000, 2), (1_500_000, 11), (10**12, BUCKET_COUNT)],
+)
+def test_record_bucket(elapsed_ns, bucket):  # type: ignore[no-untyped-def]
+    stats = FunctionStats("f")
+    stats.record(elapsed_ns)
+    assert stats.buckets[bucket] == 1
+    assert sum(stats.buckets) == 1
+
+
+def test_percentiles() -> None:
+    stats = FunctionStats("f")
+    assert stats.percentile(0.5) is None
+    for _ in range(98):
+        stats.record(3_000)  # корзина <= 4 мкс
+    stats.record(900_000)  # <= 1024 мкс
+    stats.record(10**12)  # +Inf
+    assert stats.percentile(0.5) == 4e-6
+    assert stats.percentile(0.99) == 1.024e-3
+    assert stats.percentile(1.0) == float("inf")
+
+
+def test_reset_keeps_stats_objects() -> None:
+    registry = MetricsRegistry()
+    stats = registry.stats("f")
+    stats.record(5_000, failed=True)
+    registry.reset()
+    assert registry.stats("f") is stats
+    assert (stats.calls, stats.errors, stats.total_ns, sum(stats.buckets)) == (0, 0, 0, 0)
+
+
+def test_json_export(tmp_path):  # type: ignore[no-untyped-def]
+    registry = MetricsRegistry()
+    registry.stats("f").record(1_500)
+    registry.stats("f").record(3_000, failed=True)
+
+    path = tmp_path / "metrics.json"
+    registry.write_json(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    assert data["f"]["calls"] == 2
+    assert data["f"]["errors"] == 1
+    assert data["f"]["total_seconds"] == pytest.approx(4.5e-6)
+    assert data["f"]["buckets"] == {"2e-06": 1, "4e-06": 1}
+    assert data["f"]["p50_seconds"] == 2e-6
+    assert data["f"]["p99_seconds"] == 4e-6
+
+
+def test_prometheus_export(tmp_path):  # type: ignore[no-untyped-def]
+    registry = MetricsRegistry()
+    registry.stats('mod."f"').record(1_500)
+    registry.stats('mod."f"').record(3_000, failed=True)
+
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    label = 'function="mod.\\"f\\""'
+    assert "# TYPE homework_function_duration_seconds histogram" in lines
+    assert f'homework_function_duration_seconds_bucket{{{label},le="1e-06"}} 0' in lines
+    assert f'homework_function_duration_seconds_bucket{{{label},le="2e-06"}} 1' in lines
+    assert f'homework_function_duration_seconds_bucket{{{label},le="4e-06"}} 2' in lines
+    assert f'homework_function_duration_seconds_bucket{{{label},le="+Inf"}} 2' in lines
+    assert f"homework_function_duration_seconds_count{{{label}}} 2" in lines
+    assert f"homework_function_errors_total{{{label}}} 1" in lines
+    assert list(tmp_path.iterdir()) == [path]
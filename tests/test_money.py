@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import pytest
+
+from src.money import Money, multiply_minor, rate_ratio, to_minor
+
+
+@pytest.mark.parametrize(
+    "amount, minor",
+    [
+        ("9824.07", 982407),
+        ("67314.70", 6731470),
+        ("-0.5", -50),
+        ("+3", 300),
+        (" 7 ", 700),
+        ("1.005", 101),
+        ("1.004", 100),
+        ("-1.005", -101),
+        ("1e2", 10000),
+        (12, 1200),
+        (12.5, 1250),
+        (0.1 + 0.2, 30),
+        (Decimal("2.345"), 235),
+    ],
+)
+def test_to_minor(amount, minor):  # type: ignore[no-untyped-def]
+    assert to_minor(amount) == minor
+
+
+@pytest.mark.parametrize("amount", ["", "abc", "1.2.3", "NaN", "inf", True])
+def test_to_minor_invalid(amount):  # type: ignore[no-untyped-def]
+    with pytest.raises(ValueError):
+        to_minor(amount)
+
+
+def test_rate_ratio_and_multiply() -> None:
+    assert rate_ratio(90.12) == (2253, 25)
+    assert rate_ratio(2) == (2, 1)
+    # Половина округляется от нуля
+    assert multiply_minor([1, -1, 3, 10], 0.5) == [1, -1, 2, 5]
+    assert multiply_minor([100, 7], 3) == [300, 21]
+
+
+def test_convert_and_arithmetic() -> None:
+    usd = Money.parse("100.01", "USD")
+    assert usd.convert(90.5) == Money(905091, "RUB")
+    assert usd.convert(1 / 3, "EUR") == Money(3334, "EUR")
+    assert usd + usd == Money(20002, "USD")
+    assert usd - Money(1, "USD") == Money(10000, "USD")
+    assert -usd == Money(-10001, "USD")
+    assert usd * 3 == 3 * usd == Money(30003, "USD")
+    assert sum([usd, usd]) == Money(20002, "USD")
+    assert Money(1, "USD") < usd <= usd
+    assert usd != Money(10001, "EUR")
+    assert len({usd, Money(10001, "USD")}) == 1
+
+
+def test_mixed_currencies_rejected() -> None:
+    with pytest.raises(ValueError):
+        Money(1, "USD") + Money(1, "EUR")
+    with pytest.raises(ValueError):
+        Money.sum([Money(1, "USD"), Money(1, "EUR")], "USD")
+    with pytest.raises(ValueError):
+        Money(1, "USD") < Money(1, "EUR")
+
+
+def test_comparison_with_other_types() -> None:
+    assert Money(1, "USD").__lt__(1) is NotImplemented
+    assert Money(1, "USD").__le__("1") is NotImplemented
+    with pytest.raises(TypeError):
+        Money(1, "USD") < 1
+    with pytest.raises(TypeError):
+        None >= Money(1, "USD")  # type: ignore[operator]
+
+
+def test_representations() -> None:
+    assert str(Money(982407, "USD")) == "9824.07"
+    assert str(Money(-5, "USD")) == "-0.05"
+    assert repr(Money(100, "RUB")) == "Money('1.00', 'RUB')"
+    assert float(Money(982407, "USD")) == 9824.07
+    assert Money(982407, "USD").amount == Decimal("9824.07")
+
+
+def test_sum_is_exact() -> None:
+    items = [Money.parse("0.10", "RUB")] * 1000
+    assert Money.sum(items, "RUB") == Money(10000, "RUB")
+    assert Money.sum(iter(items), "RUB").amount == Decimal("100.00")
+    assert Money.sum([], "RUB") == Money(0, "RUB")
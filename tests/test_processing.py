@@ -1,6 +1,10 @@
+import os
 from typing import Dict, List
 
-from src.processing import filter_by_state, sort_by_date
+import pytest
+
+from src.processing import external_sort_by_date, filter_by_state, page_key, paginate_by_date, sort_by_date
+from src.utils import iter_transactions, load_transactions
 
 
 def test_filter_by_state(transactions: List[Dict]):  # type: ignore[no-untyped-def]
@@ -180,3 +184,85 @@ def test_sort_by_date(transactions: List[Dict]):  # type: ignore[no-untyped-def]
 
     # Проверяем, что отсортированные транзакции соответствуют ожидаемым
     assert sorted_transactions_asc == expected_sorted_transactions_asc
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 10])
+def test_sort_by_date_limit(transactions: List[Dict], limit: int):  # type: ignore[no-untyped-def]
+    assert sort_by_date(transactions, limit=limit) == sort_by_date(transactions)[:limit]
+    assert sort_by_date(transactions, reverse=False, limit=limit) == sort_by_date(transactions, reverse=False)[:limit]
+
+
+def test_sort_by_date_limit_keeps_ties_stable():  # type: ignore[no-untyped-def]
+    transactions = [{"id": 1, "date": "2019"}, {"id": 2}, {"id": 3, "date": "2019"}, {"id": 4}]
+
+    assert sort_by_date(transactions, limit=2) == [{"id": 1, "date": "2019"}, {"id": 3, "date": "2019"}]
+    assert sort_by_date(transactions, reverse=False, limit=1) == [{"id": 2}]
+    assert sort_by_date(transactions, limit=0) == []
+
+
+def test_sort_by_date_limit_accepts_iterator():  # type: ignore[no-untyped-def]
+    expected = sort_by_date(load_transactions("data/operations.json"))[:20]
+    assert sort_by_date(iter_transactions("data/operations.json"), limit=20) == expected
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+def test_paginate_by_date_covers_everything_once(reverse: bool):  # type: ignore[no-untyped-def]
+    transactions = load_transactions("data/operations.json")
+    transactions += [{"id": 5, "date": "2019-08-26T10:50:58.294041"}, {"id": 1, "date": "2019-08-26T10:50:58.294041"}]
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = paginate_by_date(transactions, 7, after=cursor, reverse=reverse)
+        pages.extend(page)
+        assert len(page) <= 7
+        if cursor is None:
+            break
+
+    assert pages == sorted(transactions, key=page_key, reverse=reverse)
+
+
+def test_paginate_by_date_cursor(transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    page, cursor = paginate_by_date(transactions, 2)
+    assert [t["id"] for t in page] == [142264268, 873106923]
+    assert cursor == ("2019-03-23T01:09:46.296404", 873106923)
+
+    page, cursor = paginate_by_date(transactions, 2, after=cursor)
+    assert [t["id"] for t in page] == [594226727, 895315941]
+
+    page, cursor = paginate_by_date(transactions, 2, after=cursor)
+    assert [t["id"] for t in page] == [939719570]
+    assert cursor is None
+
+    with pytest.raises(ValueError):
+        paginate_by_date(transactions, 0)
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+@pytest.mark.parametrize("run_size", [1, 7, 1000])
+def test_external_sort_by_date(tmp_path, reverse: bool, run_size: int):  # type: ignore[no-untyped-def]
+    transactions = load_transactions("data/operations.json")
+
+    result = external_sort_by_date(
+        iter_transactions("data/operations.json"), reverse=reverse, run_size=run_size, tmp_dir=str(tmp_path)
+    )
+
+    assert list(result) == sort_by_date(transactions, reverse=reverse)
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_sort_by_date_keeps_money(tmp_path):  # type: ignore[no-untyped-def]
+    transactions = load_transactions("data/operations.json", as_money=True)
+
+    result = list(external_sort_by_date(transactions, run_size=10, tmp_dir=str(tmp_path)))
+
+    assert result == sort_by_date(transactions)
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_sort_by_date_closes_runs_early(tmp_path, transactions: List[Dict]):  # type: ignore[no-untyped-def]
+    result = external_sort_by_date(transactions, run_size=2, tmp_dir=str(tmp_path))
+
+    assert next(result) == sort_by_date(transactions)[0]
+    result.close()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,85 @@
+from typing import Dict, List
+
+import pytest
+
+from src.generators import filter_by_currency
+from src.index import TransactionIndex
+from src.processing import filter_by_state, sort_by_date
+from src.query import Query
+from src.transaction import TransactionLike
+from src.utils import iter_transactions
+
+
+def _expected(operations: List[Dict], reverse: bool, limit: int) -> List[TransactionLike]:
+    executed = filter_by_state(operations, "EXECUTED")
+    return sort_by_date(list(filter_by_currency(executed, "USD")), reverse=reverse)[:limit]
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+def test_query_matches_chained_functions(operations: List[Dict], reverse: bool) -> None:
+    query = Query(operations).where(state="EXECUTED").currency("USD").order_by_date(reverse).limit(10)
+    indexed = Query(operations, TransactionIndex(operations)).where(state="EXECUTED").currency("USD")
+
+    assert query.all() == _expected(operations, reverse, 10)
+    assert indexed.order_by_date(reverse).limit(10).all() == _expected(operations, reverse, 10)
+
+
+def test_query_is_lazy_and_immutable(transactions: List[Dict]) -> None:
+    base = Query(transactions).where(state="EXECUTED")
+    usd = base.currency("USD")
+
+    transactions.append({"id": 1, "state": "EXECUTED", "operationAmount": {"currency": {"code": "USD"}}})
+
+    assert [t["id"] for t in usd] == [939719570, 142264268, 895315941, 1]
+    assert len(base.all()) == 5
+
+
+def test_query_limit_without_order(transactions: List[Dict]) -> None:
+    assert Query(transactions).currency("USD").limit(2).all() == transactions[:2]
+    assert "остановка после 2 совпадений" in Query(transactions).limit(2).explain()
+
+
+def test_query_between(operations: List[Dict]) -> None:
+    index = TransactionIndex(operations)
+    expected = [t for t in operations if "2019-01-01" <= t.get("date", "") <= "2019-06-30"]
+
+    assert Query(operations).between("2019-01-01", "2019-06-30").all() == expected
+    assert Query(operations, index).between("2019-01-01", "2019-06-30").all() == expected
+
+
+def test_query_over_iterator(operations: List[Dict]) -> None:
+    query = Query(iter_transactions("data/operations.json")).where(state="EXECUTED").currency("USD")
+
+    assert query.order_by_date().limit(5).all() == _expected(operations, True, 5)
+
+
+def test_explain_full_scan(transactions: List[Dict]) -> None:
+    plan = Query(transactions).where(state="EXECUTED").currency("USD").order_by_date().limit(10).explain()
+
+    assert plan == (
+        "1. полный проход по транзакциям\n"
+        "2. фильтр за один проход: state = 'EXECUTED' AND currency = 'USD'\n"
+        "3. top-10 по дате через кучу (убывание)"
+    )
+
+
+def test_explain_uses_most_selective_index(transactions: List[Dict]) -> None:
+    index = TransactionIndex(transactions)
+
+    plan = Query(transactions, index).where(state="EXECUTED").currency("RUB").order_by_date().explain()
+    assert plan.splitlines() == [
+        "1. поиск по индексу: валюта (2 из 5 транзакций)",
+        "2. фильтр за один проход: state = 'EXECUTED'",
+        "3. сортировка по дате (убывание)",
+    ]
+
+    plan = Query(transactions, index).order_by_date(reverse=False).limit(3).explain()
+    assert plan.splitlines() == ["1. готовый порядок индекса по дате (возрастание)", "2. первые 3"]
+    assert Query(transactions, index).order_by_date(reverse=False).limit(3).all() == sort_by_date(
+        transactions, reverse=False
+    )[:3]
+
+
+def test_index_from_other_list_is_rejected(transactions: List[Dict]) -> None:
+    with pytest.raises(ValueError):
+        Query(list(transactions), TransactionIndex(transactions))
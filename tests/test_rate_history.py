@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from src.rate_history import RateHistory, day_number
+
+
+@pytest.fixture
+def history() -> RateHistory:
+    history = RateHistory()
+    history.update("2019-07-01", {"USD": 63.0, "EUR": 71.0})
+    history.update("2019-07-03", {"USD": 64.0, "EUR": 0.0})
+    history.set("USD", date(2019, 7, 2), 63.5)
+    return history
+
+
+def test_day_number() -> None:
+    number = date(2019, 7, 3).toordinal()
+    assert day_number("2019-07-03T18:35:29.512364") == number
+    assert day_number("2019-07-03") == number
+    assert day_number(date(2019, 7, 3)) == number
+    assert day_number(number) == number
+
+
+def test_rate_at_exact_and_previous_day(history):  # type: ignore[no-untyped-def]
+    assert history.rate_at("USD", "2019-07-02T10:00:00") == 63.5
+    assert history.rate_at("USD", "2019-07-10") == 64.0
+    # Нулевой курс EUR на 03.07 не записан — берётся 01.07
+    assert history.rate_at("EUR", "2019-07-03") == 71.0
+    assert history.rate_at("USD", "2019-06-30") is None
+    assert history.rate_at("CNY", "2019-07-03") is None
+    assert history.rate_at("RUB", "2000-01-01") == 1.0
+
+
+def test_set_replaces_rate(history):  # type: ignore[no-untyped-def]
+    history.set("USD", "2019-07-02", 99.0)
+    assert history.rate_at("USD", "2019-07-02") == 99.0
+    assert len(history) == 4
+
+
+def test_missing(history):  # type: ignore[no-untyped-def]
+    pairs = [("USD", "2019-07-03"), ("EUR", "2019-07-03"), ("EUR", "2019-07-03"), ("RUB", "2019-07-05")]
+    assert history.missing(pairs) == {date(2019, 7, 3).toordinal(): ["EUR"]}
+    assert history.has("USD", "2019-07-01")
+    assert not history.has("EUR", "2019-07-02")
+
+    history.mark_failed("EUR", "2019-07-03T12:00:00")
+    assert history.missing(pairs) == {}
+    assert history.missing([("EUR", "2019-07-04")]) == {date(2019, 7, 4).toordinal(): ["EUR"]}
+
+
+def test_save_and_load(history, tmp_path):  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "rates.bin")
+    history.save(path)
+    loaded = RateHistory.load(path)
+
+    assert loaded.path == path
+    assert loaded.currencies() == ["EUR", "USD"]
+    assert len(loaded) == len(history)
+    for day in ["2019-07-01", "2019-07-02", "2019-07-03", "2019-08-01"]:
+        assert loaded.rate_at("USD", day) == history.rate_at("USD", day)
+        assert loaded.rate_at("EUR", day) == history.rate_at("EUR", day)
+    # 4 записи: по 12 байт на запись плюс заголовки
+    assert (tmp_path / "rates.bin").stat().st_size < 100
+    assert [file.name for file in tmp_path.iterdir()] == ["rates.bin"]
+
+
+def test_load_missing_or_corrupt(tmp_path):  # type: ignore[no-untyped-def]
+    assert len(RateHistory.load(str(tmp_path / "missing.bin"))) == 0
+
+    corrupt = tmp_path / "corrupt.bin"
+    corrupt.write_bytes(b"not a rate table")
+    assert len(RateHistory.load(str(corrupt))) == 0
+
+    history = RateHistory()
+    history.set("USD", "2019-07-01", 63.0)
+    history.save(str(corrupt))
+    corrupt.write_bytes(corrupt.read_bytes()[:-4])
+    assert len(RateHistory.load(str(corrupt))) == 0
@@ -0,0 +1,100 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.metrics import REGISTRY
+from src.ratelimit import SingleFlight, TokenBucket
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch() -> float:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 90.0
+
+    results: List[float] = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("USD", fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("USD", fetch))) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()["coalesced"] < 5:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == [90.0] * 6
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 5, "in_flight": 0}
+
+
+def test_single_flight_does_not_cache_and_propagates_errors() -> None:
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("a", fail)
+    assert flight.stats() == {"calls": 3, "coalesced": 0, "in_flight": 0}
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+def test_token_bucket_burst_and_wait() -> None:
+    fake = FakeTime()
+    bucket = TokenBucket(rate=10, burst=2, clock=fake.clock, sleep=fake.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    # Корзина пуста: следующие вызовы бронируют маркеры в очередь
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.acquire() == pytest.approx(0.2)
+    assert fake.sleeps == [pytest.approx(0.1), pytest.approx(0.2)]
+
+    fake.now = 10.0  # корзина снова полна, но не больше burst
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.stats() == {"acquired": 7, "waited": 3, "wait_seconds": pytest.approx(0.4)}
+
+
+def test_token_bucket_wait_histogram() -> None:
+    fake = FakeTime()
+    bucket = TokenBucket(rate=1, clock=fake.clock, sleep=fake.sleep, stats_name="test_ratelimit.wait")
+    REGISTRY.stats("test_ratelimit.wait").reset()
+    bucket.acquire()
+    bucket.acquire()
+
+    stats = REGISTRY.stats("test_ratelimit.wait")
+    assert stats.calls == 2
+    assert stats.percentile(1.0) == pytest.approx(1.048576)
+
+
+def test_token_bucket_invalid() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0)
@@ -0,0 +1,109 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.snapshot import read_snapshot, read_source, snapshot_path, write_snapshot
+from src.utils import load_transactions
+
+
+@pytest.fixture
+def operations_file(tmp_path, transactions):  # type: ignore[no-untyped-def]
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps(transactions, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def _write(file_path, transactions):  # type: ignore[no-untyped-def]
+    source, source_key = read_source(file_path)
+    return write_snapshot(file_path, transactions, source, source_key)
+
+
+def test_snapshot_written_and_reused(operations_file, transactions):  # type: ignore[no-untyped-def]
+    assert load_transactions(operations_file, use_snapshot=True) == transactions
+    assert os.path.exists(snapshot_path(operations_file))
+
+    with patch("src.utils.json.loads") as mock_json_loads:
+        assert load_transactions(operations_file, use_snapshot=True) == transactions
+    mock_json_loads.assert_not_called()
+
+
+def test_snapshot_not_used_by_default(operations_file):  # type: ignore[no-untyped-def]
+    load_transactions(operations_file)
+    assert not os.path.exists(snapshot_path(operations_file))
+
+
+def test_stale_snapshot_falls_back_to_json(operations_file, transactions):  # type: ignore[no-untyped-def]
+    load_transactions(operations_file, use_snapshot=True)
+
+    with open(operations_file, "w", encoding="utf-8") as file:
+        json.dump(transactions[:2], file)
+
+    assert read_snapshot(operations_file) is None
+    assert load_transactions(operations_file, use_snapshot=True) == transactions[:2]
+    assert read_snapshot(operations_file) == transactions[:2]
+
+
+def test_file_rewritten_during_load(operations_file, transactions):  # type: ignore[no-untyped-def]
+    real_loads = json.loads
+
+    def loads_and_rewrite(text):  # type: ignore[no-untyped-def]
+        # Файл переписывают, пока загрузка разбирает прочитанные байты
+        with open(operations_file, "w", encoding="utf-8") as file:
+            json.dump(transactions[:1], file)
+        return real_loads(text)
+
+    with patch("src.utils.json.loads", side_effect=loads_and_rewrite):
+        assert load_transactions(operations_file, use_snapshot=True) == transactions
+
+    assert not os.path.exists(snapshot_path(operations_file))
+    assert load_transactions(operations_file, use_snapshot=True) == transactions[:1]
+    assert read_snapshot(operations_file) == transactions[:1]
+
+
+def test_same_size_and_mtime_but_different_content(operations_file, transactions):  # type: ignore[no-untyped-def]
+    load_transactions(operations_file, use_snapshot=True)
+    stat = os.stat(operations_file)
+
+    with open(operations_file, "r+", encoding="utf-8") as file:
+        content = file.read().replace("EXECUTED", "EXECUTEX", 1)
+        file.seek(0)
+        file.write(content)
+    os.utime(operations_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert read_snapshot(operations_file) is None
+
+
+@pytest.mark.parametrize("corruption", [b"", b"garbage", b"truncate"])
+def test_corrupt_snapshot_falls_back(operations_file, transactions, corruption):  # type: ignore[no-untyped-def]
+    _write(operations_file, transactions)
+    path = snapshot_path(operations_file)
+    with open(path, "rb") as file:
+        content = file.read()
+    with open(path, "wb") as file:
+        file.write(content[:-10] if corruption == b"truncate" else corruption)
+
+    assert read_snapshot(operations_file) is None
+    assert load_transactions(operations_file, use_snapshot=True) == transactions
+
+
+def test_damaged_payload_is_not_unmarshalled(operations_file, transactions):  # type: ignore[no-untyped-def]
+    _write(operations_file, transactions)
+    path = snapshot_path(operations_file)
+    with open(path, "r+b") as file:
+        content = bytearray(file.read())
+        content[-20] ^= 0xFF
+        file.seek(0)
+        file.write(content)
+
+    with patch("src.snapshot.marshal.loads") as mock_loads:
+        assert read_snapshot(operations_file) is None
+    mock_loads.assert_not_called()
+    assert load_transactions(operations_file, use_snapshot=True) == transactions
+
+
+def test_write_failure_is_soft(operations_file, transactions):  # type: ignore[no-untyped-def]
+    with patch("src.snapshot.os.replace", side_effect=OSError("read-only")):
+        assert _write(operations_file, transactions) is False
+    assert load_transactions(operations_file, use_snapshot=True) == transactions
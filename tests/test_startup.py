@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import BUDGET_MODULE, IMPORT_BUDGET_US, ROOT, cumulative_import_time
+
+MODULES = [
+    "src",
+    "src.decorators",
+    "src.external_api",
+    "src.generators",
+    "src.masks",
+    "src.processing",
+    "src.query",
+    "src.table",
+    "src.utils",
+    "src.widget",
+]
+
+CHECK_IMPORT = f"""
+import {", ".join(MODULES)}
+import src.decorators, src.log_config
+assert src.log_config._listener is None, "поток логирования запущен при импорте"
+assert not src.decorators._writers, "файл лога декоратора открыт при импорте"
+"""
+
+
+def test_import_has_no_side_effects() -> None:
+    # Свежий интерпретатор: в процессе pytest модули уже импортированы
+    result = subprocess.run([sys.executable, "-c", CHECK_IMPORT], cwd=ROOT, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ""
+
+
+# Замер времени зависит от машины и её загрузки, поэтому тест запускается только по запросу:
+# RUN_TIMING_TESTS=1 python -m pytest tests/test_startup.py
+@pytest.mark.skipif(not os.getenv("RUN_TIMING_TESTS"), reason="замер времени импорта: задайте RUN_TIMING_TESTS=1")
+def test_import_budget() -> None:
+    assert 0 < cumulative_import_time(BUDGET_MODULE) <= IMPORT_BUDGET_US
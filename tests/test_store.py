@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from src.generators import filter_by_currency
+from src.index import TransactionIndex
+from src.processing import filter_by_state, sort_by_date
+from src.store import TransactionStore
+from src.utils import load_transactions
+
+
+@pytest.fixture
+def store(operations: List[Dict]) -> Iterator[TransactionStore]:
+    with TransactionStore() as store:
+        store.import_transactions(operations, batch_size=30)
+        yield store
+
+
+def test_round_trip_keeps_records(store: TransactionStore, operations: List[Dict]) -> None:
+    assert len(store) == len(operations)
+    # В operations.json есть запись без большинства ключей — она тоже восстанавливается как была
+    assert list(store.query()) == operations
+
+
+def test_queries_match_list_functions(store: TransactionStore, operations: List[Dict]) -> None:
+    for state in ("EXECUTED", "CANCELED", "PENDING"):
+        assert list(store.filter_by_state(state)) == filter_by_state(operations, state)
+    for code in ("USD", "RUB", "EUR"):
+        assert list(store.filter_by_currency(code)) == list(filter_by_currency(operations, code))
+    for reverse in (True, False):
+        assert list(store.sort_by_date(reverse)) == sort_by_date(operations, reverse)
+        assert list(store.sort_by_date(reverse, limit=10)) == sort_by_date(operations, reverse, limit=10)
+    index = TransactionIndex(operations)
+    assert list(store.between("2018-08-01", "2019-03-31")) == index.between("2018-08-01", "2019-03-31")
+
+
+def test_combined_conditions(store: TransactionStore, operations: List[Dict]) -> None:
+    result = list(store.query(state="EXECUTED", currency="USD", start="2019", order_by_date=True, limit=3))
+    expected = [t for t in sort_by_date(filter_by_state(operations), True) if t["date"] >= "2019"]
+    assert result == list(filter_by_currency(expected, "USD"))[:3]
+
+    account = operations[0]["from"]
+    assert list(store.query(account=account)) == [t for t in operations if account in (t.get("from"), t.get("to"))]
+
+
+def test_indexes_are_used(store: TransactionStore) -> None:
+    assert "transactions_state" in " ".join(store.explain(state="EXECUTED"))
+    assert "transactions_currency" in " ".join(store.explain(currency="USD"))
+    assert "transactions_date" in " ".join(store.explain(start="2019-01", end="2019-02", order_by_date=False))
+    plan = " ".join(store.explain(account="Счет 1"))
+    assert "transactions_from" in plan and "transactions_to" in plan
+
+
+def test_import_records_money_and_json(tmp_path: Path, operations: List[Dict]) -> None:
+    path = str(tmp_path / "operations.db")
+    with TransactionStore(path) as store:
+        assert store.import_transactions(load_transactions("data/operations.json", as_records=True)) == 101
+        assert store.import_transactions(load_transactions("data/operations.json", as_money=True)) == 101
+    with TransactionStore(path) as store:
+        assert store.import_json("data/operations.json") == 101
+        assert list(store.query()) == operations * 3
@@ -0,0 +1,92 @@
+from typing import Dict, List
+
+import pytest
+
+from src.generators import filter_by_currency
+from src.money import Money
+from src.processing import filter_by_state, sort_by_date
+from src.table import MISSING_DATE, TransactionTable
+from src.utils import load_transactions
+
+
+def test_columns(transactions: List[Dict]) -> None:
+    table = TransactionTable.from_transactions(transactions)
+
+    assert len(table) == 5
+    assert table.ids.typecode == "q"
+    assert list(table.ids) == [939719570, 142264268, 873106923, 895315941, 594226727]
+    assert list(table.amounts) == [982407, 7911493, 4331834, 5688354, 6731470]
+    assert table.dates[0] == 1530324538425572
+    assert table.states.values == ["EXECUTED", "CANCELED"]
+    assert [table.currency(row) for row in range(5)] == ["USD", "USD", "RUB", "USD", "RUB"]
+
+
+def test_filters_return_selections(transactions: List[Dict]) -> None:
+    table = TransactionTable.from_transactions(transactions)
+
+    executed = table.filter_by_state("EXECUTED")
+    assert list(executed) == [0, 1, 2, 3]
+    assert list(table.filter_by_state("CANCELED")) == [4]
+    assert list(table.filter_by_state("PENDING")) == []
+
+    assert list(table.filter_by_currency("USD")) == [0, 1, 3]
+    assert list(table.filter_by_currency("RUB", selection=executed)) == [2]
+    assert list(table.filter_by_currency("EUR")) == []
+
+    rows = table.rows(table.filter_by_state("CANCELED"))
+    assert rows[0] is transactions[4]
+
+
+def test_sort_by_date(transactions: List[Dict]) -> None:
+    table = TransactionTable.from_transactions(transactions)
+
+    assert table.rows(table.sort_by_date()) == sort_by_date(transactions)
+    assert table.rows(table.sort_by_date(reverse=False)) == sort_by_date(transactions, reverse=False)
+    assert list(table.sort_by_date(selection=table.filter_by_currency("USD"))) == [1, 3, 0]
+
+
+def test_matches_list_functions_on_operations_file() -> None:
+    transactions = load_transactions("data/operations.json")
+    table = TransactionTable.from_transactions(transactions)
+
+    assert table.rows(table.filter_by_state("EXECUTED")) == filter_by_state(transactions, "EXECUTED")
+    assert table.rows(table.filter_by_state("CANCELED")) == filter_by_state(transactions, "CANCELED")
+    assert table.rows(table.filter_by_currency("USD")) == list(filter_by_currency(transactions, "USD"))
+    assert table.rows(table.sort_by_date()) == sort_by_date(transactions)
+
+
+def test_missing_fields() -> None:
+    table = TransactionTable.from_transactions([{}, {"id": 1, "date": "not a date", "state": "EXECUTED"}])
+
+    assert list(table.ids) == [0, 1]
+    assert list(table.amounts) == [0, 0]
+    assert list(table.dates) == [MISSING_DATE, MISSING_DATE]
+    assert list(table.filter_by_state()) == [1]
+    assert list(table.filter_by_currency("USD")) == []
+
+
+def test_many_distinct_values_widen_codes() -> None:
+    table = TransactionTable.from_transactions({"state": f"S{i}"} for i in range(300))
+
+    assert table.states.codes.typecode == "H"
+    assert list(table.filter_by_state("S299")) == [299]
+    assert table.state(0) == "S0"
+
+
+def test_without_records(transactions: List[Dict]) -> None:
+    table = TransactionTable.from_transactions(transactions, keep_records=False)
+
+    assert len(table) == 5
+    assert list(table.sort_by_date(selection=table.filter_by_state("EXECUTED"))) == [1, 2, 3, 0]
+    with pytest.raises(ValueError):
+        table.rows()
+
+
+def test_money_amounts(transactions: List[Dict]) -> None:
+    with_money = [
+        {**t, "operationAmount": {**t["operationAmount"], "amount": Money.parse(t["operationAmount"]["amount"], "")}}
+        for t in transactions
+    ]
+    assert TransactionTable.from_transactions(with_money).amounts == TransactionTable.from_transactions(
+        transactions
+    ).amounts
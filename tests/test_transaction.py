@@ -0,0 +1,72 @@
+import sys
+from typing import Dict, Iterable, List
+
+import pytest
+
+from src.generators import filter_by_currency, transaction_descriptions
+from src.processing import filter_by_state, sort_by_date
+from src.transaction import Transaction, TransactionLike
+from src.utils import load_transactions
+
+
+def test_from_dict_flattens_fields(transactions: List[Dict]) -> None:
+    record = Transaction.from_dict(transactions[0])
+
+    assert record.id == 939719570
+    assert record.amount == "9824.07"
+    assert record.currency_name == "USD"
+    assert record.currency_code == "USD"
+    assert record.from_ == "Счет 75106830613657916952"
+    assert not hasattr(record, "__dict__")
+
+
+def test_round_trip(transactions: List[Dict]) -> None:
+    for transaction in load_transactions("data/operations.json") + transactions:
+        assert Transaction.from_dict(transaction).to_dict() == transaction
+
+
+def test_dict_style_access(transactions: List[Dict]) -> None:
+    record = Transaction.from_dict(transactions[0])
+
+    assert record["state"] == "EXECUTED"
+    assert record["from"] == "Счет 75106830613657916952"
+    assert record["operationAmount"] == transactions[0]["operationAmount"]
+    assert record.get("unknown", "default") == "default"
+    assert "description" in record
+
+    no_from = Transaction.from_dict({"id": 1})
+    assert "from" not in no_from
+    assert no_from.get("date", "") == ""
+    with pytest.raises(KeyError):
+        no_from["from"]
+
+
+def _to_dicts(records: Iterable[TransactionLike]) -> List[Dict]:
+    return [record.to_dict() if isinstance(record, Transaction) else record for record in records]
+
+
+def test_functions_accept_records(transactions: List[Dict]) -> None:
+    records = [Transaction.from_dict(transaction) for transaction in transactions]
+
+    assert _to_dicts(filter_by_state(records, "CANCELED")) == filter_by_state(transactions, "CANCELED")
+    assert _to_dicts(sort_by_date(records)) == sort_by_date(transactions)
+    assert _to_dicts(filter_by_currency(records, "USD")) == list(filter_by_currency(transactions, "USD"))
+    assert list(transaction_descriptions(records)) == list(transaction_descriptions(transactions))
+
+
+def test_load_transactions_as_records() -> None:
+    transactions = load_transactions("data/operations.json")
+    records = load_transactions("data/operations.json", as_records=True)
+
+    assert all(isinstance(record, Transaction) for record in records)
+    assert [record.to_dict() for record in records] == transactions
+
+
+def test_record_is_smaller_than_nested_dicts(transactions: List[Dict]) -> None:
+    transaction = transactions[0]
+    dict_size = (
+        sys.getsizeof(transaction)
+        + sys.getsizeof(transaction["operationAmount"])
+        + sys.getsizeof(transaction["operationAmount"]["currency"])
+    )
+    assert sys.getsizeof(Transaction.from_dict(transaction)) < dict_size / 3
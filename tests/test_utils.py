@@ -1,7 +1,25 @@
+import io
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch
 
-from src.utils import load_transactions
+from src.generators import filter_by_currency
+from src.money import Money
+from src.processing import filter_by_state, sort_by_date
+from src.utils import (
+    _ChunkReader,
+    _parse_range,
+    _split_ranges,
+    iter_jsonl,
+    iter_transactions,
+    json_to_jsonl,
+    load_jsonl,
+    load_transactions,
+    load_transactions_many,
+    write_jsonl,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -34,3 +52,242 @@ class TestUtils(unittest.TestCase):
     def test_non_list_json_returns_empty_list(self, mock_file, mock_exists):  # type: ignore[no-untyped-def]
         result = load_transactions("data/operations.json")
         self.assertEqual(result, [])
+
+
+class TestIterTransactions(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, text: str) -> str:
+        path = os.path.join(self.tmp_dir.name, "operations.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_matches_load_transactions(self):  # type: ignore[no-untyped-def]
+        result = list(iter_transactions("data/operations.json"))
+        self.assertEqual(result, load_transactions("data/operations.json"))
+
+    def test_small_chunks_split_records(self):  # type: ignore[no-untyped-def]
+        path = self._write('[ {"id": 1, "state": "EXECUTED"},\n {"id": 22, "text": "a, ] b"} , 12345 ]')
+        result = list(iter_transactions(path, chunk_size=3))
+        self.assertEqual(result, [{"id": 1, "state": "EXECUTED"}, {"id": 22, "text": "a, ] b"}, 12345])
+
+    def test_empty_list(self):  # type: ignore[no-untyped-def]
+        path = self._write("  [ ]  ")
+        self.assertEqual(list(iter_transactions(path)), [])
+
+    def test_file_not_found_returns_empty_iterator(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(list(iter_transactions("nonexistent.json")), [])
+
+    def test_non_list_json_returns_empty_iterator(self):  # type: ignore[no-untyped-def]
+        path = self._write('{"key": "value"}')
+        self.assertEqual(list(iter_transactions(path)), [])
+
+    def test_broken_json_stops_iteration(self):  # type: ignore[no-untyped-def]
+        path = self._write('[{"id": 1}, {"id": 2}, {"id": ')
+        self.assertEqual(list(iter_transactions(path, chunk_size=4)), [{"id": 1}, {"id": 2}])
+
+    # Ошибка в середине буфера — повреждённая запись: остаток файла не дочитывается
+    def test_corrupt_record_does_not_read_rest_of_file(self):  # type: ignore[no-untyped-def]
+        reader = _ChunkReader(io.StringIO('{"id": 1, "x": ?, "y": 2}' + " " * 1000 + "]"), chunk_size=100)
+        with self.assertRaises(json.JSONDecodeError):
+            reader.decode_value()
+        self.assertFalse(reader.eof)
+
+    @patch("src.utils.MAX_RECORD_SIZE", 100)
+    def test_record_size_is_limited(self):  # type: ignore[no-untyped-def]
+        path = self._write('[{"id": 1}, {"id": "' + "x" * 10_000 + '"}]')
+        with open(path, encoding="utf-8") as file:
+            reader = _ChunkReader(file, chunk_size=16)
+            reader.next_char()
+            reader.pos += 1
+            self.assertEqual(reader.decode_value(), {"id": 1})
+            reader.pos = reader.buffer.index(",", reader.pos) + 1
+            with self.assertRaises(json.JSONDecodeError):
+                reader.decode_value()
+            self.assertFalse(reader.eof)
+        self.assertEqual(list(iter_transactions(path, chunk_size=16)), [{"id": 1}])
+
+    def test_missing_separator_stops_iteration(self):  # type: ignore[no-untyped-def]
+        path = self._write('[{"id": 1} {"id": 2}]')
+        self.assertEqual(list(iter_transactions(path)), [{"id": 1}])
+
+    def test_non_string_path_raises_type_error(self):  # type: ignore[no-untyped-def]
+        with self.assertRaises(TypeError):
+            iter_transactions(123)  # type: ignore[arg-type]
+
+    def test_feeds_filters_without_list(self):  # type: ignore[no-untyped-def]
+        transactions = load_transactions("data/operations.json")
+        executed = filter_by_state(iter_transactions("data/operations.json"))
+        self.assertEqual(executed, filter_by_state(transactions))
+
+        usd = list(filter_by_currency(iter_transactions("data/operations.json"), "USD"))
+        self.assertEqual(usd, list(filter_by_currency(transactions, "USD")))
+
+
+class TestLoadTransactionsMany(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.transactions = load_transactions("data/operations.json")
+        self.paths = []
+        for number in range(4):
+            chunk = self.transactions[number * 26 : (number + 1) * 26]
+            self.paths.append(self._write(f"day_{number}.json", json.dumps(chunk)))
+
+    def _write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_glob_in_path_order(self):  # type: ignore[no-untyped-def]
+        result, errors = load_transactions_many(os.path.join(self.tmp_dir.name, "day_*.json"), workers=2)
+        self.assertEqual(result, self.transactions)
+        self.assertEqual(errors, {})
+
+    def test_serial_matches_parallel(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(load_transactions_many(self.paths, workers=1), load_transactions_many(self.paths, workers=3))
+
+    def test_order_by_date_matches_sort_by_date(self):  # type: ignore[no-untyped-def]
+        for reverse in (True, False):
+            result, _ = load_transactions_many(self.paths, workers=2, order_by_date=True, reverse=reverse)
+            self.assertEqual(result, sort_by_date(self.transactions, reverse=reverse))
+
+    def test_order_by_date_keeps_ties_stable(self):  # type: ignore[no-untyped-def]
+        first = self._write("a.json", json.dumps([{"id": 1, "date": "2019"}, {"id": 2}]))
+        second = self._write("b.json", json.dumps([{"id": 3, "date": "2019"}, {"id": 4}]))
+        merged = load_transactions(first) + load_transactions(second)
+        for reverse in (True, False):
+            result, _ = load_transactions_many([first, second], workers=1, order_by_date=True, reverse=reverse)
+            self.assertEqual(result, sort_by_date(merged, reverse=reverse))
+
+    def test_per_file_errors(self):  # type: ignore[no-untyped-def]
+        broken = self._write("broken.json", "[{")
+        not_list = self._write("dict.json", '{"key": "value"}')
+        missing = os.path.join(self.tmp_dir.name, "missing.json")
+
+        result, errors = load_transactions_many([self.paths[0], broken, not_list, missing], workers=2)
+
+        self.assertEqual(result, self.transactions[:26])
+        self.assertEqual(set(errors), {broken, not_list, missing})
+        self.assertTrue(errors[broken].startswith("JSONDecodeError"))
+        self.assertTrue(errors[missing].startswith("FileNotFoundError"))
+
+    def test_no_matching_files(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(load_transactions_many(os.path.join(self.tmp_dir.name, "*.csv")), ([], {}))
+
+    def test_as_money(self):  # type: ignore[no-untyped-def]
+        result, _ = load_transactions_many(self.paths, workers=2, as_money=True)
+        self.assertEqual(len(result), len(self.transactions))
+        self.assertEqual(result[0]["operationAmount"]["amount"], Money.parse("31957.58", "RUB"))
+
+
+class TestLoadTransactionsAsMoney(unittest.TestCase):
+
+    def test_dicts_and_records(self):  # type: ignore[no-untyped-def]
+        plain = load_transactions("data/operations.json")
+        dicts = load_transactions("data/operations.json", as_money=True)
+        records = load_transactions("data/operations.json", as_records=True, as_money=True)
+
+        amounts = [t["operationAmount"]["amount"] for t in dicts if "operationAmount" in t]
+        self.assertTrue(all(isinstance(amount, Money) for amount in amounts))
+        self.assertEqual(dicts[0]["operationAmount"]["amount"], Money(3195758, "RUB"))
+        self.assertEqual(records[1].amount, Money.parse(plain[1]["operationAmount"]["amount"], "USD"))
+        # str(Money) восстанавливает исходную строку operations.json
+        originals = [t["operationAmount"]["amount"] for t in plain if "operationAmount" in t]
+        self.assertEqual([str(amount) for amount in amounts], originals)
+
+    @patch("os.path.exists", return_value=True)
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data='[{"operationAmount": {"amount": "oops", "currency": {"code": "USD"}}}, {"id": 1}]',
+    )
+    def test_invalid_amount_kept_as_string(self, mock_file, mock_exists):  # type: ignore[no-untyped-def]
+        result = load_transactions("dummy.json", as_money=True)
+        self.assertEqual(result[0]["operationAmount"]["amount"], "oops")
+        self.assertEqual(result[1], {"id": 1})
+
+
+class TestJsonLines(unittest.TestCase):
+
+    def setUp(self):  # type: ignore[no-untyped-def]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.transactions = load_transactions("data/operations.json")
+        self.path = os.path.join(self.tmp_dir.name, "operations.jsonl")
+        self.count = json_to_jsonl("data/operations.json", self.path)
+
+    def test_converter_writes_one_record_per_line(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(self.count, len(self.transactions))
+        with open(self.path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.transactions)
+
+    @patch("src.utils.PARALLEL_MIN_BYTES", 0)
+    def test_parallel_reader_matches_load_transactions(self):  # type: ignore[no-untyped-def]
+        self.assertEqual(load_jsonl(self.path, workers=1), self.transactions)
+        self.assertEqual(load_jsonl(self.path, workers=3), self.transactions)
+        self.assertEqual(list(iter_jsonl(self.path)), self.transactions)
+
+    def test_ranges_are_aligned_on_newlines(self):  # type: ignore[no-untyped-def]
+        ranges = _split_ranges(self.path, 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        parsed = []
+        for (start, end), following in zip(ranges, ranges[1:] + [(ranges[-1][1], 0)]):
+            self.assertEqual(end, following[0])
+            records, error = _parse_range(self.path, start, end)
+            self.assertIsNone(error)
+            parsed.extend(records)
+        self.assertEqual(parsed, self.transactions)
+
+    def test_as_money_and_records(self):  # type: ignore[no-untyped-def]
+        for options in ({"as_money": True}, {"as_records": True}):
+            self.assertEqual(load_jsonl(self.path, **options), load_transactions("data/operations.json", **options))
+
+    def test_writer_accepts_iterators_records_and_money(self):  # type: ignore[no-untyped-def]
+        records = load_transactions("data/operations.json", as_records=True)
+        self.assertEqual(write_jsonl(iter(records[:10]), self.path), 10)
+        with_money = load_transactions("data/operations.json", as_money=True)
+        self.assertEqual(write_jsonl(with_money[10:], self.path, append=True), 91)
+        self.assertEqual(load_jsonl(self.path), self.transactions)
+
+    # Обрезанный исходный файл — ошибка, прежний JSONL не заменяется, временный файл не остаётся
+    def test_converter_rejects_truncated_source(self):  # type: ignore[no-untyped-def]
+        truncated = os.path.join(self.tmp_dir.name, "truncated.json")
+        with open("data/operations.json", encoding="utf-8") as source, open(truncated, "w", encoding="utf-8") as file:
+            file.write(source.read()[:5000])
+
+        with self.assertRaises(json.JSONDecodeError):
+            json_to_jsonl(truncated, self.path)
+        with self.assertRaises(FileNotFoundError):
+            json_to_jsonl(os.path.join(self.tmp_dir.name, "missing.json"), self.path)
+        self.assertEqual(load_jsonl(self.path), self.transactions)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["operations.jsonl", "truncated.json"])
+
+    def test_writer_removes_temporary_file_on_error(self):  # type: ignore[no-untyped-def]
+        with self.assertRaises(TypeError):
+            write_jsonl([{"id": 1}, {"id": object()}], self.path)
+        self.assertEqual(load_jsonl(self.path), self.transactions)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["operations.jsonl"])
+
+    def test_blank_lines_broken_and_missing_files(self):  # type: ignore[no-untyped-def]
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n   \n")
+        self.assertEqual(load_jsonl(self.path), self.transactions)
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('{"id": 1} {"id": 2}\n')
+        self.assertEqual(load_jsonl(self.path), [])
+        self.assertEqual(len(list(iter_jsonl(self.path))), len(self.transactions))
+
+        self.assertEqual(load_jsonl(os.path.join(self.tmp_dir.name, "missing.jsonl")), [])
+        self.assertEqual(list(iter_jsonl(os.path.join(self.tmp_dir.name, "missing.jsonl"))), [])
+        with self.assertRaises(TypeError):
+            load_jsonl(123)  # type: ignore[arg-type]
@@ -1,6 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
-from src.widget import get_date, mask_account_card
+from src.widget import MaskCache, disable_mask_cache, enable_mask_cache, get_date, mask_account_card
 
 
 def test_get_date(date_test: str):  # type: ignore[no-untyped-def]
@@ -17,3 +19,59 @@ def test_get_date(date_test: str):  # type: ignore[no-untyped-def]
 )
 def test_mask_account_card(string: str, expected_result: str):  # type: ignore[no-untyped-def]
     assert mask_account_card(string) == expected_result
+
+
+@pytest.fixture
+def mask_cache():  # type: ignore[no-untyped-def]
+    cache = enable_mask_cache(capacity=2)
+    yield cache
+    disable_mask_cache()
+
+
+def test_mask_cache_counters(mask_cache):  # type: ignore[no-untyped-def]
+    assert mask_account_card("Счет 64686473678894779589") == "Счет **9589"
+    assert mask_account_card("Счет 64686473678894779589") == "Счет **9589"
+    assert mask_account_card("Maestro 1596837868705199") == "Maestro 1596 83** **** 5199"
+    assert mask_account_card("Visa Platinum 8990922113665229") == "Visa Platinum 8990 92** **** 5229"
+
+    assert mask_cache.stats() == {"size": 2, "capacity": 2, "hits": 1, "misses": 3, "evictions": 1}
+
+    mask_cache.clear()
+    assert mask_cache.stats() == {"size": 0, "capacity": 2, "hits": 0, "misses": 0, "evictions": 0}
+
+
+def test_mask_cache_is_lru(mask_cache):  # type: ignore[no-untyped-def]
+    mask_account_card("Счет 64686473678894779589")
+    mask_account_card("Maestro 1596837868705199")
+    mask_account_card("Счет 64686473678894779589")
+    mask_account_card("Visa Platinum 8990922113665229")
+
+    with patch("src.widget.get_mask_account", side_effect=AssertionError("must be cached")):
+        assert mask_account_card("Счет 64686473678894779589") == "Счет **9589"
+    assert mask_cache.evictions == 1
+
+
+def test_mask_cache_does_not_store_raw_numbers(mask_cache):  # type: ignore[no-untyped-def]
+    mask_account_card("Счет 64686473678894779589")
+
+    stored = repr(list(mask_cache._entries.items()))
+    assert "64686473678894779589" not in stored
+    assert b"64686473678894779589" not in b"".join(mask_cache._entries)
+
+
+def test_mask_cache_errors_are_not_cached(mask_cache):  # type: ignore[no-untyped-def]
+    with pytest.raises(ValueError):
+        mask_account_card("Счет 123")
+    assert len(mask_cache) == 0
+
+
+def test_mask_cache_disabled_by_default():  # type: ignore[no-untyped-def]
+    with patch("src.widget.get_mask_account", return_value="**0000") as mock_mask:
+        mask_account_card("Счет 64686473678894779589")
+        mask_account_card("Счет 64686473678894779589")
+    assert mock_mask.call_count == 2
+
+
+def test_mask_cache_capacity_must_be_positive():  # type: ignore[no-untyped-def]
+    with pytest.raises(ValueError):
+        MaskCache(0)